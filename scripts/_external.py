@@ -0,0 +1,352 @@
+"""Asynchronous checking of external (http/https) links for check-links."""
+
+import asyncio
+import json
+import ssl
+import sys
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import quote, urljoin, urlsplit
+
+# Bump whenever the cache layout or the meaning of a result changes.
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = Path(".cache/external-links.json")
+DEFAULT_TTL = 24 * 60 * 60
+# Failures are rechecked sooner than successes, since they are often transient.
+FAILURE_TTL = 60 * 60
+
+MAX_REDIRECTS = 5
+# Response bodies up to this size are read and discarded so that the
+# connection can be reused; larger ones are abandoned with the connection.
+MAX_DRAIN_BYTES = 64 * 1024
+MAX_HEADER_LINES = 100
+USER_AGENT = "Mozilla/5.0 (compatible; architecture-check-links)"
+# Characters left as they are when a URL's path and query are sent.
+URL_SAFE_CHARS = "/%?=&:;@!$'()*+,~-._#[]"
+
+
+def is_external(target: str) -> bool:
+    """Return whether target is an http(s) URL checked by --external."""
+    return target.startswith(("http://", "https://"))
+
+
+def url_key(target: str) -> str:
+    """Return the URL actually requested for a link target, without its fragment."""
+    return target.partition("#")[0]
+
+
+@dataclass
+class UrlResult:
+    """The outcome of checking one URL: a final HTTP status or an error."""
+
+    status: int | None
+    error: str | None
+    checked_at: float
+
+    @property
+    def ok(self) -> bool:
+        # 429 means the server is up but rate limiting us: not a broken link.
+        return self.error is None and self.status is not None and (
+            self.status < 400 or self.status == 429
+        )
+
+    @property
+    def cacheable(self) -> bool:
+        return self.status != 429
+
+    def describe(self) -> str:
+        return f"HTTP {self.status}" if self.error is None else self.error
+
+
+class ExternalLinkCache:
+    """
+    On-disk cache of URL check results, each valid for a limited time.
+
+    Successful results are reused for ``ttl`` seconds and failures for at
+    most FAILURE_TTL, so that a flaky host is retried on the next run.
+    """
+
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.entries: dict[str, UrlResult] = {}
+
+    @classmethod
+    def load(cls, path: Path, ttl: float = DEFAULT_TTL) -> "ExternalLinkCache":
+        """Load the cache, starting empty if it is missing, corrupt or stale."""
+        cache = cls(path, ttl)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if data.get("version") != CACHE_VERSION:
+            return cache
+        for url, (status, error, checked_at) in data.get("urls", {}).items():
+            cache.entries[url] = UrlResult(status, error, checked_at)
+        return cache
+
+    def lookup(self, url: str, now: float) -> UrlResult | None:
+        """Return the cached result for url if it has not expired."""
+        result = self.entries.get(url)
+        if result is None:
+            return None
+        ttl = self.ttl if result.ok else min(self.ttl, FAILURE_TTL)
+        if now - result.checked_at >= ttl:
+            return None
+        return result
+
+    def store(self, url: str, result: UrlResult) -> None:
+        if result.cacheable:
+            self.entries[url] = result
+
+    def save(self) -> None:
+        """Write the cache, dropping entries that have expired."""
+        now = time.time()
+        data = {
+            "version": CACHE_VERSION,
+            "urls": {
+                url: [result.status, result.error, result.checked_at]
+                for url, result in sorted(self.entries.items())
+                if now - result.checked_at < self.ttl
+            },
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+            tmp_path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+            tmp_path.replace(self.path)
+        except OSError as e:
+            print(f"⚠️  Could not write external link cache {self.path}: {e}", file=sys.stderr)
+
+
+class _StaleConnection(ConnectionError):
+    """A pooled keep-alive connection was closed by the server."""
+
+
+class HostPool:
+    """
+    Keep-alive connections to one scheme/host/port, at most ``limit`` in use.
+
+    Idle connections are reused by later requests to the same host, so a
+    page linking to many URLs on one site costs one TLS handshake per
+    concurrent request rather than one per URL.
+    """
+
+    def __init__(
+        self, scheme: str, host: str, port: int, limit: int, ssl_context: ssl.SSLContext
+    ) -> None:
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.semaphore = asyncio.Semaphore(limit)
+        self.ssl_context = ssl_context if scheme == "https" else None
+        self.idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    @property
+    def host_header(self) -> str:
+        host = self.host.encode("idna").decode("ascii") if not self.host.isascii() else self.host
+        if ":" in host:
+            host = f"[{host}]"
+        default_port = 443 if self.scheme == "https" else 80
+        return host if self.port == default_port else f"{host}:{self.port}"
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_connection(
+            self.host,
+            self.port,
+            ssl=self.ssl_context,
+            server_hostname=self.host if self.ssl_context else None,
+        )
+
+    async def request(self, method: str, target: str) -> tuple[int, dict[str, str]]:
+        """Send a request and return the response status and headers."""
+        async with self.semaphore:
+            if self.idle:
+                connection = self.idle.pop()
+                try:
+                    return await self._exchange(connection, method, target)
+                except ConnectionError:
+                    # Most likely closed by the server while idle: retry on a new one.
+                    pass
+            return await self._exchange(await self._connect(), method, target)
+
+    async def _exchange(
+        self,
+        connection: tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        method: str,
+        target: str,
+    ) -> tuple[int, dict[str, str]]:
+        reader, writer = connection
+        reusable = False
+        try:
+            writer.write(
+                (
+                    f"{method} {target} HTTP/1.1\r\n"
+                    f"Host: {self.host_header}\r\n"
+                    f"User-Agent: {USER_AGENT}\r\n"
+                    "Accept: */*\r\n"
+                    "Accept-Encoding: identity\r\n"
+                    "\r\n"
+                ).encode("ascii")
+            )
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if not status_line:
+                raise _StaleConnection("connection closed without a response")
+            parts = status_line.decode("latin-1").split(None, 2)
+            if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+                raise ConnectionError(f"invalid HTTP response: {status_line[:80]!r}")
+            status = int(parts[1])
+
+            headers: dict[str, str] = {}
+            for _ in range(MAX_HEADER_LINES):
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            else:
+                raise ConnectionError("too many response headers")
+
+            reusable = await self._drain_body(reader, method, status, headers)
+            return status, headers
+        finally:
+            if reusable:
+                self.idle.append(connection)
+            else:
+                writer.close()
+
+    @staticmethod
+    async def _drain_body(
+        reader: asyncio.StreamReader, method: str, status: int, headers: dict[str, str]
+    ) -> bool:
+        """Skip the response body; return whether the connection can be reused."""
+        if "close" in headers.get("connection", "").lower():
+            return False
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return True
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            # Only bodies that are already complete in a few chunks are worth reading.
+            return False
+        length = headers.get("content-length", "")
+        if not length.isdigit() or int(length) > MAX_DRAIN_BYTES:
+            return False
+        await reader.readexactly(int(length))
+        return True
+
+    def close(self) -> None:
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+class ExternalLinkChecker:
+    """
+    Check http(s) URLs concurrently with asyncio.
+
+    Each URL is requested with HEAD, then with GET when HEAD fails (some
+    servers reject or mishandle HEAD), following up to MAX_REDIRECTS
+    redirects. Connections are pooled per host and at most ``per_host``
+    requests run against one host at a time, ``total`` overall. Fragments
+    are ignored and each distinct URL is checked once.
+    """
+
+    def __init__(
+        self,
+        cache: ExternalLinkCache | None = None,
+        per_host: int = 4,
+        total: int = 32,
+        timeout: float = 15.0,
+    ) -> None:
+        self.cache = cache
+        self.per_host = per_host
+        self.total = total
+        self.timeout = timeout
+        self.cached_count = 0
+        self._pools: dict[tuple[str, str, int], HostPool] = {}
+        self._ssl_context: ssl.SSLContext | None = None
+
+    def check(self, urls: Iterable[str]) -> dict[str, UrlResult]:
+        """
+        Return the result for every URL, keyed by url_key(), from the cache
+        where still valid.
+        """
+        results: dict[str, UrlResult] = {}
+        pending: list[str] = []
+        now = time.time()
+        for url in dict.fromkeys(url_key(url) for url in urls):
+            cached = self.cache.lookup(url, now) if self.cache is not None else None
+            if cached is not None:
+                results[url] = cached
+            else:
+                pending.append(url)
+        self.cached_count = len(results)
+
+        if pending:
+            results.update(asyncio.run(self._check_all(pending)))
+            if self.cache is not None:
+                for url in pending:
+                    self.cache.store(url, results[url])
+        if self.cache is not None:
+            self.cache.save()
+        return results
+
+    async def _check_all(self, urls: list[str]) -> dict[str, UrlResult]:
+        self._pools = {}
+        self._ssl_context = ssl.create_default_context()
+        self._total = asyncio.Semaphore(self.total)
+        try:
+            checked = await asyncio.gather(*(self._check_url(url) for url in urls))
+        finally:
+            for pool in self._pools.values():
+                pool.close()
+        return dict(zip(urls, checked))
+
+    def _pool(self, scheme: str, host: str, port: int) -> HostPool:
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = HostPool(scheme, host, port, self.per_host, self._ssl_context)
+            self._pools[key] = pool
+        return pool
+
+    async def _check_url(self, url: str) -> UrlResult:
+        async with self._total:
+            try:
+                status = await asyncio.wait_for(self._fetch(url, "HEAD"), self.timeout)
+            except (OSError, asyncio.TimeoutError, ValueError, asyncio.IncompleteReadError):
+                status = None
+            if status is not None and status < 400:
+                return UrlResult(status, None, time.time())
+
+            try:
+                status = await asyncio.wait_for(self._fetch(url, "GET"), self.timeout)
+            except asyncio.TimeoutError:
+                return UrlResult(None, f"timed out after {self.timeout:g}s", time.time())
+            except ssl.SSLError as e:
+                return UrlResult(None, f"TLS error: {e.reason or e}", time.time())
+            except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+                return UrlResult(None, str(e) or type(e).__name__, time.time())
+            return UrlResult(status, None, time.time())
+
+    async def _fetch(self, url: str, method: str) -> int:
+        """Request url, following redirects, and return the final status."""
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.hostname:
+                raise ValueError(f"unsupported URL {url}")
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            target = quote(parts.path or "/", safe=URL_SAFE_CHARS)
+            if parts.query:
+                target += "?" + quote(parts.query, safe=URL_SAFE_CHARS)
+
+            pool = self._pool(parts.scheme, parts.hostname, port)
+            status, headers = await pool.request(method, target)
+            location = headers.get("location")
+            if status not in (301, 302, 303, 307, 308) or not location:
+                return status
+            url = urljoin(url, location)
+        raise ValueError(f"more than {MAX_REDIRECTS} redirects")
@@ -0,0 +1,468 @@
+"""Streaming markdown tokenizer shared by the documentation QA scripts."""
+
+import html
+import re
+import unicodedata
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+# Link text may contain one level of nested brackets, e.g. [![alt](img.png)](page.md).
+_TEXT = r'(?:[^\[\]\\]|\\.|\[(?:[^\[\]\\]|\\.)*\])*'
+_TITLE = r'''(?:"[^"]*"|'[^']*'|\([^()]*\))'''
+_DESTINATION = r'(?:<[^<>\n]*>|(?:[^\s()\\]|\\.|\((?:[^\s()\\]|\\.)*\))+)'
+_AUTOLINK = r'[A-Za-z][A-Za-z0-9+.-]{1,31}:[^\s<>]*|[\w.+-]+@[\w-]+(?:\.[\w-]+)+'
+# Raw HTML links and images; other tags are left to the site build check.
+_HTML_TAG = r'''<(?P<tag>(?i:a|img))\b(?P<attributes>(?:[^<>"']|"[^"]*"|'[^']*')*)>'''
+# All inline markup in a single pass. Where several kinds start at the same
+# position they are tried in order: autolinks, raw HTML, then links, images
+# and reference usages, which share their bracketed text. Code spans are
+# blanked out beforehand, so none of these match inside them.
+INLINE_PATTERN = re.compile(
+    r'<(?P<autolink>' + _AUTOLINK + r')>'
+    r'|' + _HTML_TAG +
+    r'|(?<!\\)(?P<bang>!?)\[(?P<text>' + _TEXT + r')\]'
+    r'(?:(?P<inline>\(\s*(?P<destination>' + _DESTINATION + r')?(?:\s+' + _TITLE + r')?\s*\))'
+    r'|\[(?P<label>[^\[\]]*)\]|(?![\[(:]))',
+    re.DOTALL,
+)
+DEFINITION_PATTERN = re.compile(
+    r'^[ \t]*\[([^\[\]^][^\[\]]*)\]:[ \t]*(<[^<>\n]*>|\S+)'
+    r'(?:[ \t]+' + _TITLE + r')?[ \t]*$'
+)
+HTML_ATTRIBUTE_PATTERN = re.compile(
+    r"""(?:^|\s)(href|src|alt)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'<>`]+))""",
+    re.IGNORECASE,
+)
+# The attribute holding the URL for each HTML tag, and the kind of link it makes.
+HTML_REFERENCE_KINDS = {"a": ("href", "html-link"), "img": ("src", "html-image")}
+CODE_SPAN_PATTERN = re.compile(r'(?<!`)(`+)(?!`)(.+?)(?<!`)\1(?!`)', re.DOTALL)
+# Anything but a line break, to blank out code spans while keeping offsets.
+NOT_NEWLINE_PATTERN = re.compile(r'[^\n]+')
+# Markup dropped from heading text before it is slugified.
+HEADING_IMAGE_PATTERN = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+HEADING_LINK_PATTERN = re.compile(r'\[([^\]]*)\](?:\([^)]*\)|\[[^\]]*\])')
+HEADING_TAG_PATTERN = re.compile(r'<[^>]+>')
+# Emphasis markers; underscores inside words are kept like the renderer does.
+HEADING_EMPHASIS_PATTERN = re.compile(r'(?<!\w)_+|_+(?!\w)')
+SLUG_STRIP_PATTERN = re.compile(r'[^\w\s-]')
+
+FENCE_PATTERN = re.compile(r'^[ \t]*(`{3,}|~{3,})(.*)$')
+ATX_HEADING_PATTERN = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+SETEXT_UNDERLINE_PATTERN = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+# Blocks whose indented continuation lines are content rather than code:
+# list items, admonitions, collapsible details, content tabs and footnotes.
+CONTAINER_PATTERN = re.compile(
+    r'^[ \t]*(?:[-*+][ \t]|\d+[.)][ \t]|!!!|\?\?\?\+?|===[ \t]|\[\^[^\]]+\]:)'
+)
+# attr_list ids, e.g. "## Heading { #custom-id }"
+ATTR_LIST_PATTERN = re.compile(r'[ \t]*\{:?[ \t]*([^}]*)\}[ \t]*$')
+ATTR_ID_PATTERN = re.compile(r'(?:^|\s)#([\w-]+)')
+HTML_ID_PATTERN = re.compile(r'<[A-Za-z][^>]*?\s(?:id|name)\s*=\s*["\']([^"\']+)["\']')
+# pymdownx.snippets includes: --8<-- "path" on a line of its own, or one path
+# per line between two bare --8<-- lines. A leading ";" escapes the marker.
+SNIPPET_PATTERN = re.compile(r'''^([ \t]*)-+8<-+[ \t]+(["'])(.+?)\2[ \t]*$''')
+SNIPPET_BLOCK_PATTERN = re.compile(r'^[ \t]*-+8<-+[ \t]*$')
+SNIPPET_KINDS = ("snippet", "code-snippet")
+
+
+@dataclass(frozen=True)
+class Link:
+    """
+    A link as written in a markdown file.
+
+    kind is one of "inline", "image", "definition" (a reference definition,
+    target is its destination), "reference" (a reference usage, target is its
+    normalized label), "shortcut" (a bare [label] that is only a link when the
+    label is defined), "autolink", "html-link" (a raw <a href>) or
+    "html-image" (a raw <img src>, text is its alt text), "snippet" (a
+    --8<-- include, target is the path as written) or "code-snippet" (an
+    include inside a fenced code block, whose content is not markdown).
+    """
+
+    kind: str
+    line: int
+    col: int
+    text: str
+    target: str
+
+    @property
+    def markup(self) -> str:
+        """Return the link roughly as it was written, on one line, for messages."""
+        text = " ".join(self.text.split())
+        if self.kind == "definition":
+            return f"[{text}]: {self.target}"
+        if self.kind in ("reference", "shortcut"):
+            return f"[{text}][{self.target}]"
+        if self.kind == "autolink":
+            return f"<{self.target}>"
+        if self.kind == "html-link":
+            return f'<a href="{self.target}">'
+        if self.kind == "html-image":
+            return f'<img src="{self.target}">'
+        if self.kind == "image":
+            return f"![{text}]({self.target})"
+        if self.kind in SNIPPET_KINDS:
+            return f'--8<-- "{self.target}"'
+        return f"[{text}]({self.target})"
+
+
+@dataclass(frozen=True)
+class Heading:
+    """A heading, with its explicit attr_list id if it has one."""
+
+    line: int
+    text: str
+    anchor_id: str | None
+
+
+@dataclass(frozen=True)
+class Anchor:
+    """An explicit id defined outside headings (HTML or attr_list)."""
+
+    line: int
+    anchor_id: str
+
+
+Token = Link | Heading | Anchor
+
+
+def normalize_label(label: str) -> str:
+    """Normalize a reference label for case and whitespace-insensitive matching."""
+    return " ".join(label.split()).casefold()
+
+
+def _blank(match: re.Match) -> str:
+    """Blank out a match, keeping newlines so offsets stay valid."""
+    text = match.group(0)
+    if "\n" not in text:
+        return " " * len(text)
+    return NOT_NEWLINE_PATTERN.sub(lambda part: " " * len(part.group(0)), text)
+
+
+class _Paragraph:
+    """Lines of the current block, scanned for inline markup when it ends."""
+
+    def __init__(self) -> None:
+        self.lines: list[tuple[int, str]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.lines)
+
+    def add(self, line_no: int, line: str) -> None:
+        self.lines.append((line_no, line))
+
+    def flush(self) -> Iterator[Link]:
+        if not self.lines:
+            return
+        lines, self.lines = self.lines, []
+        if len(lines) == 1:
+            yield from _scan_line(*lines[0])
+            return
+
+        starts: list[int] = []
+        offset = 0
+        for _, line in lines:
+            starts.append(offset)
+            offset += len(line) + 1
+        text = "\n".join(line for _, line in lines)
+
+        def position(index: int) -> tuple[int, int]:
+            row = bisect_right(starts, index) - 1
+            return lines[row][0], index - starts[row] + 1
+
+        yield from _scan_inline(text, position)
+
+
+def _scan_line(line_no: int, line: str) -> Iterator[Link]:
+    """Yield the links on a single line."""
+    return _scan_inline(line, lambda index: (line_no, index + 1))
+
+
+def _scan_inline(text: str, position, nested: bool = False) -> Iterator[Link]:
+    """
+    Yield the links in a block of text, in order of appearance.
+
+    nested is set for bracketed text inside a link or reference, where
+    reference usages are not looked for.
+    """
+    if "[" not in text and "<" not in text:
+        return
+    if not nested and "`" in text:
+        text = CODE_SPAN_PATTERN.sub(_blank, text)
+
+    for match in INLINE_PATTERN.finditer(text):
+        start = match.start()
+        target = match.group("autolink")
+        if target is not None:
+            if ":" not in target:
+                target = f"mailto:{target}"
+            yield Link("autolink", *position(start), "", target)
+            continue
+
+        tag = match.group("tag")
+        if tag is not None:
+            url_attribute, kind = HTML_REFERENCE_KINDS[tag.lower()]
+            attributes = {
+                name.lower(): html.unescape(double or single or bare)
+                for name, double, single, bare in HTML_ATTRIBUTE_PATTERN.findall(
+                    match.group("attributes")
+                )
+            }
+            target = attributes.get(url_attribute, "").strip()
+            if target:
+                yield Link(kind, *position(start), attributes.get("alt", ""), target)
+            continue
+
+        label_text = match.group("text")
+        if match.group("inline") is not None:
+            destination = match.group("destination") or ""
+            if destination.startswith("<"):
+                destination = destination[1:-1]
+            if destination:
+                kind = "image" if match.group("bang") else "inline"
+                yield Link(kind, *position(start), label_text, destination)
+        elif not nested and not label_text.startswith("^"):  # not a footnote
+            label = match.group("label")
+            if label is None:
+                kind, label = "shortcut", label_text
+            else:
+                kind, label = "reference", label or label_text
+            yield Link(kind, *position(start), label_text, normalize_label(label))
+        if "[" in label_text or "<" in label_text:
+            # Images and links in the bracketed text, e.g. a linked badge.
+            text_start = match.start("text")
+            yield from _scan_inline(
+                label_text, lambda index: position(text_start + index), nested=True
+            )
+
+
+def _split_attr_id(raw: str) -> tuple[str, str | None]:
+    """Split a trailing attr_list off heading text, returning any id it sets."""
+    attrs = ATTR_LIST_PATTERN.search(raw)
+    if not attrs:
+        return raw, None
+    id_match = ATTR_ID_PATTERN.search(attrs.group(1))
+    return raw[:attrs.start()], id_match.group(1) if id_match else None
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Token]:
+    """
+    Tokenize markdown line by line, yielding links, headings and anchors.
+
+    Fenced (``` and ~~~) and indented code blocks, inline code spans and YAML
+    front matter are skipped, except for snippet includes, which are
+    expanded before the markdown is parsed and so are yielded wherever they
+    are (as "code-snippet" links inside code blocks). Only the current
+    paragraph is buffered, so memory use does not grow with the size of the
+    file. Reference usages are yielded with their label; matching them to
+    definitions is left to the caller since a definition may follow its
+    first use.
+    """
+    paragraph = _Paragraph()
+    fence: str | None = None
+    in_front_matter = False
+    in_indented_code = False
+    in_container = False
+    in_snippet_block = False
+    after_blank = True
+
+    for line_no, line in enumerate(lines, start=1):
+        line = line.rstrip("\r\n")
+
+        if line_no == 1 and line.rstrip() == "---":
+            in_front_matter = True
+            continue
+        if in_front_matter:
+            if line.rstrip() in ("---", "..."):
+                in_front_matter = False
+            continue
+
+        # Cheap checks on the stripped line guard the patterns below, which
+        # most lines cannot match.
+        stripped = line.lstrip()
+        maybe_snippet = "8<" in line
+        snippet_kind = "code-snippet" if fence is not None or in_indented_code else "snippet"
+        if in_snippet_block:
+            if maybe_snippet and SNIPPET_BLOCK_PATTERN.match(line):
+                in_snippet_block = False
+            elif stripped and not stripped.startswith(";"):
+                indent = len(line) - len(stripped)
+                yield Link(snippet_kind, line_no, indent + 1, "", line.strip())
+            continue
+        if maybe_snippet:
+            if SNIPPET_BLOCK_PATTERN.match(line):
+                yield from paragraph.flush()
+                in_snippet_block = True
+                continue
+            snippet = SNIPPET_PATTERN.match(line)
+            if snippet:
+                yield from paragraph.flush()
+                yield Link(snippet_kind, line_no, len(snippet.group(1)) + 1, "", snippet.group(3))
+                continue
+
+        maybe_fence = stripped.startswith(("```", "~~~"))
+        if fence is not None:
+            closing = maybe_fence and FENCE_PATTERN.match(line)
+            if (
+                closing
+                and closing.group(1)[0] == fence[0]
+                and len(closing.group(1)) >= len(fence)
+                and not closing.group(2).strip()
+            ):
+                fence = None
+            continue
+
+        if not stripped:
+            yield from paragraph.flush()
+            after_blank = True
+            continue
+
+        indented = line.startswith(("    ", "\t"))
+        if in_indented_code and indented:
+            continue
+        in_indented_code = False
+        if indented and after_blank and not in_container and not paragraph:
+            in_indented_code = True
+            continue
+        after_blank = False
+
+        opening = maybe_fence and FENCE_PATTERN.match(line)
+        if opening and not (opening.group(1)[0] == "`" and "`" in opening.group(2)):
+            yield from paragraph.flush()
+            fence = opening.group(1)
+            continue
+
+        is_container = bool(CONTAINER_PATTERN.match(line))
+        if not indented:
+            in_container = is_container
+        if is_container:
+            yield from paragraph.flush()
+
+        if "<" in line:
+            for anchor_id in HTML_ID_PATTERN.findall(CODE_SPAN_PATTERN.sub("", line)):
+                yield Anchor(line_no, anchor_id)
+
+        heading = stripped.startswith("#") and ATX_HEADING_PATTERN.match(line)
+        if heading:
+            yield from paragraph.flush()
+            text, anchor_id = _split_attr_id(heading.group(2) or "")
+            yield Heading(line_no, text, anchor_id)
+            yield from _scan_line(line_no, line)
+            continue
+
+        if paragraph and stripped[0] in "=-" and SETEXT_UNDERLINE_PATTERN.match(line):
+            heading_line_no, heading_line = paragraph.lines[-1]
+            text, anchor_id = _split_attr_id(heading_line.strip())
+            yield from paragraph.flush()
+            yield Heading(heading_line_no, text, anchor_id)
+            continue
+
+        definition = stripped.startswith("[") and DEFINITION_PATTERN.match(line)
+        if definition:
+            destination = definition.group(2)
+            if destination.startswith("<"):
+                destination = destination[1:-1]
+            yield Link("definition", line_no, line.index("[") + 1, definition.group(1), destination)
+            continue
+
+        attrs = "{" in line and ATTR_LIST_PATTERN.fullmatch(line)
+        if attrs:
+            for anchor_id in ATTR_ID_PATTERN.findall(attrs.group(1)):
+                yield Anchor(line_no, anchor_id)
+            continue
+
+        paragraph.add(line_no, line)
+
+    yield from paragraph.flush()
+
+
+def slugify(value: str, separator: str = "-") -> str:
+    """Slugify heading text the same way as the Python-Markdown toc extension."""
+    value = unicodedata.normalize("NFKD", value)
+    value = value.encode("ascii", "ignore").decode("ascii")
+    value = SLUG_STRIP_PATTERN.sub("", value).strip().lower()
+    return re.sub(rf"[{separator}\s]+", separator, value)
+
+
+def heading_text(raw: str) -> str:
+    """Approximate the plain text that the site build renders for a heading."""
+    text = raw
+    if "[" in text:
+        text = HEADING_IMAGE_PATTERN.sub('', text)
+        text = HEADING_LINK_PATTERN.sub(r'\1', text)
+    if "<" in text:
+        text = HEADING_TAG_PATTERN.sub('', text)
+    if "_" in text:
+        text = HEADING_EMPHASIS_PATTERN.sub('', text)
+    return html.unescape(text) if "&" in text else text
+
+
+class AnchorCollector:
+    """
+    Collect the anchors a markdown file defines once rendered.
+
+    Covers heading slugs (de-duplicated with "_1", "_2" suffixes like the toc
+    extension), attr_list ids and HTML id/name attributes.
+    """
+
+    def __init__(self) -> None:
+        self.anchors: set[str] = set()
+
+    def add(self, token: Token) -> None:
+        if isinstance(token, Anchor):
+            self.anchors.add(token.anchor_id)
+        elif isinstance(token, Heading):
+            if token.anchor_id:
+                self.anchors.add(token.anchor_id)
+                return
+            slug = base = slugify(heading_text(token.text))
+            suffix = 0
+            while slug in self.anchors:
+                suffix += 1
+                slug = f"{base}_{suffix}"
+            self.anchors.add(slug)
+
+
+def extract_links_and_anchors(lines: Iterable[str]) -> tuple[list[Link], set[str]]:
+    """
+    Return the links in a markdown file, in order of appearance, and the
+    anchors it defines, in a single pass.
+
+    Reference usages are matched against the file's definitions: defined
+    shortcuts and references are dropped (their definition is the link that
+    gets checked), undefined shortcuts are plain text and are dropped too,
+    while undefined full or collapsed references are kept so they can be
+    reported.
+    """
+    links: list[Link] = []
+    definitions: set[str] = set()
+    anchors = AnchorCollector()
+    for token in tokenize(lines):
+        if isinstance(token, Link):
+            links.append(token)
+            if token.kind == "definition":
+                definitions.add(normalize_label(token.text))
+        else:
+            anchors.add(token)
+
+    links = [
+        link
+        for link in links
+        if link.kind not in ("reference", "shortcut")
+        or (link.kind == "reference" and link.target not in definitions)
+    ]
+    return links, anchors.anchors
+
+
+def extract_links(lines: Iterable[str]) -> list[Link]:
+    """Return the links in a markdown file, in order of appearance."""
+    return extract_links_and_anchors(lines)[0]
+
+
+def extract_anchors(lines: Iterable[str]) -> set[str]:
+    """Return the anchors a markdown file defines once rendered."""
+    collector = AnchorCollector()
+    for token in tokenize(lines):
+        collector.add(token)
+    return collector.anchors
@@ -0,0 +1,96 @@
+"""pymdownx.snippets include resolution for check-links."""
+
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from _markdown import Link, extract_links_and_anchors
+
+# tomllib is standard library in Python 3.11+, fall back to tomli for older versions
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+
+# "path", "path:start:end" (a line range) or "path:name" (a named section).
+SNIPPET_TARGET_PATTERN = re.compile(
+    r'^(?P<path>.+?)(?::(?P<start>\d*)(?::(?P<end>\d*))?|:(?P<section>[\w-]+))?$'
+)
+
+
+@dataclass(frozen=True)
+class SnippetConfig:
+    """
+    Where pymdownx.snippets looks for included files, and what it appends.
+
+    base_paths are relative to the repository root, where the site is
+    built from. auto_append files are added to the end of every page under
+    docs_dir.
+    """
+
+    base_paths: tuple[str, ...] = (".",)
+    auto_append: tuple[str, ...] = ()
+    docs_dir: str = "doc"
+
+
+@dataclass
+class IncludedFile:
+    """The links (including nested includes) found in an included file."""
+
+    links: list[Link] = field(default_factory=list)
+    # [size, mtime_ns] when it was read, so that dependants can be rechecked.
+    signature: list[int] = field(default_factory=list)
+    read_error: str | None = None
+
+
+def load_snippet_config(config_path: Path) -> SnippetConfig:
+    """Return the pymdownx.snippets settings from zensical.toml, or the defaults."""
+    try:
+        with open(config_path, "rb") as f:
+            config = tomllib.load(f)
+    except FileNotFoundError:
+        return SnippetConfig()
+    except Exception as exc:
+        print(f"⚠️  Could not read {config_path}, ignoring its snippet settings: {exc}", file=sys.stderr)
+        return SnippetConfig()
+
+    project = config.get("project", config)
+    options = project.get("markdown_extensions", {}).get("pymdownx", {}).get("snippets", {})
+    base_paths = options.get("base_path", ["."])
+    auto_append = options.get("auto_append", [])
+    return SnippetConfig(
+        base_paths=tuple([base_paths] if isinstance(base_paths, str) else base_paths),
+        auto_append=tuple([auto_append] if isinstance(auto_append, str) else auto_append),
+        docs_dir=project.get("docs_dir", "doc"),
+    )
+
+
+def split_snippet_target(target: str) -> tuple[str, range | None]:
+    """
+    Split an include target into its path and the lines it selects.
+
+    A line range selects those lines, numbered from 1, with an open start or
+    end meaning the start or end of the file. Section markers are not
+    tracked, so a named section selects the whole file.
+    """
+    match = SNIPPET_TARGET_PATTERN.match(target)
+    if match is None or match.group("section"):
+        return (match.group("path") if match else target), None
+    if match.group("start") is None:
+        return match.group("path"), None
+    start = int(match.group("start") or 1)
+    end = int(match.group("end")) if match.group("end") else sys.maxsize
+    return match.group("path"), range(max(start, 1), end + 1)
+
+
+def read_included_file(path: Path) -> IncludedFile:
+    """Parse an included file for links and nested includes."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            stat = os.fstat(f.fileno())
+            links, _ = extract_links_and_anchors(f)
+    except (OSError, UnicodeDecodeError) as e:
+        return IncludedFile(read_error=str(e))
+    return IncludedFile(links, [stat.st_size, stat.st_mtime_ns])
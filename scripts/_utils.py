@@ -1,8 +1,24 @@
 """Shared utility functions for QA scripts."""
 
+import argparse
+import atexit
+import bisect
+import contextlib
+import cProfile
+import fnmatch
+import functools
+import importlib.util
+import json
+import posixpath
+import re
 import subprocess
 import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 from pathlib import Path
+from types import ModuleType
 
 # tomllib is standard library in Python 3.11+, fall back to tomli for older versions
 try:
@@ -11,6 +27,150 @@ except ImportError:
     import tomli as tomllib
 
 
+class PhaseTimer:
+    """
+    Wall time and call counts per named phase, for the --timings flag.
+
+    Disabled by default, in which case phase() returns a shared no-op
+    context manager and timed() functions call straight through, so
+    instrumented code pays for one attribute check. Phases may nest; each
+    one is timed from entry to exit.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.started = 0.0
+        self.phases: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+        self.started = time.perf_counter()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.phases.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def phase(self, name: str):
+        """Return a context manager timing its body as one call of name."""
+        if not self.enabled:
+            return _NO_PHASE
+        return _Phase(self, name)
+
+    def timed(self, name: str) -> Callable:
+        """Decorate a function so that every call is timed as phase name."""
+        def decorate(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def summary(self) -> dict:
+        """Return the recorded phases, slowest first, and the total run time."""
+        phases = sorted(self.phases.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 6),
+            "phases": {
+                name: {"calls": calls, "seconds": round(seconds, 6)}
+                for name, (calls, seconds) in phases
+            },
+        }
+
+    def print_table(self, file=None) -> None:
+        file = file or sys.stderr
+        summary = self.summary()
+        print(f"\n{'phase':<20} {'calls':>9} {'seconds':>10}", file=file)
+        for name, phase in summary["phases"].items():
+            print(f"{name:<20} {phase['calls']:>9} {phase['seconds']:>10.3f}", file=file)
+        print(f"{'total':<20} {'':>9} {summary['total_seconds']:>10.3f}", file=file)
+
+
+class _Phase:
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer: PhaseTimer, name: str) -> None:
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.timer.record(self.name, time.perf_counter() - self.start)
+
+
+_NO_PHASE = contextlib.nullcontext()
+
+# Process-wide timer used by every script; enabled by --timings.
+timings = PhaseTimer()
+
+
+def add_instrumentation_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --timings and --profile flags to a script's parser."""
+    parser.add_argument(
+        "--timings",
+        metavar="FILE",
+        nargs="?",
+        const="-",
+        help=(
+            "Record wall time and call counts per phase; print a table to stderr, "
+            "or write JSON to FILE"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        type=Path,
+        nargs="?",
+        const=True,
+        help="Run under cProfile and write the stats to FILE (default: .cache/<script>.prof)",
+    )
+
+
+def start_instrumentation(args: argparse.Namespace, script_name: str) -> None:
+    """
+    Start the timings and profiler requested on the command line.
+
+    Their reports are written when the process exits. Work done in worker
+    processes is not included.
+    """
+    if args.timings is not None:
+        timings.enable()
+        atexit.register(_report_timings, args.timings)
+
+    if args.profile is not None:
+        profile_path = Path(".cache", f"{script_name}.prof") if args.profile is True else args.profile
+        profiler = cProfile.Profile()
+        atexit.register(_write_profile, profiler, profile_path)
+        profiler.enable()
+
+
+def _report_timings(destination: str) -> None:
+    if destination == "-":
+        timings.print_table()
+        return
+    path = Path(destination)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(timings.summary(), indent=2) + "\n", encoding="utf-8")
+    print(f"Timings written to {path}", file=sys.stderr)
+
+
+def _write_profile(profiler: cProfile.Profile, path: Path) -> None:
+    profiler.disable()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(path)
+    print(f"Profile written to {path}", file=sys.stderr)
+
+
 def to_repo_relative(path: Path, repo_root: Path) -> str:
     """Return a repository-relative path for display and annotations."""
     full_path = path if path.is_absolute() else (repo_root / path)
@@ -28,21 +188,227 @@ def emit_github_error(file_path: str, message: str, line_no: int | None = None)
         print(f"::error file={file_path}::{message}")
 
 
-def load_manifest_sources(manifest_path: Path) -> set[str] | None:
-    """Load file sources listed in the sync manifest."""
+@timings.timed("manifest")
+def load_manifest(manifest_path: Path) -> dict | None:
+    """Load and parse the sync manifest."""
     if not manifest_path.exists():
         print(f"ERROR: Manifest file not found: {manifest_path}", file=sys.stderr)
         return None
 
     try:
         with open(manifest_path, "rb") as f:
-            config = tomllib.load(f)
+            return tomllib.load(f)
     except Exception as exc:
         print(f"ERROR: Error reading manifest file: {exc}", file=sys.stderr)
         return None
 
+
+GLOB_CHARS = frozenset("*?[")
+
+
+class _GlobNode:
+    """A state in the compiled glob trie."""
+
+    __slots__ = ("literal", "wildcards", "globstar", "is_globstar", "rule")
+
+    def __init__(self, is_globstar: bool = False) -> None:
+        self.literal: dict[str, _GlobNode] = {}
+        self.wildcards: list[tuple[Callable[[str], object], _GlobNode]] = []
+        # The node entered by a ``**`` segment, which loops on any segment.
+        self.globstar: _GlobNode | None = None
+        self.is_globstar = is_globstar
+        self.rule: int | None = None
+
+
+class GlobMatcher:
+    """
+    Match paths against many glob patterns in a single walk.
+
+    Patterns are split on "/" and compiled into a trie of segments, so
+    patterns sharing a prefix share its nodes and literal segments are dict
+    lookups. Within a segment ``*``, ``?`` and ``[...]`` work as in fnmatch;
+    a ``**`` segment matches zero or more directories. The states reached
+    after each directory are memoized, so files in the same directory only
+    have their name matched.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.root = _GlobNode()
+        self.pattern_count = 0
+        wildcard_nodes: dict[tuple[int, str], _GlobNode] = {}
+        for rule, pattern in enumerate(patterns):
+            self.pattern_count += 1
+            node = self.root
+            for segment in pattern.strip("/").split("/"):
+                if segment == "**":
+                    if node.globstar is None:
+                        node.globstar = _GlobNode(is_globstar=True)
+                    node = node.globstar
+                elif GLOB_CHARS.isdisjoint(segment):
+                    node = node.literal.setdefault(segment, _GlobNode())
+                else:
+                    key = (id(node), segment)
+                    if key not in wildcard_nodes:
+                        child = _GlobNode()
+                        matcher = re.compile(fnmatch.translate(segment)).match
+                        node.wildcards.append((matcher, child))
+                        wildcard_nodes[key] = child
+                    node = wildcard_nodes[key]
+            if node.rule is None:
+                node.rule = rule
+        self._directory_states: dict[str, frozenset[_GlobNode]] = {
+            "": self._closure([self.root])
+        }
+
+    @staticmethod
+    def _closure(nodes: Iterable[_GlobNode]) -> frozenset[_GlobNode]:
+        """Add the states reachable by letting ``**`` match nothing."""
+        states: set[_GlobNode] = set()
+        pending = list(nodes)
+        while pending:
+            node = pending.pop()
+            if node not in states:
+                states.add(node)
+                if node.globstar is not None:
+                    pending.append(node.globstar)
+        return frozenset(states)
+
+    def _step(self, states: frozenset[_GlobNode], segment: str) -> frozenset[_GlobNode]:
+        following: list[_GlobNode] = []
+        for node in states:
+            if node.is_globstar:
+                following.append(node)
+            child = node.literal.get(segment)
+            if child is not None:
+                following.append(child)
+            for matcher, child in node.wildcards:
+                if matcher(segment):
+                    following.append(child)
+        return self._closure(following)
+
+    def _states_for_directory(self, directory: str) -> frozenset[_GlobNode]:
+        states = self._directory_states.get(directory)
+        if states is None:
+            parent, _, name = directory.rpartition("/")
+            parent_states = self._states_for_directory(parent)
+            states = self._step(parent_states, name) if parent_states else parent_states
+            self._directory_states[directory] = states
+        return states
+
+    def matches(self, path: str) -> list[int]:
+        """Return the indexes of every pattern matching path."""
+        directory, _, name = path.rpartition("/")
+        states = self._states_for_directory(directory)
+        if not states:
+            return []
+        return [node.rule for node in self._step(states, name) if node.rule is not None]
+
+    def match(self, path: str) -> int | None:
+        """Return the index of the first pattern matching path, if any."""
+        rules = self.matches(path)
+        return min(rules) if rules else None
+
+
+@dataclass(frozen=True)
+class ManifestRule:
+    """
+    A manifest include pattern and where its matches are published.
+
+    Without dest, matches keep their path. With dest, the literal leading
+    directories of the pattern (its base) are replaced by dest.
+    """
+
+    pattern: str
+    dest: str | None = None
+
+    @property
+    def base(self) -> str:
+        segments = self.pattern.strip("/").split("/")[:-1]
+        literal: list[str] = []
+        for segment in segments:
+            if not GLOB_CHARS.isdisjoint(segment):
+                break
+            literal.append(segment)
+        return "/".join(literal)
+
+    def destination(self, source: str) -> str:
+        if self.dest is None:
+            return source
+        base = self.base
+        relative = source[len(base) + 1 :] if base else source
+        return posixpath.join(self.dest, relative)
+
+
+def parse_manifest_rules(config: dict) -> tuple[list[ManifestRule], list[str]]:
+    """
+    Return the include rules and exclude patterns of a parsed manifest.
+
+    Raises ValueError for malformed entries.
+    """
+    includes = config.get("include", [])
+    excludes = config.get("exclude", [])
+    if not isinstance(includes, list) or not isinstance(excludes, list):
+        raise ValueError("'include' and 'exclude' must be lists")
+
+    rules: list[ManifestRule] = []
+    for item in includes:
+        if isinstance(item, str):
+            rule = ManifestRule(item)
+        elif isinstance(item, dict) and isinstance(item.get("source"), str):
+            dest = item.get("dest")
+            if dest is not None and not isinstance(dest, str):
+                raise ValueError("'dest' must be a string when provided")
+            rule = ManifestRule(item["source"], dest)
+        else:
+            raise ValueError("Each include must be a pattern or a table with a string 'source'")
+        rules.append(rule)
+
+    for pattern in [rule.pattern for rule in rules] + excludes:
+        if not isinstance(pattern, str) or not pattern:
+            raise ValueError("Patterns must be non-empty strings")
+        if pattern.startswith("/") or ".." in pattern.split("/"):
+            raise ValueError(f"Patterns must be relative to the repository: {pattern}")
+
+    return rules, excludes
+
+
+@timings.timed("manifest patterns")
+def expand_manifest_rules(
+    rules: list[ManifestRule],
+    excludes: list[str],
+    tracked_files: Iterable[str],
+) -> dict[str, str]:
+    """
+    Expand include rules against the tracked files in one pass.
+
+    Returns a source -> destination mapping in tracked file order. A file
+    matching an exclude pattern is skipped; a file matching several includes
+    uses the first one.
+    """
+    if not rules:
+        return {}
+
+    include_matcher = GlobMatcher(rule.pattern for rule in rules)
+    exclude_matcher = GlobMatcher(excludes) if excludes else None
+    expanded: dict[str, str] = {}
+    for path in tracked_files:
+        rule = include_matcher.match(path)
+        if rule is None:
+            continue
+        if exclude_matcher is not None and exclude_matcher.match(path) is not None:
+            continue
+        expanded[path] = rules[rule].destination(path)
+    return expanded
+
+
+def manifest_sources(config: dict, tracked_files: Iterable[str] | None = None) -> set[str] | None:
+    """
+    Return the file sources listed in, or matched by, a parsed sync manifest.
+
+    tracked_files is only needed when the manifest has include patterns.
+    """
     files = config.get("files", [])
-    if not files:
+    if not files and not config.get("include"):
         print("WARNING: No files found in manifest", file=sys.stderr)
 
     sources: set[str] = set()
@@ -56,9 +422,31 @@ def load_manifest_sources(manifest_path: Path) -> set[str] | None:
             source_path = entry
         sources.add(source_path)
 
+    try:
+        rules, excludes = parse_manifest_rules(config)
+    except ValueError as exc:
+        print(f"ERROR: Invalid manifest patterns: {exc}", file=sys.stderr)
+        return None
+    if rules:
+        if tracked_files is None:
+            print("ERROR: Manifest include patterns need the git-tracked files", file=sys.stderr)
+            return None
+        sources.update(expand_manifest_rules(rules, excludes, tracked_files))
+
     return sources
 
 
+def load_manifest_sources(
+    manifest_path: Path, tracked_files: Iterable[str] | None = None
+) -> set[str] | None:
+    """Load file sources listed in, or matched by, the sync manifest."""
+    config = load_manifest(manifest_path)
+    if config is None:
+        return None
+    return manifest_sources(config, tracked_files)
+
+
+@timings.timed("git")
 def get_tracked_files(repo_root: Path) -> list[str] | None:
     """Return git-tracked files relative to the repository root."""
     result = subprocess.run(
@@ -77,19 +465,433 @@ def get_tracked_files(repo_root: Path) -> list[str] | None:
     return [line for line in result.stdout.splitlines() if line.strip()]
 
 
-def get_excluded_files(manifest_path: Path, repo_root: Path) -> set[str] | None:
+def get_excluded_files(
+    manifest_path: Path, repo_root: Path, tracked_files: Iterable[str] | None = None
+) -> set[str] | None:
     """
     Get files excluded from sync-public.toml.
     
     Returns a set of repository-relative paths that are git-tracked but not
-    included in the sync manifest.
+    included in the sync manifest. The tracked files are listed with git
+    unless already known.
     """
-    manifest_sources = load_manifest_sources(manifest_path)
+    if tracked_files is None:
+        tracked_files = get_tracked_files(repo_root)
+        if tracked_files is None:
+            return None
+
+    manifest_sources = load_manifest_sources(manifest_path, tracked_files)
     if manifest_sources is None:
         return None
 
-    tracked_files = get_tracked_files(repo_root)
-    if tracked_files is None:
+    return set(tracked_files) - manifest_sources
+
+
+@timings.timed("git")
+def list_repo_files(repo_root: Path) -> tuple[list[str], set[str]] | None:
+    """
+    Return (tracked, present) files relative to the repository root.
+
+    Uses a single ``git ls-files`` call. tracked lists the files in the git
+    index, sorted; present holds the files in the working tree, tracked and
+    untracked (but not ignored), minus tracked files deleted from it.
+    """
+    result = subprocess.run(
+        [
+            "git", "-C", str(repo_root), "ls-files", "-z", "-t",
+            "--cached", "--others", "--deleted", "--exclude-standard",
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    if result.returncode != 0:
         return None
 
-    return set(tracked_files) - manifest_sources
+    tracked: set[str] = set()
+    untracked: set[str] = set()
+    deleted: set[str] = set()
+    for record in result.stdout.split("\0"):
+        if not record:
+            continue
+        tag, _, path = record.partition(" ")
+        if tag == "R":
+            deleted.add(path)
+        elif tag == "?":
+            untracked.add(path)
+        else:
+            tracked.add(path)
+
+    return sorted(tracked), (tracked | untracked) - deleted
+
+
+def get_working_tree_files(repo_root: Path) -> set[str] | None:
+    """
+    Return files present in the working tree, relative to the repository root.
+
+    Covers tracked and untracked (but not ignored) files, minus tracked files
+    deleted from the working tree.
+    """
+    files = list_repo_files(repo_root)
+    return None if files is None else files[1]
+
+
+def import_script(name: str) -> ModuleType:
+    """
+    Import one of the hyphenated scripts in this directory as a module.
+
+    For example ``import_script("check-links")`` returns a module named
+    ``check_links``.
+    """
+    module_name = name.replace("-", "_")
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.spec_from_file_location(
+        module_name, Path(__file__).with_name(f"{name}.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    # Registered before running so that dataclasses and pickling can find it.
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@timings.timed("git")
+def get_changed_files(repo_root: Path, ref: str) -> tuple[set[str], set[str]] | None:
+    """
+    Return files changed since the merge base of ref and HEAD.
+
+    Uses a single ``git diff --name-status`` call against the working tree.
+    Returns (changed, removed): paths that were added, modified, copied or
+    are the new side of a rename, and paths that were deleted or are the old
+    side of a rename.
+    """
+    result = subprocess.run(
+        [
+            "git", "-C", str(repo_root), "diff", "--name-status", "-z", "-M",
+            "--merge-base", ref, "--",
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    if result.returncode != 0:
+        print(f"ERROR: Failed to list files changed since {ref}", file=sys.stderr)
+        if result.stderr:
+            print(result.stderr.strip(), file=sys.stderr)
+        return None
+
+    changed: set[str] = set()
+    removed: set[str] = set()
+    fields = iter(result.stdout.split("\0"))
+    for status in fields:
+        if not status:
+            continue
+        path = next(fields)
+        if status[0] in "RC":
+            new_path = next(fields)
+            if status[0] == "R":
+                removed.add(path)
+            changed.add(new_path)
+        elif status[0] == "D":
+            removed.add(path)
+        else:
+            changed.add(path)
+
+    return changed, removed
+
+
+@dataclass(frozen=True)
+class TomlString:
+    """
+    A string value in a TOML file and the position of its opening quote.
+
+    path is the key path to the value, with array indexes as ints, for
+    example ``("files", 3, "source")``. line and col are 1-based.
+    """
+
+    path: tuple[str | int, ...]
+    value: str
+    line: int
+    col: int
+
+
+TOML_ESCAPES = {
+    "b": "\b", "t": "\t", "n": "\n", "f": "\f", "r": "\r", "e": "\x1b",
+    '"': '"', "\\": "\\",
+}
+TOML_BARE_KEY_CHARS = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-"
+)
+
+
+class TomlStringIndexer:
+    """
+    Single pass TOML tokenizer that records every string value.
+
+    Only as much of TOML is understood as is needed to track key paths and
+    string positions: tables, arrays of tables, dotted and quoted keys,
+    arrays, inline tables and all four string forms. Other scalars are
+    skipped. Malformed input raises ValueError; it is expected to have been
+    validated with tomllib already.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.pos = 0
+        self.line_starts = [0]
+        self.line_starts.extend(i + 1 for i, char in enumerate(text) if char == "\n")
+        self.strings: list[TomlString] = []
+        # Number of tables in each array of tables, and the index of the
+        # latest one, which later headers nested under it refer to.
+        self.table_counts: dict[tuple[str | int, ...], int] = {}
+        self.array_indexes: dict[tuple[str, ...], int] = {}
+
+    def position(self, offset: int) -> tuple[int, int]:
+        """Return the 1-based (line, col) of an offset into the text."""
+        line = bisect.bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+    def error(self, message: str) -> ValueError:
+        line, col = self.position(self.pos)
+        return ValueError(f"{message} at line {line}, column {col}")
+
+    def peek(self, count: int = 1) -> str:
+        return self.text[self.pos : self.pos + count]
+
+    def skip_space(self, newlines: bool = False) -> None:
+        """Skip whitespace and comments, and newlines too if asked."""
+        text = self.text
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char in " \t" or (newlines and char in "\r\n"):
+                self.pos += 1
+            elif char == "#":
+                end = text.find("\n", self.pos)
+                self.pos = len(text) if end < 0 else end
+            else:
+                break
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self.error(f"Expected {char!r}")
+        self.pos += 1
+
+    def index(self) -> list[TomlString]:
+        table: tuple[str | int, ...] = ()
+        while True:
+            self.skip_space(newlines=True)
+            if self.pos >= len(self.text):
+                return self.strings
+            if self.peek(2) == "[[":
+                self.pos += 2
+                table = self.resolve_table(self.parse_key(), is_array=True)
+                self.expect("]")
+                self.expect("]")
+            elif self.peek() == "[":
+                self.pos += 1
+                table = self.resolve_table(self.parse_key(), is_array=False)
+                self.expect("]")
+            else:
+                self.parse_key_value(table)
+            self.skip_space()
+            if self.pos < len(self.text) and self.peek() not in "\r\n":
+                raise self.error("Expected end of line")
+
+    def resolve_table(self, name: tuple[str, ...], is_array: bool) -> tuple[str | int, ...]:
+        """Return the path of a table header, indexing arrays of tables."""
+        path: list[str | int] = []
+        for end, part in enumerate(name, start=1):
+            path.append(part)
+            if end < len(name) or not is_array:
+                if name[:end] in self.array_indexes:
+                    path.append(self.array_indexes[name[:end]])
+        if is_array:
+            count = self.table_counts.get(tuple(path), 0)
+            self.table_counts[tuple(path)] = count + 1
+            self.array_indexes[name] = count
+            path.append(count)
+        return tuple(path)
+
+    def parse_key(self) -> tuple[str, ...]:
+        """Parse a possibly dotted, possibly quoted key."""
+        parts: list[str] = []
+        while True:
+            self.skip_space()
+            char = self.peek()
+            if char == '"':
+                parts.append(self.parse_basic_string())
+            elif char == "'":
+                parts.append(self.parse_literal_string())
+            else:
+                start = self.pos
+                while self.pos < len(self.text) and self.text[self.pos] in TOML_BARE_KEY_CHARS:
+                    self.pos += 1
+                if start == self.pos:
+                    raise self.error("Expected a key")
+                parts.append(self.text[start : self.pos])
+            self.skip_space()
+            if self.peek() != ".":
+                return tuple(parts)
+            self.pos += 1
+
+    def parse_key_value(self, table: tuple[str | int, ...]) -> None:
+        key = self.parse_key()
+        self.expect("=")
+        self.skip_space()
+        self.parse_value(table + key)
+
+    def parse_value(self, path: tuple[str | int, ...]) -> None:
+        start = self.pos
+        char = self.peek()
+        if char == '"' or char == "'":
+            if self.peek(3) == char * 3:
+                value = self.parse_multiline_string(char)
+            elif char == '"':
+                value = self.parse_basic_string()
+            else:
+                value = self.parse_literal_string()
+            line, col = self.position(start)
+            self.strings.append(TomlString(path, value, line, col))
+        elif char == "[":
+            self.parse_array(path)
+        elif char == "{":
+            self.parse_inline_table(path)
+        else:
+            # Numbers, booleans and dates: skip to the end of the token.
+            text = self.text
+            while self.pos < len(text) and text[self.pos] not in ",]}#\r\n":
+                if text[self.pos] in " \t" and text[self.pos + 1 : self.pos + 2] not in "0123456789":
+                    break
+                self.pos += 1
+            if self.pos == start:
+                raise self.error("Expected a value")
+
+    def parse_array(self, path: tuple[str | int, ...]) -> None:
+        self.expect("[")
+        index = 0
+        while True:
+            self.skip_space(newlines=True)
+            if self.peek() == "]":
+                self.pos += 1
+                return
+            self.parse_value(path + (index,))
+            index += 1
+            self.skip_space(newlines=True)
+            if self.peek() == ",":
+                self.pos += 1
+            elif self.peek() != "]":
+                raise self.error("Expected ',' or ']'")
+
+    def parse_inline_table(self, path: tuple[str | int, ...]) -> None:
+        self.expect("{")
+        self.skip_space()
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            self.skip_space()
+            self.parse_key_value(path)
+            self.skip_space()
+            if self.peek() == "}":
+                self.pos += 1
+                return
+            self.expect(",")
+
+    def parse_literal_string(self) -> str:
+        self.expect("'")
+        end = self.text.find("'", self.pos)
+        newline = self.text.find("\n", self.pos)
+        if end < 0 or 0 <= newline < end:
+            raise self.error("Unterminated string")
+        value = self.text[self.pos : end]
+        self.pos = end + 1
+        return value
+
+    def parse_basic_string(self) -> str:
+        self.expect('"')
+        parts: list[str] = []
+        text = self.text
+        while True:
+            if self.pos >= len(text) or text[self.pos] == "\n":
+                raise self.error("Unterminated string")
+            char = text[self.pos]
+            if char == '"':
+                self.pos += 1
+                return "".join(parts)
+            if char == "\\":
+                parts.append(self.parse_escape())
+            else:
+                parts.append(char)
+                self.pos += 1
+
+    def parse_escape(self) -> str:
+        code = self.text[self.pos + 1 : self.pos + 2]
+        if code in TOML_ESCAPES:
+            self.pos += 2
+            return TOML_ESCAPES[code]
+        if code in ("u", "U", "x"):
+            width = {"u": 4, "U": 8, "x": 2}[code]
+            digits = self.text[self.pos + 2 : self.pos + 2 + width]
+            try:
+                value = chr(int(digits, 16))
+            except ValueError:
+                raise self.error("Invalid escape") from None
+            self.pos += 2 + width
+            return value
+        raise self.error("Invalid escape")
+
+    def parse_multiline_string(self, quote: str) -> str:
+        delimiter = quote * 3
+        self.pos += 3
+        # A newline immediately after the opening delimiter is trimmed.
+        if self.peek(2) == "\r\n":
+            self.pos += 2
+        elif self.peek() == "\n":
+            self.pos += 1
+
+        parts: list[str] = []
+        text = self.text
+        while True:
+            if self.pos >= len(text):
+                raise self.error("Unterminated string")
+            if text.startswith(delimiter, self.pos):
+                # Up to two quotes may directly precede the closing delimiter.
+                extra = 0
+                while extra < 2 and text[self.pos + 3 + extra : self.pos + 4 + extra] == quote:
+                    extra += 1
+                parts.append(quote * extra)
+                self.pos += 3 + extra
+                return "".join(parts)
+            char = text[self.pos]
+            if quote == '"' and char == "\\":
+                rest = text[self.pos + 1 :]
+                stripped = rest.lstrip(" \t")
+                if stripped.startswith(("\n", "\r\n")):
+                    # Line ending backslash: trim all following whitespace.
+                    self.pos = len(text) - len(rest.lstrip(" \t\r\n"))
+                    continue
+                parts.append(self.parse_escape())
+            else:
+                parts.append(char)
+                self.pos += 1
+
+
+@timings.timed("toml index")
+def index_toml_strings(path: Path) -> list[TomlString] | None:
+    """
+    Return every string value in a TOML file with its line and column.
+
+    The file is tokenized once, so callers can map values back to their
+    exact position without rescanning it. Returns None if the file cannot
+    be read or tokenized; positions are only used for annotations.
+    """
+    try:
+        text = path.read_text(encoding="utf-8")
+        return TomlStringIndexer(text).index()
+    except (OSError, UnicodeDecodeError, ValueError):
+        return None
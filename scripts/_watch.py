@@ -0,0 +1,247 @@
+"""File watching for the QA scripts' --watch modes."""
+
+import ctypes
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+# inotify event masks, see inotify(7).
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+# Flush a batch even while events keep arriving, so that a busy directory
+# cannot postpone the check forever.
+MAX_BATCH_DELAY = 2.0
+
+
+def _load_libc():
+    """Return libc when it provides inotify, else None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class FileWatcher:
+    """
+    Report batches of changed paths under some directories and files.
+
+    Directories are watched recursively, skipping hidden subdirectories;
+    individual files are watched through their parent directory. inotify is
+    used on Linux, otherwise (or when it runs out of watches) the tree is
+    polled. Events are debounced: a batch is yielded once no event has
+    arrived for ``debounce`` seconds. Batches may contain directories, for
+    example when one is created or renamed, meaning that anything under
+    them may have changed.
+
+    Only the watch descriptors and the pending batch are kept in memory
+    (plus one (mtime, size) pair per file when polling), so the watcher can
+    run indefinitely.
+    """
+
+    def __init__(
+        self,
+        directories: Iterable[Path],
+        files: Iterable[Path] = (),
+        debounce: float = 0.2,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.directories = [path.resolve() for path in directories]
+        self.files = [path.resolve() for path in files]
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._fd: int | None = None
+        self._watches: dict[int, Path] = {}
+        self._recursive: set[int] = set()
+        # Names of explicitly watched files, per watched parent directory.
+        self._file_names: dict[int, set[str]] = {}
+
+        libc = _load_libc()
+        if libc is not None:
+            try:
+                self._start_inotify(libc)
+            except OSError as exc:
+                print(f"⚠️  inotify unavailable ({exc}), polling for changes", file=sys.stderr)
+                self.close()
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._fd is not None else "polling"
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._watches.clear()
+        self._recursive.clear()
+        self._file_names.clear()
+
+    def changes(self) -> Iterator[set[Path]]:
+        """Yield batches of changed paths, forever."""
+        if self._fd is not None:
+            yield from self._inotify_changes()
+        else:
+            yield from self._polling_changes()
+
+    # inotify
+
+    def _start_inotify(self, libc) -> None:
+        self._libc = libc
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._fd = fd
+        for directory in self.directories:
+            self._add_tree(directory)
+        for path in self.files:
+            wd = self._add_watch(path.parent)
+            if wd is not None:
+                self._file_names.setdefault(wd, set()).add(path.name)
+
+    def _add_watch(self, directory: Path) -> int | None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise OSError(error, "inotify watch limit reached")
+            # The directory vanished or cannot be read; nothing to watch.
+            return None
+        self._watches[wd] = directory
+        return wd
+
+    def _add_tree(self, directory: Path) -> None:
+        for root, dirs, _ in os.walk(directory):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            wd = self._add_watch(Path(root))
+            if wd is not None:
+                self._recursive.add(wd)
+
+    def _read_events(self, pending: set[Path]) -> None:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: treat everything as changed.
+                pending.update(self.directories)
+                pending.update(self.files)
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                self._recursive.discard(wd)
+                self._file_names.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / name
+            if wd in self._recursive:
+                if mask & IN_ISDIR and name.startswith("."):
+                    continue
+                pending.add(path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        self._add_tree(path)
+                    except OSError as exc:
+                        print(f"⚠️  Not watching {path}: {exc}", file=sys.stderr)
+            if name in self._file_names.get(wd, ()):
+                pending.add(path)
+
+    def _inotify_changes(self) -> Iterator[set[Path]]:
+        pending: set[Path] = set()
+        deadline = 0.0
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0.0, min(self.debounce, deadline - time.monotonic()))
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+            if ready:
+                if not pending:
+                    deadline = time.monotonic() + MAX_BATCH_DELAY
+                self._read_events(pending)
+                if not pending or time.monotonic() < deadline:
+                    continue
+            if pending:
+                yield pending
+                pending = set()
+
+    # polling
+
+    def _snapshot(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+
+        def record(path: Path) -> None:
+            try:
+                stat = path.stat()
+            except OSError:
+                return
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+        for directory in self.directories:
+            for root, dirs, names in os.walk(directory):
+                dirs[:] = [d for d in dirs if not d.startswith(".")]
+                for name in names:
+                    record(Path(root, name))
+        for path in self.files:
+            record(path)
+        return snapshot
+
+    def _polling_changes(self) -> Iterator[set[Path]]:
+        snapshot = self._snapshot()
+        pending: set[Path] = set()
+        while True:
+            time.sleep(self.poll_interval)
+            current = self._snapshot()
+            changed = {
+                path
+                for path in snapshot.keys() | current.keys()
+                if snapshot.get(path) != current.get(path)
+            }
+            snapshot = current
+            if changed:
+                pending |= changed
+            elif pending:
+                yield pending
+                pending = set()
+
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""Build the architecture decision registry from the ADRs' metadata blocks."""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from _utils import (
+    add_instrumentation_arguments,
+    emit_github_error,
+    get_excluded_files,
+    start_instrumentation,
+    timings,
+    to_repo_relative,
+)
+
+# Bump whenever the cache layout or the parsing rules change.
+CACHE_VERSION = 2
+REGISTRY_VERSION = 1
+DEFAULT_CACHE_PATH = Path(".cache/adr-registry.json")
+
+# The statuses defined by the ADR process (architecture-decision-record-process.md).
+VALID_STATUSES = ("Proposed", "Under Review", "Accepted", "Rejected", "Superseded", "Deprecated")
+
+TITLE_PATTERN = re.compile(r"^#\s+(.+?)(?:\s+#+)?\s*$")
+FIELD_PATTERN = re.compile(r"^\s*\*\*(Status|Level|Updated|Date)\*\*\s*:\s*(.*?)\s*$", re.IGNORECASE)
+DATE_PATTERN = re.compile(r"\d{1,4}[-/]\d{1,2}[-/]\d{1,4}")
+DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%Y/%m/%d")
+# The metadata block comes before the first section; stop there, or after
+# this many lines for files without sections.
+MAX_HEADER_LINES = 60
+
+REGISTRY_BEGIN = "<!-- BEGIN ADR REGISTRY: generated by scripts/adr-registry.py, do not edit -->"
+REGISTRY_END = "<!-- END ADR REGISTRY -->"
+
+
+@dataclass
+class DecisionRecord:
+    """The registry entry for one ADR, as read from its metadata block."""
+
+    path: str
+    category: str
+    title: str | None
+    status: str | None
+    level: int | None
+    updated: str | None
+    # Where Status and Updated (or Date) were found, for annotations; not
+    # part of the registry.
+    status_line: int | None = None
+    updated_line: int | None = None
+
+    def to_json(self) -> dict:
+        return {
+            "path": self.path,
+            "category": self.category,
+            "title": self.title,
+            "status": self.status,
+            "level": self.level,
+            "updated": self.updated,
+        }
+
+
+def normalize_status(value: str) -> str:
+    """Return the canonical spelling of a status, or the value as written."""
+    folded = " ".join(value.split()).casefold()
+    for status in VALID_STATUSES:
+        if folded == status.casefold():
+            return status
+    return value
+
+
+def normalize_date(value: str) -> str:
+    """Return a date as YYYY-MM-DD when it can be parsed, else as written."""
+    match = DATE_PATTERN.search(value)
+    if match:
+        for date_format in DATE_FORMATS:
+            try:
+                return datetime.strptime(match.group(0), date_format).date().isoformat()
+            except ValueError:
+                continue
+    return value
+
+
+def is_iso_date(value: str) -> bool:
+    """Return whether value is a real calendar date written as YYYY-MM-DD."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date().isoformat() == value
+    except ValueError:
+        return False
+
+
+def parse_header(lines, path: str, category: str) -> DecisionRecord:
+    """
+    Read the title and Status/Level/Updated fields from the top of an ADR.
+
+    Only the lines up to the first ``##`` section are looked at. Updated is
+    preferred over Date when an ADR has both.
+    """
+    record = DecisionRecord(path, category, None, None, None, None)
+    date = date_line = None
+    for line_no, line in enumerate(lines, start=1):
+        if line_no > MAX_HEADER_LINES or line.startswith("## "):
+            break
+        if record.title is None:
+            title = TITLE_PATTERN.match(line)
+            if title:
+                record.title = title.group(1)
+                continue
+        field = FIELD_PATTERN.match(line)
+        if not field:
+            continue
+        name, value = field.group(1).lower(), field.group(2)
+        if name == "status" and record.status is None:
+            record.status = normalize_status(value)
+            record.status_line = line_no
+        elif name == "level" and record.level is None and value.isdigit():
+            record.level = int(value)
+        elif name == "updated":
+            record.updated = normalize_date(value)
+            record.updated_line = line_no
+        elif name == "date" and date is None:
+            date = normalize_date(value)
+            date_line = line_no
+    if record.updated is None:
+        record.updated = date
+        record.updated_line = date_line
+    return record
+
+
+class RegistryCache:
+    """
+    On-disk cache of parsed ADR headers, keyed by path and content hash.
+
+    A file whose size and mtime are unchanged is not read at all; one that
+    was only touched is hashed and reused if its content is the same.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self.hits = 0
+
+    @classmethod
+    @timings.timed("cache")
+    def load(cls, path: Path) -> "RegistryCache":
+        """Load the cache, starting empty if it is missing, corrupt or stale."""
+        cache = cls(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if data.get("version") == CACHE_VERSION:
+            cache.entries = data.get("files", {})
+        return cache
+
+    def lookup(self, key: str, adr_file: Path) -> DecisionRecord | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        try:
+            stat = adr_file.stat()
+        except OSError:
+            return None
+        if stat.st_size != entry["size"]:
+            return None
+        if stat.st_mtime_ns != entry["mtime_ns"]:
+            try:
+                digest = hashlib.sha256(adr_file.read_bytes()).hexdigest()
+            except OSError:
+                return None
+            if digest != entry["digest"]:
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+        self.hits += 1
+        return DecisionRecord(**entry["record"])
+
+    def store(self, key: str, size: int, mtime_ns: int, digest: str, record: DecisionRecord) -> None:
+        self.entries[key] = {
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "digest": digest,
+            "record": asdict(record),
+        }
+
+    @timings.timed("cache")
+    def save(self, keys: set[str]) -> None:
+        """Write the cache, forgetting ADRs that no longer exist."""
+        data = {
+            "version": CACHE_VERSION,
+            "files": {key: entry for key, entry in sorted(self.entries.items()) if key in keys},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+            tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            tmp_path.replace(self.path)
+        except OSError as e:
+            print(f"⚠️  Could not write ADR registry cache {self.path}: {e}", file=sys.stderr)
+
+
+def read_record(adr_file: Path, key: str, category: str, cache: RegistryCache | None) -> DecisionRecord:
+    """Return the registry entry for one ADR, from the cache when unchanged."""
+    if cache is not None:
+        record = cache.lookup(key, adr_file)
+        if record is not None:
+            return record
+
+    with open(adr_file, "rb") as f:
+        stat = os.fstat(f.fileno())
+        digest = hashlib.sha256()
+        header: list[str] | None = []
+        # Hash the whole file but only decode lines until the header ends.
+        for raw_line in f:
+            digest.update(raw_line)
+            if header is not None:
+                line = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+                header.append(line)
+                if len(header) > MAX_HEADER_LINES or line.startswith("## "):
+                    record = parse_header(header, key, category)
+                    header = None
+        if header is not None:
+            record = parse_header(header, key, category)
+
+    if cache is not None:
+        cache.store(key, stat.st_size, stat.st_mtime_ns, digest.hexdigest(), record)
+    return record
+
+
+def category_title(name: str) -> str:
+    """Turn a category directory name such as meta-decisions into Meta Decisions."""
+    return " ".join(word.capitalize() for word in re.split(r"[-_\s]+", name) if word)
+
+
+@timings.timed("walk")
+def find_decisions(
+    decisions_dir: Path, repo_root: Path, excluded_files: set[str]
+) -> list[tuple[Path, str, str]]:
+    """
+    Return (file, repo-relative path, category) for every ADR, sorted by path.
+
+    The index page is not an ADR, and ADRs excluded from sync-public.toml
+    are left out so that the generated index never names a private record.
+    """
+    decisions = []
+    for adr_file in decisions_dir.rglob("*.md"):
+        relative = adr_file.relative_to(decisions_dir)
+        if relative.name == "index.md":
+            continue
+        key = to_repo_relative(adr_file, repo_root)
+        if key in excluded_files:
+            continue
+        category = category_title(relative.parts[0]) if len(relative.parts) > 1 else "Other Decisions"
+        decisions.append((adr_file, key, category))
+    return sorted(decisions, key=lambda decision: decision[1])
+
+
+@timings.timed("parse")
+def read_records(
+    decisions: list[tuple[Path, str, str]], cache: RegistryCache | None
+) -> list[DecisionRecord]:
+    return [read_record(adr_file, key, category, cache) for adr_file, key, category in decisions]
+
+
+def find_issues(records: list[DecisionRecord]) -> list[tuple[DecisionRecord, str, int | None]]:
+    """
+    Return (record, message, line) for every missing title, missing or
+    invalid status, and Updated or Date value that could not be parsed.
+    """
+    issues = []
+    for record in records:
+        if record.title is None:
+            issues.append((record, "ADR has no '# ' title", record.status_line))
+        if record.status is None:
+            issues.append((record, "ADR has no **Status** field", None))
+        elif record.status not in VALID_STATUSES:
+            issues.append((record, f"Invalid ADR status '{record.status}'", record.status_line))
+        if record.updated is not None and not is_iso_date(record.updated):
+            issues.append(
+                (record, f"Unrecognised ADR date '{record.updated}'", record.updated_line)
+            )
+    return issues
+
+
+def render_registry(records: list[DecisionRecord]) -> str:
+    """Return the machine-readable registry as deterministic JSON."""
+    data = {
+        "version": REGISTRY_VERSION,
+        "decisions": [record.to_json() for record in records],
+    }
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+def _table_cell(value: str | int | None) -> str:
+    return "-" if value is None else str(value).replace("|", "\\|")
+
+
+def render_index_section(records: list[DecisionRecord], index_dir: Path, repo_root: Path) -> str:
+    """Return the generated Decision Log section of the index page, markers included."""
+    lines = [
+        REGISTRY_BEGIN,
+        "",
+        "## Decision Log",
+        "",
+    ]
+    categories: dict[str, list[DecisionRecord]] = {}
+    for record in records:
+        categories.setdefault(record.category, []).append(record)
+    for category, category_records in sorted(categories.items()):
+        lines += [
+            f"### {category}",
+            "",
+            "| Decision | Status | Level | Updated |",
+            "| -------- | ------ | ----- | ------- |",
+        ]
+        for record in sorted(category_records, key=lambda r: ((r.title or r.path).casefold(), r.path)):
+            link = Path(os.path.relpath(repo_root / record.path, index_dir)).as_posix()
+            title = _table_cell(record.title or Path(record.path).stem)
+            lines.append(
+                f"| [{title}]({link}) | {_table_cell(record.status)} "
+                f"| {_table_cell(record.level)} | {_table_cell(record.updated)} |"
+            )
+        lines.append("")
+    lines.append(REGISTRY_END)
+    return "\n".join(lines)
+
+
+def render_index(current: str, section: str) -> str:
+    """Replace the generated section of the index page, appending it if absent."""
+    start = current.find(REGISTRY_BEGIN)
+    end = current.find(REGISTRY_END, start)
+    if start != -1 and end != -1:
+        return current[:start] + section + current[end + len(REGISTRY_END):]
+    return current.rstrip("\n") + "\n\n" + section + "\n"
+
+
+@timings.timed("output")
+def update_outputs(outputs: dict[Path, str], check: bool, repo_root: Path) -> list[str]:
+    """
+    Write each output whose content changed and return their paths.
+
+    With ``check`` nothing is written: the stale outputs are only returned.
+    """
+    stale = []
+    for path, content in outputs.items():
+        try:
+            current = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            current = None
+        if current == content:
+            continue
+        stale.append(to_repo_relative(path, repo_root))
+        if not check:
+            path.write_text(content, encoding="utf-8")
+    return stale
+
+
+def report_issues(
+    records: list[DecisionRecord],
+    issues: list[tuple[DecisionRecord, str, int | None]],
+    stale: list[str],
+    check: bool,
+    output_format: str,
+) -> int:
+    """Print the registry summary, any issues and the outputs written or stale."""
+    statuses: dict[str, int] = {}
+    for record in records:
+        if record.status in VALID_STATUSES:
+            statuses[record.status] = statuses.get(record.status, 0) + 1
+    print(f"📚 Decisions: {len(records)}")
+    for status in VALID_STATUSES:
+        if statuses.get(status):
+            print(f"   {status}: {statuses[status]}")
+
+    if output_format == "github":
+        for record, message, line in issues:
+            emit_github_error(record.path, message, line)
+        if check:
+            for path in stale:
+                emit_github_error(path, "Out of date: run 'just adr-registry' to regenerate")
+
+    if stale:
+        if check:
+            print("\n❌ Generated files are out of date (run 'just adr-registry'):")
+        else:
+            print("\n📝 Updated:")
+        for path in stale:
+            print(f"- {path}")
+
+    if issues:
+        print(f"\n❌ Found {len(issues)} ADR metadata issue(s):")
+        for record, message, line in issues:
+            location = f"{record.path}:{line}" if line else record.path
+            print(f"- {location}: {message}")
+        print(f"\nValid statuses: {', '.join(VALID_STATUSES)}")
+        print("Dates are written as YYYY-MM-DD (DD-MM-YYYY and DD/MM/YYYY are also read)")
+        return 1
+    if check and stale:
+        return 1
+
+    print("\n✅ All ADRs have a title, a valid status and a valid date")
+    return 0
+
+
+def main() -> int:
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Build the ADR registry (a JSON index and the Decision Log section "
+            "of the decisions index page) from each ADR's Status, Level and "
+            "Updated fields, and flag missing or invalid statuses."
+        )
+    )
+    parser.add_argument(
+        "path",
+        nargs="?",
+        type=Path,
+        default=Path("doc/decisions"),
+        help="Directory containing the ADRs (default: doc/decisions)",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=Path("sync-public.toml"),
+        help="Path to sync-public.toml manifest file (default: sync-public.toml)",
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path("."),
+        help="Root directory of the repository (default: current directory)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["summary", "github"],
+        default="summary",
+        help="Output format (default: summary)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Do not write anything; fail if the generated files are out of date",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        type=Path,
+        const=DEFAULT_CACHE_PATH,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Reuse the metadata of ADRs whose content is unchanged since the last run "
+            f"(default path: {DEFAULT_CACHE_PATH})"
+        ),
+    )
+
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    start_instrumentation(args, "adr-registry")
+
+    if not args.path.is_dir():
+        print(f"❌ Error: Directory '{args.path}' does not exist.", file=sys.stderr)
+        return 1
+
+    repo_root = args.repo_root.resolve()
+    excluded_files = get_excluded_files(args.manifest, repo_root)
+    if excluded_files is None:
+        return 1
+
+    decisions_dir = args.path.resolve()
+    cache = RegistryCache.load(args.cache) if args.cache is not None else None
+    decisions = find_decisions(decisions_dir, repo_root, excluded_files)
+    records = read_records(decisions, cache)
+    if cache is not None:
+        cache.save({key for _, key, _ in decisions})
+        print(f"♻️  Reused {cache.hits} of {len(records)} ADR(s) from {args.cache}")
+
+    index_path = decisions_dir / "index.md"
+    try:
+        index = index_path.read_text(encoding="utf-8")
+    except OSError as e:
+        print(f"❌ Error: Could not read {index_path}: {e}", file=sys.stderr)
+        return 1
+    section = render_index_section(records, decisions_dir, repo_root)
+    outputs = {
+        decisions_dir / "registry.json": render_registry(records),
+        index_path: render_index(index, section),
+    }
+    stale = update_outputs(outputs, args.check, repo_root)
+    return report_issues(records, find_issues(records), stale, args.check, args.format)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""Benchmark the QA and sync scripts against synthetic documentation corpora."""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import posixpath
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from _utils import get_tracked_files, import_script, load_manifest_sources
+
+check_links_script = import_script("check-links")
+verify_sync_manifest_script = import_script("verify-sync-manifest")
+list_sync_excluded_script = import_script("list-sync-excluded-files")
+check_sync_excluded_nav_script = import_script("check-sync-excluded-nav")
+sync_public_script = import_script("sync-public")
+
+# Bump whenever the corpus layout or the set of benchmarks changes, so that
+# results are never compared against an incompatible baseline.
+RESULTS_VERSION = 2
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+SECTIONS_PER_PAGE = 4
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Shape of a generated documentation corpus."""
+
+    files: int
+    links_per_file: float = 8.0
+    broken_ratio: float = 0.01
+    fence_ratio: float = 0.2
+    excluded_ratio: float = 0.02
+    nav_depth: int = 3
+    seed: int = 0
+
+
+def page_path(index: int, spec: CorpusSpec) -> str:
+    """Return the docs-relative path of page index, nav_depth directories deep."""
+    fanout = max(2, math.ceil(spec.files ** (1 / (spec.nav_depth + 1))))
+    directories = []
+    remaining = index // fanout
+    for _ in range(spec.nav_depth):
+        directories.append(f"section-{remaining % fanout}")
+        remaining //= fanout
+    return posixpath.join(*reversed(directories), f"page-{index}.md")
+
+
+def page_text(index: int, paths: list[str], spec: CorpusSpec, rng: random.Random) -> str:
+    """Return the markdown for one page, linking to random other pages."""
+    source_dir = posixpath.dirname(paths[index])
+    link_count = int(spec.links_per_file) + (rng.random() < spec.links_per_file % 1)
+    links = []
+    for _ in range(link_count):
+        target = rng.randrange(spec.files)
+        href = posixpath.relpath(paths[target], source_dir or ".")
+        if rng.random() < spec.broken_ratio:
+            # Half the broken links miss the page, half miss the anchor.
+            if rng.random() < 0.5:
+                href = href.replace("page-", "missing-page-")
+            else:
+                href += "#no-such-section"
+        elif rng.random() < 0.3:
+            href += f"#section-{rng.randint(1, SECTIONS_PER_PAGE)}"
+        links.append(f"[page {target}]({href})")
+
+    lines = [f"# Page {index}", ""]
+    per_section = math.ceil(len(links) / SECTIONS_PER_PAGE) or 1
+    for section in range(1, SECTIONS_PER_PAGE + 1):
+        lines += [f"## Section {section}", ""]
+        chunk = links[(section - 1) * per_section : section * per_section]
+        text = "Some text about this topic, see " + ", ".join(chunk) + "." if chunk else "Some text."
+        lines += [text, ""]
+    if rng.random() < spec.fence_ratio:
+        # Links inside code must be ignored by the checker.
+        lines += ["```markdown", "[not a link](missing.md)", "```", ""]
+    return "\n".join(lines)
+
+
+def nav_toml(paths: list[str]) -> str:
+    """Return a zensical nav array listing every page, grouped by directory."""
+    tree: dict = {}
+    for path in paths:
+        *directories, _ = path.split("/")
+        node = tree
+        for directory in directories:
+            node = node.setdefault(directory, {})
+        node.setdefault("", []).append(path)
+
+    def render(node: dict, indent: str) -> list[str]:
+        lines = []
+        for path in node.get("", []):
+            title = posixpath.splitext(posixpath.basename(path))[0]
+            lines.append(f"{indent}{{ {json.dumps(title)} = {json.dumps(path)} }},")
+        for name, child in sorted((k, v) for k, v in node.items() if k):
+            lines.append(f"{indent}{{ {json.dumps(name)} = [")
+            lines += render(child, indent + "  ")
+            lines.append(f"{indent}] }},")
+        return lines
+
+    return "\n".join(["nav = ["] + render(tree, "  ") + ["]"])
+
+
+def generate_corpus(root: Path, spec: CorpusSpec) -> None:
+    """
+    Write a corpus repository to root.
+
+    The corpus is a git repository (files are staged, not committed) with
+    spec.files pages under doc/, a sync-public.toml listing all but
+    spec.excluded_ratio of them and a zensical.toml nav listing every page.
+    """
+    rng = random.Random(spec.seed)
+    paths = [page_path(index, spec) for index in range(spec.files)]
+    docs = root / "doc"
+    for index, path in enumerate(paths):
+        full_path = docs / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(page_text(index, paths, spec, rng), encoding="utf-8")
+
+    published = [
+        f"doc/{path}" for path in paths if rng.random() >= spec.excluded_ratio
+    ]
+    manifest = ["files = [", '  "sync-public.toml",', '  "zensical.toml",']
+    manifest += [f"  {json.dumps(path)}," for path in published]
+    manifest.append("]")
+    (root / "sync-public.toml").write_text("\n".join(manifest) + "\n", encoding="utf-8")
+
+    config = ["[project]", 'site_name = "Benchmark corpus"', 'docs_dir = "doc"', nav_toml(paths)]
+    (root / "zensical.toml").write_text("\n".join(config) + "\n", encoding="utf-8")
+
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    subprocess.run(["git", "-C", str(root), "add", "-A"], check=True)
+
+
+def time_call(function: Callable[[], object], repeat: int) -> dict[str, object]:
+    """
+    Time repeat calls, with output discarded.
+
+    Returns the wall time of every run along with their median, which is
+    what baselines are compared on, and minimum.
+    """
+    runs = []
+    with open(os.devnull, "w") as devnull:
+        for _ in range(repeat):
+            with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+                start = time.perf_counter()
+                function()
+                runs.append(round(time.perf_counter() - start, 6))
+    return {"median": round(statistics.median(runs), 6), "min": min(runs), "runs": runs}
+
+
+def benchmark_corpus(root: Path, repeat: int, jobs: int) -> dict[str, dict[str, object]]:
+    """Time every benchmarked function against the corpus at root."""
+    manifest_path = root / "sync-public.toml"
+    config_path = root / "zensical.toml"
+    tracked_files = get_tracked_files(root)
+    sources = load_manifest_sources(manifest_path, tracked_files)
+    excluded_files = set(tracked_files) - sources
+    nav_files, docs_dir = check_sync_excluded_nav_script.load_nav_files(config_path)
+    target_root = root.parent / f"{root.name}-target"
+
+    def sync() -> None:
+        shutil.rmtree(target_root, ignore_errors=True)
+        target_root.mkdir()
+        sync_public_script.sync_files(root, target_root, manifest_path, dry_run=False)
+
+    benchmarks = {
+        "check_links": lambda: check_links_script.check_links(
+            root / "doc", excluded_files, root, jobs=jobs
+        ),
+        "verify_manifest": lambda: verify_sync_manifest_script.verify_manifest(
+            manifest_path, root, output_format="github"
+        ),
+        "report_mismatches": lambda: check_sync_excluded_nav_script.report_mismatches(
+            nav_files, excluded_files, config_path, root, docs_dir, "github"
+        ),
+        "list_excluded_files": lambda: list_sync_excluded_script.list_excluded_files(
+            sources, tracked_files, "summary"
+        ),
+        "sync_files": sync,
+    }
+
+    timings = {}
+    try:
+        for name, function in benchmarks.items():
+            timings[name] = time_call(function, repeat)
+            print(
+                f"   {name}: {timings[name]['median']:.3f}s median, "
+                f"{timings[name]['min']:.3f}s best of {repeat}"
+            )
+    finally:
+        shutil.rmtree(target_root, ignore_errors=True)
+    return timings
+
+
+def corpus_differences(corpus: dict, baseline_corpus: dict) -> list[str]:
+    """Return the corpus settings, other than the sizes, that differ from the baseline's."""
+    keys = (corpus.keys() | baseline_corpus.keys()) - {"files"}
+    return sorted(key for key in keys if corpus.get(key) != baseline_corpus.get(key))
+
+
+def check_baseline(baseline: dict, corpus: dict) -> bool:
+    """
+    Return whether results for corpus can be compared with baseline.
+
+    Only results of the same benchmark version against corpora generated
+    with the same settings are comparable; the sizes may differ, as only
+    those on both sides are compared.
+    """
+    if baseline.get("version") != RESULTS_VERSION:
+        print("❌ Error: Baseline was recorded with a different benchmark version", file=sys.stderr)
+        return False
+    baseline_corpus = baseline.get("corpus", {})
+    differences = corpus_differences(corpus, baseline_corpus)
+    if differences:
+        print("❌ Error: Baseline was recorded against a different corpus:", file=sys.stderr)
+        for key in differences:
+            print(
+                f"   - {key}: {baseline_corpus.get(key)} in the baseline, {corpus.get(key)} now",
+                file=sys.stderr,
+            )
+        return False
+    return True
+
+
+def compare_results(results: dict, baseline: dict, tolerance: float, min_delta: float) -> int:
+    """Print current median timings against a baseline and return 1 on regression."""
+    regressions = []
+    print(f"\n{'files':>8}  {'benchmark':<20} {'baseline':>10} {'current':>10} {'change':>8}")
+    for size, timings in results["results"].items():
+        for name, timing in timings.items():
+            previous_timing = baseline["results"].get(size, {}).get(name)
+            if previous_timing is None:
+                continue
+            current = timing["median"]
+            previous = previous_timing["median"]
+            change = (current - previous) / previous if previous else 0.0
+            regressed = change > tolerance and current - previous > min_delta
+            marker = "  ❌" if regressed else ""
+            print(
+                f"{size:>8}  {name:<20} {previous:>9.3f}s {current:>9.3f}s {change:>+7.0%}{marker}"
+            )
+            if regressed:
+                regressions.append(f"{name} at {size} files")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) regressed by more than {tolerance:.0%}:")
+        for regression in regressions:
+            print(f"   - {regression}")
+        return 1
+
+    print("\n✅ No benchmark regressed")
+    return 0
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = CorpusSpec(files=0)
+    parser.add_argument(
+        "--links-per-file", type=float, default=defaults.links_per_file,
+        help=f"Average number of links per page (default: {defaults.links_per_file})",
+    )
+    parser.add_argument(
+        "--broken-ratio", type=float, default=defaults.broken_ratio,
+        help=f"Fraction of links that are broken (default: {defaults.broken_ratio})",
+    )
+    parser.add_argument(
+        "--fence-ratio", type=float, default=defaults.fence_ratio,
+        help=f"Fraction of pages with a code fence (default: {defaults.fence_ratio})",
+    )
+    parser.add_argument(
+        "--excluded-ratio", type=float, default=defaults.excluded_ratio,
+        help=f"Fraction of pages left out of the manifest (default: {defaults.excluded_ratio})",
+    )
+    parser.add_argument(
+        "--nav-depth", type=int, default=defaults.nav_depth,
+        help=f"Directory and nav nesting depth (default: {defaults.nav_depth})",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=defaults.seed,
+        help=f"Random seed, so that corpora are reproducible (default: {defaults.seed})",
+    )
+
+
+def corpus_spec(args: argparse.Namespace, files: int) -> CorpusSpec:
+    return CorpusSpec(
+        files=files,
+        links_per_file=args.links_per_file,
+        broken_ratio=args.broken_ratio,
+        fence_ratio=args.fence_ratio,
+        excluded_ratio=args.excluded_ratio,
+        nav_depth=args.nav_depth,
+        seed=args.seed,
+    )
+
+
+def parse_sizes(value: str) -> list[int]:
+    try:
+        sizes = [int(size) for size in value.split(",") if size]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size list: {value}") from None
+    if not sizes or min(sizes) <= 0:
+        raise argparse.ArgumentTypeError("sizes must be positive numbers")
+    return sizes
+
+
+def main() -> int:
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="Generate a corpus repository")
+    generate.add_argument("directory", type=Path, help="Directory to create the corpus in")
+    generate.add_argument("--files", type=int, default=1_000, help="Number of pages (default: 1000)")
+    add_corpus_arguments(generate)
+
+    run = commands.add_parser("run", help="Generate corpora and time the scripts against them")
+    run.add_argument(
+        "--sizes",
+        type=parse_sizes,
+        default=DEFAULT_SIZES,
+        help="Comma separated corpus sizes (default: 1000,10000,100000)",
+    )
+    run.add_argument(
+        "--repeat", type=int, default=3,
+        help="Runs per benchmark; their median is compared with the baseline (default: 3)",
+    )
+    run.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="Worker processes for check_links (default: 1)",
+    )
+    run.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    run.add_argument("--baseline", type=Path, help="Compare against results from an earlier run")
+    run.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="Allowed slowdown against the baseline, as a fraction (default: 0.25)",
+    )
+    run.add_argument(
+        "--min-delta", type=float, default=0.05,
+        help="Ignore slowdowns smaller than this many seconds (default: 0.05)",
+    )
+    add_corpus_arguments(run)
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        if args.directory.exists() and any(args.directory.iterdir()):
+            print(f"❌ Error: '{args.directory}' is not empty.", file=sys.stderr)
+            return 1
+        args.directory.mkdir(parents=True, exist_ok=True)
+        generate_corpus(args.directory.resolve(), corpus_spec(args, args.files))
+        print(f"✅ Generated {args.files} page(s) in {args.directory}")
+        return 0
+
+    if args.repeat < 1:
+        print("❌ Error: --repeat must be a positive number.", file=sys.stderr)
+        return 1
+
+    baseline = None
+    if args.baseline is not None:
+        try:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            print(f"❌ Error reading baseline {args.baseline}: {exc}", file=sys.stderr)
+            return 1
+
+    corpus = asdict(corpus_spec(args, 0)) | {"files": args.sizes}
+    if baseline is not None and not check_baseline(baseline, corpus):
+        return 1
+
+    results = {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "corpus": corpus,
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="qa-benchmark-") as temp_dir:
+        for size in args.sizes:
+            root = Path(temp_dir, f"corpus-{size}")
+            root.mkdir()
+            print(f"📚 Generating corpus with {size} page(s)...")
+            generate_corpus(root, corpus_spec(args, size))
+            print(f"⏱️  Timing against {size} page(s)...")
+            results["results"][str(size)] = benchmark_corpus(root, args.repeat, args.jobs)
+            shutil.rmtree(root)
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"💾 Results written to {args.output}")
+
+    if baseline is not None:
+        return compare_results(results, baseline, args.tolerance, args.min_delta)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
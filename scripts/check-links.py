@@ -2,12 +2,898 @@
 """Check for broken internal markdown links in the documentation."""
 
 import argparse
+import hashlib
+import json
+import multiprocessing
 import os
+import posixpath
 import re
+import subprocess
 import sys
+import threading
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
+from urllib.parse import unquote, urlsplit
 
-from _utils import get_excluded_files, to_repo_relative
+from _external import (
+    DEFAULT_CACHE_PATH as DEFAULT_EXTERNAL_CACHE_PATH,
+    DEFAULT_TTL as DEFAULT_EXTERNAL_TTL,
+    ExternalLinkCache,
+    ExternalLinkChecker,
+    is_external,
+    url_key,
+)
+from _markdown import SNIPPET_KINDS, Link, extract_anchors, extract_links_and_anchors
+from _snippets import (
+    IncludedFile,
+    SnippetConfig,
+    load_snippet_config,
+    read_included_file,
+    split_snippet_target,
+)
+from _utils import (
+    add_instrumentation_arguments,
+    get_changed_files,
+    get_excluded_files,
+    get_working_tree_files,
+    list_repo_files,
+    index_toml_strings,
+    start_instrumentation,
+    timings,
+    to_repo_relative,
+)
+from _watch import FileWatcher
+
+
+# Bump whenever the cache layout or the checking rules change.
+CACHE_VERSION = 6
+DEFAULT_CACHE_PATH = Path(".cache/check-links.json")
+
+# What each kind of reference is called in messages and the summary.
+REFERENCE_KINDS = {
+    "image": "image",
+    "html-link": "HTML link",
+    "html-image": "HTML image",
+    "snippet": "include",
+    "code-snippet": "include",
+}
+URL_SCHEME_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*:")
+# Asset lists in zensical.toml, resolved relative to docs_dir.
+CONFIG_ASSET_KEYS = ("extra_css", "extra_javascript")
+# Files appended to every page, resolved against the snippet base paths.
+SNIPPET_AUTO_APPEND_KEY = ("markdown_extensions", "pymdownx", "snippets", "auto_append")
+
+
+@dataclass
+class AnchorCheck:
+    """
+    A link fragment whose target page had not been parsed when the link was
+    evaluated.
+
+    The error is recorded (and any verbose message) as if the anchor were
+    missing. resolve_anchor_checks() drops whichever one turns out wrong once
+    every scanned page's anchors are known.
+    """
+
+    key: str
+    fragment: str
+    error_index: int
+    message_index: int | None
+
+
+@dataclass
+class FileScanResult:
+    """Links checked in a single markdown file, in the order they were found."""
+
+    messages: list[str] = field(default_factory=list)
+    errors: list[dict[str, object]] = field(default_factory=list)
+    read_error: str | None = None
+    links: list[Link] = field(default_factory=list)
+    # Every path whose existence decided the result, mapped to whether it existed.
+    targets: dict[str, bool] = field(default_factory=dict)
+    # Every file whose anchors or included content were consulted, mapped to
+    # its [size, mtime_ns].
+    anchor_targets: dict[str, list[int]] = field(default_factory=dict)
+    digest: str | None = None
+    # The anchors the scanned file itself defines, and its [size, mtime_ns].
+    anchors: frozenset[str] | None = None
+    signature: list[int] = field(default_factory=list)
+    anchor_checks: list[AnchorCheck] = field(default_factory=list)
+
+
+@timings.timed("walk")
+def find_markdown_files(search_path: Path) -> list[Path]:
+    """Return the markdown files under search_path in walk order."""
+    md_files = []
+
+    if search_path.is_file():
+        if search_path.suffix == '.md':
+            md_files.append(search_path)
+    else:
+        for root, dirs, files in os.walk(search_path):
+            # Ignore hidden directories like .git or .venv
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for file in files:
+                if file.endswith('.md'):
+                    md_files.append(Path(root) / file)
+
+    return md_files
+
+
+class LinkResolver:
+    """
+    Resolve link targets against an in-memory index of the repository.
+
+    The index is built once from the working tree file list, so resolving a
+    link is pure path arithmetic plus a set lookup. Results are memoized per
+    (source directory, link) pair. Paths outside the repository root are
+    rare and fall back to a (memoized) filesystem check.
+
+    Anchors of the pages being checked are recorded as each page is
+    scanned. Other markdown targets are parsed lazily, at most once per
+    file. Either way they are shared by every link that points into the
+    file. Files
+    included with pymdownx.snippets are likewise parsed once, however many
+    pages include them, and form the include graph walked for each page.
+    """
+
+    def __init__(
+        self, repo_root: Path, files: Iterable[str], snippets: SnippetConfig | None = None
+    ) -> None:
+        self.repo_root = repo_root
+        self.snippets = snippets or SnippetConfig()
+        self._root = repo_root.as_posix()
+        self._prefix = self._root.rstrip("/") + "/"
+        self.paths: set[str] = {"."}
+        for path in files:
+            self.paths.add(path)
+            # Links may point at directories as well as files.
+            parent = posixpath.dirname(path)
+            while parent and parent not in self.paths:
+                self.paths.add(parent)
+                parent = posixpath.dirname(parent)
+        self._outside: dict[str, bool] = {}
+        self._memo: dict[tuple[str, str], tuple[str, bool, tuple[str, ...]]] = {}
+        self._anchors: dict[str, frozenset[str]] = {}
+        self._anchor_signatures: dict[str, list[int]] = {}
+        self._includes: dict[str, IncludedFile] = {}
+
+    @classmethod
+    @timings.timed("index")
+    def from_repo(cls, repo_root: Path, snippets: SnippetConfig | None = None) -> "LinkResolver":
+        """Index the working tree with git, or by walking it outside git."""
+        files = get_working_tree_files(repo_root)
+        if files is None:
+            files = set()
+            for root, dirs, names in os.walk(repo_root):
+                dirs[:] = [d for d in dirs if d != ".git"]
+                relative_root = Path(root).relative_to(repo_root).as_posix()
+                for name in names:
+                    files.add(posixpath.normpath(posixpath.join(relative_root, name)))
+        return cls(repo_root, files, snippets)
+
+    def key(self, path: str) -> str:
+        """Return the repository-relative form of a normalized absolute path."""
+        if path == self._root:
+            return "."
+        if path.startswith(self._prefix):
+            return path[len(self._prefix):]
+        return path
+
+    def exists(self, key: str) -> bool:
+        """Return whether an indexed key (see key()) exists."""
+        if not posixpath.isabs(key):
+            return key in self.paths
+        found = self._outside.get(key)
+        if found is None:
+            found = self._outside[key] = os.path.exists(key)
+        return found
+
+    def resolve(self, source_dir: str, link_path: str) -> tuple[str, bool, tuple[str, ...]]:
+        """
+        Resolve link_path as written in a file in source_dir.
+
+        Returns the chosen target key, whether it exists, and every key that
+        was consulted on the way.
+        """
+        memo_key = (source_dir, link_path)
+        resolved = self._memo.get(memo_key)
+        if resolved is not None:
+            return resolved
+
+        # target is relative to the directory containing the markdown file
+        target = self.key(posixpath.normpath(posixpath.join(source_dir, link_path)))
+        consulted = (target,)
+        target_exists = self.exists(target)
+
+        if not target_exists and link_path.startswith('/'):
+            # If it looks like an absolute path from the repo root
+            target = self.key(posixpath.normpath(posixpath.join(self._root, link_path.lstrip('/'))))
+            consulted += (target,)
+            target_exists = self.exists(target)
+
+        resolved = self._memo[memo_key] = (target, target_exists, consulted)
+        return resolved
+
+    def resolve_include(self, path: str) -> tuple[str, bool, tuple[str, ...]]:
+        """
+        Resolve an included path against each snippet base path in turn.
+
+        Returns the same as resolve(), with the first base path's candidate
+        as the target when the file exists under none of them.
+        """
+        first = None
+        consulted: tuple[str, ...] = ()
+        for base_path in self.snippets.base_paths:
+            base_dir = posixpath.normpath(posixpath.join(self._root, base_path))
+            target, target_exists, tried = self.resolve(base_dir, path)
+            consulted += tried
+            if target_exists:
+                return target, True, consulted
+            first = first or target
+        return first or path, False, consulted
+
+    def include(self, key: str) -> IncludedFile:
+        """Return the links in the included file at key, parsing it only once."""
+        included = self._includes.get(key)
+        if included is None:
+            with timings.phase("includes"):
+                included = self._includes[key] = read_included_file(self.repo_root / key)
+        return included
+
+    def known_anchors(self, key: str) -> frozenset[str] | None:
+        """Return the anchors of key if they are already known, without parsing it."""
+        return self._anchors.get(key)
+
+    def anchors(self, key: str) -> frozenset[str]:
+        """Return the anchors defined by the markdown file at key."""
+        anchors = self._anchors.get(key)
+        if anchors is not None:
+            return anchors
+
+        anchors: set[str] = set()
+        signature: list[int] = []
+        try:
+            with timings.phase("anchors"), open(self.repo_root / key, encoding="utf-8") as f:
+                stat = os.fstat(f.fileno())
+                signature = [stat.st_size, stat.st_mtime_ns]
+                anchors = extract_anchors(f)
+        except (OSError, UnicodeDecodeError):
+            pass
+
+        self.add_anchors(key, anchors, signature)
+        return self._anchors[key]
+
+    def add_anchors(self, key: str, anchors: set[str], signature: list[int]) -> None:
+        """Record anchors for key found while scanning it for links."""
+        self._anchors[key] = frozenset(anchors)
+        self._anchor_signatures[key] = signature
+
+    def anchor_signature(self, key: str) -> list[int]:
+        """Return the [size, mtime_ns] of key when its anchors were parsed."""
+        self.anchors(key)
+        return self._anchor_signatures[key]
+
+    def refresh(self, keys: Iterable[str]) -> None:
+        """
+        Re-index paths that changed on disk.
+
+        Each key is a file or directory that was created, modified or
+        removed; everything under a directory key is re-indexed too. Memoized
+        resolutions are dropped, so the resolver's memory stays proportional
+        to the current tree.
+        """
+        for key in keys:
+            prefix = key + "/"
+            stale = [path for path in self.paths if path.startswith(prefix)]
+            self.paths.difference_update(stale)
+            self.paths.discard(key)
+            for path in [key, *stale]:
+                self._anchors.pop(path, None)
+                self._anchor_signatures.pop(path, None)
+                self._includes.pop(path, None)
+
+            full_path = self.repo_root / key
+            if full_path.is_dir():
+                for root, dirs, names in os.walk(full_path):
+                    dirs[:] = [d for d in dirs if not d.startswith(".")]
+                    relative_root = Path(root).relative_to(self.repo_root).as_posix()
+                    self.paths.add(relative_root)
+                    for name in names:
+                        self.paths.add(posixpath.join(relative_root, name))
+            elif full_path.exists():
+                self.paths.add(key)
+            else:
+                continue
+            parent = posixpath.dirname(key)
+            while parent and parent not in self.paths:
+                self.paths.add(parent)
+                parent = posixpath.dirname(parent)
+
+        self._memo.clear()
+        self._outside.clear()
+
+
+@timings.timed("resolve")
+def evaluate_links(
+    md_file: Path,
+    links: list[Link],
+    excluded_files: set[str],
+    resolver: LinkResolver,
+    verbose: bool = False,
+) -> FileScanResult:
+    """
+    Resolve the links found in md_file and collect messages and errors.
+
+    Snippet includes are followed through the include graph, as are the
+    auto_append files for pages under docs_dir. Links in an included file
+    are resolved as part of md_file, where the site renders them, but are
+    reported at their own line in the included file. Content included
+    inside a code block is only followed for further includes.
+    """
+    result = FileScanResult(links=links)
+    md_file_relative = to_repo_relative(md_file, resolver.repo_root)
+    source_dir = md_file.parent.resolve().as_posix()
+
+    def check_anchor(
+        ref: Link, file: str, key: str, fragment: str, error: str, message: str
+    ) -> None:
+        """Report a missing anchor, or defer the check if key is not parsed yet."""
+        anchors = resolver.known_anchors(key)
+        if anchors is None:
+            add_error(ref, error, file)
+            message_index = None
+            if verbose:
+                message_index = len(result.messages)
+                result.messages.append(message)
+            result.anchor_checks.append(
+                AnchorCheck(key, fragment, len(result.errors) - 1, message_index)
+            )
+            return
+
+        result.anchor_targets[key] = resolver.anchor_signature(key)
+        if fragment in anchors or unquote(fragment) in anchors:
+            if verbose:
+                result.messages.append(message)
+        else:
+            add_error(ref, error, file)
+
+    def add_error(ref: Link, message: str, file: str = md_file_relative) -> None:
+        error = {
+            "file": file,
+            "line": ref.line,
+            "col": ref.col,
+            "kind": REFERENCE_KINDS.get(ref.kind, "link"),
+            "message": message,
+        }
+        if file != md_file_relative:
+            error["included_by"] = md_file_relative
+        result.errors.append(error)
+
+    def check_link(ref: Link, file: str) -> None:
+        link = ref.target
+        noun = REFERENCE_KINDS.get(ref.kind, "link")
+        if ref.kind == "reference":
+            add_error(ref, f"Undefined reference '{ref.markup}'", file)
+            return
+
+        # Skip external links, and data: or javascript: URLs in raw HTML
+        if ref.kind == "autolink" or URL_SCHEME_PATTERN.match(link):
+            if verbose:
+                result.messages.append(f"⏭️  Ignored external {noun} in {file}: {link}")
+            return
+
+        if ref.kind in SNIPPET_KINDS:
+            check_include(ref, file, (md_file_relative,), in_code=False)
+            return
+
+        # Split off anchors (e.g., #section-name)
+        link_path, _, fragment = link.partition('#')
+        if not link_path:
+            message = f"✅ Found valid anchor in {file}: '{ref.text}' -> {link}"
+            if fragment:
+                own_key = resolver.key(md_file.resolve().as_posix())
+                check_anchor(ref, file, own_key, fragment, f"Broken anchor '{ref.markup}'", message)
+            elif verbose:
+                result.messages.append(message)
+            return
+
+        # Query strings only matter to a server, not to which file is served.
+        link_path = link_path.partition('?')[0]
+        relative_path, target_exists, consulted = resolver.resolve(source_dir, link_path)
+        for key in consulted:
+            result.targets[key] = resolver.exists(key)
+
+        if target_exists and relative_path in excluded_files:
+            add_error(ref, f"Excluded {noun} '{ref.markup}' -> {relative_path}", file)
+        elif target_exists:
+            target_path = resolver.repo_root / relative_path
+            message = f"✅ Found valid {noun} in {file}: '{ref.text}' -> {target_path}"
+            if fragment and relative_path.endswith('.md'):
+                check_anchor(
+                    ref,
+                    file,
+                    relative_path,
+                    fragment,
+                    f"Broken anchor '{ref.markup}' -> {relative_path}",
+                    message,
+                )
+            elif verbose:
+                result.messages.append(message)
+        else:
+            add_error(ref, f"Broken {noun} '{ref.markup}'", file)
+
+    def check_include(ref: Link, file: str, chain: tuple[str, ...], in_code: bool) -> None:
+        path, lines = split_snippet_target(ref.target)
+        key, target_exists, consulted = resolver.resolve_include(path)
+        for consulted_key in consulted:
+            result.targets[consulted_key] = resolver.exists(consulted_key)
+
+        if not target_exists:
+            add_error(ref, f"Broken include '{ref.markup}'", file)
+        elif key in excluded_files:
+            add_error(ref, f"Excluded include '{ref.markup}' -> {key}", file)
+        elif key in chain:
+            cycle = " -> ".join((*chain[chain.index(key):], key))
+            add_error(ref, f"Include cycle '{ref.markup}': {cycle}", file)
+        else:
+            read_error = follow_include(key, lines, chain, in_code or ref.kind == "code-snippet")
+            if read_error:
+                add_error(ref, f"Unreadable include '{ref.markup}': {read_error}", file)
+            elif verbose:
+                result.messages.append(f"✅ Found valid include in {file}: {key}")
+
+    def follow_include(
+        key: str, lines: range | None, chain: tuple[str, ...], in_code: bool
+    ) -> str | None:
+        included = resolver.include(key)
+        if included.read_error:
+            return included.read_error
+        result.anchor_targets[key] = included.signature
+        chain = (*chain, key)
+        for ref in included.links:
+            if lines is not None and ref.line not in lines:
+                continue
+            if ref.kind in SNIPPET_KINDS:
+                check_include(ref, key, chain, in_code)
+            elif not in_code:
+                check_link(ref, key)
+        return None
+
+    for ref in links:
+        check_link(ref, md_file_relative)
+
+    if resolver.snippets.auto_append and is_under(md_file_relative, {resolver.snippets.docs_dir}):
+        # Missing auto_append files are reported once, against zensical.toml.
+        for path in resolver.snippets.auto_append:
+            key, target_exists, consulted = resolver.resolve_include(path)
+            for consulted_key in consulted:
+                result.targets[consulted_key] = resolver.exists(consulted_key)
+            if target_exists and key not in excluded_files:
+                follow_include(key, None, (md_file_relative,), in_code=False)
+
+    return result
+
+
+def scan_markdown_file(
+    md_file: Path,
+    excluded_files: set[str],
+    resolver: LinkResolver,
+    verbose: bool = False,
+) -> FileScanResult:
+    """
+    Check every internal link in a single markdown file.
+
+    Nothing is printed here so that files can be scanned in worker processes;
+    the caller prints the collected messages in file order.
+    """
+    digest = hashlib.sha256()
+
+    def lines(f) -> Iterator[str]:
+        # Hash while tokenizing so that the file is only read once.
+        for raw_line in f:
+            digest.update(raw_line)
+            yield raw_line.decode('utf-8')
+
+    try:
+        with timings.phase("parse"), open(md_file, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            links, anchors = extract_links_and_anchors(lines(f))
+    except Exception as e:
+        return FileScanResult(read_error=f"❌ Error reading {md_file}: {e}")
+
+    own_key = resolver.key(md_file.resolve().as_posix())
+    signature = [stat.st_size, stat.st_mtime_ns]
+    resolver.add_anchors(own_key, anchors, signature)
+
+    result = evaluate_links(md_file, links, excluded_files, resolver, verbose)
+    result.digest = digest.hexdigest()
+    result.anchors = frozenset(anchors)
+    result.signature = signature
+    return result
+
+
+def resolve_anchor_checks(result: FileScanResult, resolver: LinkResolver) -> FileScanResult:
+    """
+    Settle the anchor checks that evaluate_links() deferred.
+
+    Call this once the pages scanned alongside the result have been added to
+    the resolver. Anchors of any other target page are parsed now, once.
+    """
+    if not result.anchor_checks:
+        return result
+    found_errors: set[int] = set()
+    broken_messages: set[int] = set()
+    for check in result.anchor_checks:
+        result.anchor_targets[check.key] = resolver.anchor_signature(check.key)
+        anchors = resolver.anchors(check.key)
+        if check.fragment in anchors or unquote(check.fragment) in anchors:
+            found_errors.add(check.error_index)
+        elif check.message_index is not None:
+            broken_messages.add(check.message_index)
+    result.errors = [
+        error for index, error in enumerate(result.errors) if index not in found_errors
+    ]
+    result.messages = [
+        message for index, message in enumerate(result.messages) if index not in broken_messages
+    ]
+    result.anchor_checks = []
+    return result
+
+
+# Per-process state for worker processes, set once by _init_worker.
+_worker_scan: Callable[[Path], FileScanResult] | None = None
+
+
+def _init_worker(excluded_files: set[str], resolver: LinkResolver, verbose: bool) -> None:
+    global _worker_scan
+    _worker_scan = partial(
+        scan_markdown_file,
+        excluded_files=excluded_files,
+        resolver=resolver,
+        verbose=verbose,
+    )
+
+
+def _scan_in_worker(md_file: Path) -> FileScanResult:
+    return _worker_scan(md_file)
+
+
+def _pool_context() -> multiprocessing.context.BaseContext | None:
+    """
+    Return the start method context for the scan's worker pool.
+
+    Forking while other threads are running, as when the checks run side by
+    side in qa.py, can deadlock the child, so the workers are then started
+    from a fork server instead. Otherwise the platform default is used.
+    """
+    if threading.active_count() > 1 and multiprocessing.get_start_method() == "fork":
+        return multiprocessing.get_context("forkserver")
+    return None
+
+
+def scan_markdown_files(
+    md_files: list[Path],
+    excluded_files: set[str],
+    resolver: LinkResolver,
+    verbose: bool = False,
+    jobs: int = 1,
+) -> list[FileScanResult]:
+    """
+    Scan markdown files, optionally spread over a pool of worker processes.
+
+    Results are always returned in the same order as md_files so that the
+    report is identical whatever the number of jobs. Each page is parsed
+    once: link fragments pointing at pages not yet scanned are settled
+    after the scan, from the anchors collected while scanning.
+    """
+    if jobs <= 1 or len(md_files) <= 1:
+        scan = partial(
+            scan_markdown_file,
+            excluded_files=excluded_files,
+            resolver=resolver,
+            verbose=verbose,
+        )
+        results = list(map(scan, md_files))
+    else:
+        # The excluded file set and the file index are sent to each worker once,
+        # then files are handed out a few chunks per worker to balance load.
+        chunksize = max(1, len(md_files) // (jobs * 4))
+        # The workers' own phases are lost with them, so the pool is timed
+        # as a whole.
+        with timings.phase("scan"), ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=_pool_context(),
+            initializer=_init_worker,
+            initargs=(excluded_files, resolver, verbose),
+        ) as executor:
+            results = list(executor.map(_scan_in_worker, md_files, chunksize=chunksize))
+        # The workers' resolvers are gone; keep the anchors they collected.
+        for md_file, result in zip(md_files, results):
+            if result.anchors is not None:
+                own_key = resolver.key(md_file.resolve().as_posix())
+                resolver.add_anchors(own_key, result.anchors, result.signature)
+
+    for result in results:
+        resolve_anchor_checks(result, resolver)
+    return results
+
+
+def cache_fingerprint(
+    manifest_path: Path,
+    excluded_files: set[str],
+    repo_root: Path,
+    snippets: SnippetConfig | None = None,
+) -> str:
+    """
+    Fingerprint everything outside the markdown files that affects the result.
+
+    Any change to sync-public.toml, to the excluded file set or to the
+    snippet settings invalidates the whole cache.
+    """
+    digest = hashlib.sha256(
+        f"{CACHE_VERSION}\0{repo_root}\0{snippets or SnippetConfig()!r}\0".encode("utf-8")
+    )
+    try:
+        digest.update(manifest_path.read_bytes())
+    except OSError:
+        pass
+    for path in sorted(excluded_files):
+        digest.update(b"\0" + path.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LinkCache:
+    """
+    On-disk cache of per-file link scans for incremental runs.
+
+    Each entry records the file's size, mtime and content hash, the links
+    extracted from it, the errors they produced and the existence of every
+    path consulted while resolving them. A reverse index maps each of those
+    paths back to the files that depend on it, so that only links whose
+    targets were added, deleted or renamed are rechecked.
+    """
+
+    def __init__(self, path: Path, fingerprint: str) -> None:
+        self.path = path
+        self.fingerprint = fingerprint
+        self.entries: dict[str, dict] = {}
+        self.reverse_index: dict[str, list[str]] = {}
+
+    @classmethod
+    @timings.timed("cache")
+    def load(cls, path: Path, fingerprint: str) -> "LinkCache":
+        """Load the cache, starting empty if it is missing, corrupt or stale."""
+        cache = cls(path, fingerprint)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+
+        if data.get("version") != CACHE_VERSION or data.get("fingerprint") != fingerprint:
+            return cache
+
+        cache.entries = data.get("files", {})
+        cache.reverse_index = data.get("reverse_index", {})
+        return cache
+
+    @timings.timed("cache")
+    def save(self) -> None:
+        """Write the cache and rebuild the reverse index from its entries."""
+        reverse_index: dict[str, set[str]] = {}
+        for source, entry in self.entries.items():
+            for target in entry["targets"]:
+                reverse_index.setdefault(target, set()).add(source)
+        self.reverse_index = {
+            target: sorted(sources) for target, sources in sorted(reverse_index.items())
+        }
+
+        data = {
+            "version": CACHE_VERSION,
+            "fingerprint": self.fingerprint,
+            "files": self.entries,
+            "reverse_index": self.reverse_index,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+            tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            tmp_path.replace(self.path)
+        except OSError as e:
+            print(f"⚠️  Could not write link cache {self.path}: {e}", file=sys.stderr)
+
+    def lookup(self, key: str, md_file: Path) -> dict | None:
+        """Return the entry for md_file if its content is unchanged."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        try:
+            stat = md_file.stat()
+        except OSError:
+            return None
+
+        if stat.st_size != entry["size"]:
+            return None
+        if stat.st_mtime_ns != entry["mtime_ns"]:
+            # Touched but possibly not modified, e.g. by a checkout.
+            try:
+                data = md_file.read_bytes()
+            except OSError:
+                return None
+            if hashlib.sha256(data).hexdigest() != entry["digest"]:
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+
+        return entry
+
+    def changed_targets(self, keys: set[str], resolver: LinkResolver) -> set[str]:
+        """
+        Return cached files whose link targets have appeared or disappeared,
+        or whose anchor targets have been modified.
+        """
+        affected: set[str] = set()
+        signatures: dict[str, list[int]] = {}
+        for key in keys:
+            for target, signature in self.entries[key]["anchors"].items():
+                current = signatures.get(target)
+                if current is None:
+                    try:
+                        stat = (resolver.repo_root / target).stat()
+                        current = [stat.st_size, stat.st_mtime_ns]
+                    except OSError:
+                        current = []
+                    signatures[target] = current
+                if current != signature:
+                    affected.add(key)
+
+        for target, sources in self.reverse_index.items():
+            dependants = keys.intersection(sources)
+            if not dependants:
+                continue
+            # One lookup per distinct target, however many files link to it.
+            found = resolver.exists(target)
+            affected.update(
+                source
+                for source in dependants
+                if self.entries[source]["targets"].get(target) != found
+            )
+        return affected
+
+    def store(self, key: str, md_file: Path, result: FileScanResult) -> None:
+        """Record a freshly scanned file."""
+        if result.digest is None:
+            self.entries.pop(key, None)
+            return
+
+        try:
+            stat = md_file.stat()
+        except OSError:
+            self.entries.pop(key, None)
+            return
+
+        self.entries[key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "digest": result.digest,
+            "links": [
+                [ref.kind, ref.line, ref.col, ref.text, ref.target] for ref in result.links
+            ],
+            "errors": result.errors,
+            "targets": result.targets,
+            "anchors": result.anchor_targets,
+        }
+
+    def update(self, key: str, result: FileScanResult) -> None:
+        """Record a re-evaluation of an unchanged file."""
+        entry = self.entries[key]
+        entry["errors"] = result.errors
+        entry["targets"] = result.targets
+        entry["anchors"] = result.anchor_targets
+
+    def prune(self, scope: str, keys: set[str]) -> None:
+        """Forget files under scope that no longer exist."""
+        prefix = "" if scope == "." else f"{scope}/"
+        for key in list(self.entries):
+            if key not in keys and (key == scope or key.startswith(prefix)):
+                del self.entries[key]
+
+
+def scan_with_cache(
+    md_files: list[Path],
+    excluded_files: set[str],
+    resolver: LinkResolver,
+    cache: LinkCache,
+    scope: str | None,
+    verbose: bool = False,
+    jobs: int = 1,
+) -> list[FileScanResult]:
+    """
+    Scan markdown files, reusing cached results for unchanged files.
+
+    Only new or modified files are read and parsed. Unchanged files are
+    re-evaluated from their cached links when one of their targets has been
+    added or removed (or when verbose output is requested); otherwise their
+    cached errors are reused as-is.
+    """
+    keys = [to_repo_relative(md_file, resolver.repo_root) for md_file in md_files]
+    cached: dict[str, dict] = {}
+    to_scan: list[int] = []
+    for index, (key, md_file) in enumerate(zip(keys, md_files)):
+        entry = cache.lookup(key, md_file)
+        if entry is None:
+            to_scan.append(index)
+        else:
+            cached[key] = entry
+
+    stale = cache.changed_targets(set(cached), resolver)
+
+    results: list[FileScanResult | None] = [None] * len(md_files)
+    scanned = scan_markdown_files(
+        [md_files[index] for index in to_scan], excluded_files, resolver, verbose, jobs
+    )
+    for index, result in zip(to_scan, scanned):
+        cache.store(keys[index], md_files[index], result)
+        results[index] = result
+
+    for index, (key, md_file) in enumerate(zip(keys, md_files)):
+        entry = cached.get(key)
+        if entry is None:
+            continue
+        links = [Link(*ref) for ref in entry["links"]]
+        if verbose or key in stale:
+            result = resolve_anchor_checks(
+                evaluate_links(md_file, links, excluded_files, resolver, verbose), resolver
+            )
+            cache.update(key, result)
+        else:
+            result = FileScanResult(
+                errors=entry["errors"],
+                links=links,
+                targets=entry["targets"],
+                anchor_targets=entry["anchors"],
+            )
+        results[index] = result
+
+    if scope is not None:
+        cache.prune(scope, set(keys))
+    cache.save()
+    return results
+
+
+@timings.timed("git")
+def find_linking_files(repo_root: Path, search_path: Path, targets: set[str]) -> set[str] | None:
+    """
+    Return markdown files under search_path that may link to any of targets.
+
+    A single ``git grep`` for the targets' file names narrows the candidates
+    without reading every file; the candidates are then checked in full.
+    """
+    names = sorted({posixpath.basename(target) for target in targets})
+    if not names:
+        return set()
+
+    command = ["git", "-C", str(repo_root), "grep", "-l", "-F", "--untracked"]
+    for name in names:
+        command += ["-e", name]
+    pathspec = search_path.resolve().as_posix()
+    if search_path.is_dir():
+        pathspec += "/*.md"
+    command += ["--", pathspec]
+    result = subprocess.run(command, capture_output=True, text=True, check=False)
+
+    # git grep exits with 1 when nothing matches.
+    if result.returncode not in (0, 1):
+        print("❌ Error: Failed to search for links to changed files", file=sys.stderr)
+        if result.stderr:
+            print(result.stderr.strip(), file=sys.stderr)
+        return None
+
+    return {line for line in result.stdout.splitlines() if line}
 
 
 def check_links(
@@ -16,6 +902,12 @@ def check_links(
     repo_root: Path,
     verbose: bool = False,
     output_format: str = "summary",
+    jobs: int = 1,
+    cache: LinkCache | None = None,
+    resolver: LinkResolver | None = None,
+    only_files: set[str] | None = None,
+    external: ExternalLinkChecker | None = None,
+    config_path: Path | None = None,
 ) -> int:
     """
     Scan for broken internal markdown links.
@@ -23,106 +915,193 @@ def check_links(
     Args:
         search_path: The directory or file to search for markdown files.
         verbose: Whether to output details about every link checked.
+        jobs: Number of worker processes used to scan files.
+        cache: Optional cache used to skip files unchanged since the last run.
+        resolver: Index used to resolve link targets (built from repo_root
+            when not given).
+        only_files: Repository-relative paths to restrict the check to.
+        external: Checker used to also check http(s) links (skipped when not
+            given).
+        config_path: zensical.toml, whose extra_css and extra_javascript
+            paths are also checked when a whole directory is checked.
         
     Returns:
         int: 0 if all links are valid, 1 if broken links are found.
     """
-    md_files = []
-    
-    if search_path.is_file():
-        if search_path.suffix == '.md':
-            md_files.append(search_path)
-    else:
-        for root, dirs, files in os.walk(search_path):
-            # Ignore hidden directories like .git or .venv
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            for file in files:
-                if file.endswith('.md'):
-                    md_files.append(Path(root) / file)
+    md_files = find_markdown_files(search_path)
+    if only_files is not None:
+        md_files = [
+            md_file for md_file in md_files
+            if to_repo_relative(md_file, repo_root) in only_files
+        ]
 
     if not md_files:
-        print(f"ℹ️ No markdown files found in {search_path}")
+        if only_files is not None:
+            print(f"ℹ️ No changed markdown files to check in {search_path}")
+        else:
+            print(f"ℹ️ No markdown files found in {search_path}")
         return 0
 
-    link_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
     errors: list[dict[str, object]] = []
 
     print(f"🔍 Checking internal links in {len(md_files)} file(s) under {search_path}...")
 
-    for md_file in md_files:
-        try:
-            content = md_file.read_text(encoding='utf-8')
-        except Exception as e:
-            print(f"❌ Error reading {md_file}: {e}", file=sys.stderr)
+    if resolver is None:
+        resolver = LinkResolver.from_repo(repo_root)
+
+    if cache is None:
+        results = scan_markdown_files(md_files, excluded_files, resolver, verbose, jobs)
+    else:
+        # Forgetting deleted files is only safe after a full scan.
+        scope = to_repo_relative(search_path, repo_root) if only_files is None else None
+        results = scan_with_cache(
+            md_files, excluded_files, resolver, cache, scope, verbose, jobs
+        )
+
+    results = list(results)
+    for result in results:
+        if result.read_error:
+            print(result.read_error, file=sys.stderr)
             continue
-        
-        in_code_block = False
-        md_file_relative = to_repo_relative(md_file, repo_root)
+        for message in result.messages:
+            print(message)
+        errors.extend(result.errors)
 
-        for line_no, line in enumerate(content.splitlines(), start=1):
-            stripped_line = line.strip()
-            if stripped_line.startswith("```"):
-                in_code_block = not in_code_block
-                continue
+    if config_path is not None and config_path.is_file() and only_files is None:
+        errors.extend(check_config_assets(config_path, excluded_files, resolver))
 
-            if in_code_block:
-                continue
+    if external is not None:
+        errors.extend(check_external_links(md_files, results, external, repo_root))
 
-            for match in link_pattern.finditer(line):
-                text, link = match.group(1), match.group(2)
-                column = match.start(0) + 1
-                # Skip external links
-                if any(link.startswith(s) for s in ['http://', 'https://', 'mailto:', 'tel:']):
-                    if verbose:
-                        print(f"⏭️  Ignored external link in {md_file}: {link}")
-                    continue
-
-                # Remove anchors (e.g., #section-name)
-                link_path = link.split('#')[0]
-                if not link_path:
-                    if verbose:
-                        print(f"⏭️  Ignored anchor-only link in {md_file}: {link}")
-                    continue
-
-                # Resolve relative path
-                # target_path is relative to the directory containing the markdown file
-                target_path = (md_file.parent / link_path).resolve()
-
-                # Check if target exists
-                target_exists = target_path.exists()
-
-                if not target_exists and link_path.startswith('/'):
-                    # If it looks like an absolute path from the repo root
-                    target_path = (repo_root / link_path.lstrip('/')).resolve()
-                    target_exists = target_path.exists()
-
-                relative_path = None
-                try:
-                    relative_path = target_path.relative_to(repo_root).as_posix()
-                except ValueError:
-                    relative_path = None
-
-                if target_exists and relative_path in excluded_files:
-                    errors.append(
-                        {
-                            "file": md_file_relative,
-                            "line": line_no,
-                            "col": column,
-                            "message": f"Excluded link '[{text}]({link})' -> {relative_path}",
-                        }
-                    )
-                elif target_exists:
-                    if verbose:
-                        print(f"✅ Found valid link in {md_file}: '{text}' -> {target_path}")
-                else:
-                    errors.append(
-                        {
-                            "file": md_file_relative,
-                            "line": line_no,
-                            "col": column,
-                            "message": f"Broken link '[{text}]({link})'",
-                        }
-                    )
+    return report_errors(errors, output_format)
+
+
+@timings.timed("external")
+def check_external_links(
+    md_files: list[Path],
+    results: list[FileScanResult],
+    checker: ExternalLinkChecker,
+    repo_root: Path,
+) -> list[dict[str, object]]:
+    """Check the http(s) links found in md_files and return the broken ones as errors."""
+    found = [
+        (to_repo_relative(md_file, repo_root), ref)
+        for md_file, result in zip(md_files, results)
+        for ref in result.links
+        if ref.kind not in ("reference", "shortcut") and is_external(ref.target)
+    ]
+    if not found:
+        return []
+
+    urls = {url_key(ref.target) for _, ref in found}
+    hosts = {urlsplit(url).netloc for url in urls}
+    print(f"🌐 Checking {len(urls)} external URL(s) on {len(hosts)} host(s)...")
+    url_results = checker.check(urls)
+    if checker.cached_count:
+        print(f"ℹ️ Reused {checker.cached_count} cached result(s)")
+
+    errors: list[dict[str, object]] = []
+    for file, ref in found:
+        result = url_results[url_key(ref.target)]
+        if not result.ok:
+            errors.append(
+                {
+                    "file": file,
+                    "line": ref.line,
+                    "col": ref.col,
+                    "kind": REFERENCE_KINDS.get(ref.kind, "link"),
+                    "message": (
+                        f"Broken external {REFERENCE_KINDS.get(ref.kind, 'link')} "
+                        f"'{ref.markup}' ({result.describe()})"
+                    ),
+                }
+            )
+    return errors
+
+
+@timings.timed("config")
+def check_config_assets(
+    config_path: Path, excluded_files: set[str], resolver: LinkResolver
+) -> list[dict[str, object]]:
+    """
+    Check the extra_css and extra_javascript paths and the snippet
+    auto_append files listed in zensical.toml.
+
+    Assets are resolved relative to docs_dir and auto_append files against
+    the snippet base paths, with the same resolver (and memo) as the page
+    links, and reported at their position in the config file.
+    """
+    strings = index_toml_strings(config_path)
+    if strings is None:
+        print(f"⚠️  Could not read {config_path}, skipping its asset paths", file=sys.stderr)
+        return []
+
+    docs_dir = "doc"
+    assets = []
+    for string in strings:
+        path = string.path[1:] if string.path[:1] == ("project",) else string.path
+        if path == ("docs_dir",):
+            docs_dir = string.value
+        elif len(path) >= 2 and path[0] in CONFIG_ASSET_KEYS and isinstance(path[1], int):
+            # Entries are paths, or tables such as {path = "...", type = "module"}.
+            if len(path) == 2 or path[2:] == ("path",):
+                assets.append((path[0], string))
+        elif path == SNIPPET_AUTO_APPEND_KEY or (
+            path[:-1] == SNIPPET_AUTO_APPEND_KEY and isinstance(path[-1], int)
+        ):
+            assets.append(("auto_append", string))
+
+    config_relative = to_repo_relative(config_path, resolver.repo_root)
+    docs_path = (resolver.repo_root / docs_dir).resolve().as_posix()
+    errors: list[dict[str, object]] = []
+    for key, string in assets:
+        if URL_SCHEME_PATTERN.match(string.value) or string.value.startswith("//"):
+            continue
+        if key == "auto_append":
+            noun = "include"
+            relative_path, target_exists, _ = resolver.resolve_include(string.value)
+        else:
+            noun = "asset"
+            relative_path, target_exists, _ = resolver.resolve(
+                docs_path, string.value.partition("?")[0]
+            )
+        if target_exists and relative_path in excluded_files:
+            message = f"Excluded {noun} '{string.value}' in {key} -> {relative_path}"
+        elif not target_exists:
+            message = f"Broken {noun} '{string.value}' in {key}"
+        else:
+            continue
+        errors.append(
+            {
+                "file": config_relative,
+                "line": string.line,
+                "col": string.col,
+                "kind": noun,
+                "message": message,
+            }
+        )
+    return errors
+
+
+@timings.timed("output")
+def report_errors(errors: list[dict[str, object]], output_format: str = "summary") -> int:
+    """Print link errors and return the exit code."""
+    # A link in an included file is checked once for every page including it:
+    # report each problem once, naming the pages it was found through.
+    unique: dict[tuple, dict[str, object]] = {}
+    included_by: dict[tuple, dict[str, None]] = {}
+    for error in errors:
+        key = (error["file"], error["line"], error["col"], error["message"])
+        unique.setdefault(key, error)
+        if "included_by" in error:
+            included_by.setdefault(key, {})[error["included_by"]] = None
+    errors = []
+    for key, error in unique.items():
+        pages = list(included_by.get(key, ()))
+        if pages:
+            others = f" and {len(pages) - 1} other page(s)" if len(pages) > 1 else ""
+            error = dict(error, message=f"{error['message']} (included by {pages[0]}{others})")
+        errors.append(error)
 
     if errors:
         if output_format == "github":
@@ -136,7 +1115,11 @@ def check_links(
                     )
                 )
 
-        print(f"❌ Found {len(errors)} link issue(s):")
+        kinds = Counter(error.get("kind", "link") for error in errors)
+        breakdown = ""
+        if set(kinds) != {"link"}:
+            breakdown = " (" + ", ".join(f"{count} {kind}" for kind, count in kinds.most_common()) + ")"
+        print(f"❌ Found {len(errors)} link issue(s){breakdown}:")
         for error in errors:
             print(f"  - {error['file']}:{error['line']}: {error['message']}")
         return 1
@@ -144,6 +1127,162 @@ def check_links(
     print("✅ All internal links resolved successfully!")
     return 0
 
+
+def is_under(key: str, roots: set[str]) -> bool:
+    """Return whether key is one of roots or inside one of them."""
+    while key:
+        if key in roots:
+            return True
+        key = posixpath.dirname(key)
+    return "." in roots
+
+
+def watch_links(
+    search_path: Path,
+    manifest_path: Path,
+    excluded_files: set[str],
+    repo_root: Path,
+    jobs: int = 1,
+    snippets: SnippetConfig | None = None,
+    resolver: LinkResolver | None = None,
+) -> int:
+    """
+    Check links, then recheck them whenever files change until interrupted.
+
+    Only changed pages are re-read. Pages whose link targets were created or
+    removed, or whose anchors changed, are re-evaluated from their already
+    parsed links, and every page is when the excluded file set changes
+    (after an edit to the manifest or to the git index). Only issues that
+    appeared or were fixed are printed.
+    """
+    if resolver is None:
+        resolver = LinkResolver.from_repo(repo_root, snippets)
+    scope = to_repo_relative(search_path, repo_root)
+    manifest_key = to_repo_relative(manifest_path, repo_root)
+    git_index = repo_root / ".git" / "index"
+
+    def in_scope(key: str) -> bool:
+        return (
+            key.endswith(".md")
+            and is_under(key, {scope})
+            and not any(part.startswith(".") for part in key.split("/"))
+        )
+
+    def slim(result: FileScanResult) -> FileScanResult:
+        # Keep only what is needed to re-evaluate the page later.
+        if result.read_error:
+            print(result.read_error, file=sys.stderr)
+        return FileScanResult(
+            errors=result.errors,
+            links=result.links,
+            targets=result.targets,
+            anchor_targets=result.anchor_targets,
+        )
+
+    md_files = find_markdown_files(search_path)
+    print(f"🔍 Checking internal links in {len(md_files)} file(s) under {search_path}...")
+    results: dict[str, FileScanResult] = {}
+    for md_file, result in zip(
+        md_files, scan_markdown_files(md_files, excluded_files, resolver, jobs=jobs)
+    ):
+        results[to_repo_relative(md_file, repo_root)] = slim(result)
+    report_errors([error for result in results.values() for error in result.errors])
+
+    directories = [search_path] if search_path.is_dir() else []
+    files = [manifest_path, git_index] + ([] if directories else [search_path])
+    # Included files and link targets outside the search path are watched
+    # one by one, as found by the first check.
+    files += [
+        repo_root / key
+        for key in sorted(
+            {key for result in results.values() for key in result.anchor_targets}
+        )
+        if not is_under(key, {scope})
+    ]
+    with FileWatcher(directories, files) as watcher:
+        print(f"👀 Watching {search_path} for changes ({watcher.backend}), press Ctrl+C to stop")
+        for batch in watcher.changes():
+            changed = {to_repo_relative(path, repo_root) for path in batch}
+
+            excluded_changed = False
+            if manifest_key in changed or git_index in batch:
+                new_excluded = get_excluded_files(manifest_path, repo_root)
+                if new_excluded is not None and new_excluded != excluded_files:
+                    excluded_files = new_excluded
+                    excluded_changed = True
+            changed.discard(to_repo_relative(git_index, repo_root))
+            resolver.refresh(changed)
+
+            reread: set[str] = set()
+            for key in changed:
+                full_path = repo_root / key
+                if full_path.is_dir():
+                    for md_file in find_markdown_files(full_path):
+                        md_key = to_repo_relative(md_file, repo_root)
+                        if in_scope(md_key):
+                            reread.add(md_key)
+                elif in_scope(key) and full_path.is_file():
+                    reread.add(key)
+            removed = [
+                key for key in results
+                if key not in reread and is_under(key, changed)
+                and not (repo_root / key).is_file()
+            ]
+            for key in removed:
+                del results[key]
+            reevaluate = [
+                key for key, result in results.items()
+                if key not in reread and (
+                    excluded_changed
+                    or any(is_under(target, changed) for target in result.targets)
+                    or any(is_under(target, changed) for target in result.anchor_targets)
+                )
+            ]
+
+            rechecked = sorted(reread | set(reevaluate))
+            before = Counter(
+                (error["file"], error["message"])
+                for key in rechecked if key in results
+                for error in results[key].errors
+            )
+            reread_keys = sorted(reread)
+            rescanned = scan_markdown_files(
+                [repo_root / key for key in reread_keys], excluded_files, resolver
+            )
+            for key, result in zip(reread_keys, rescanned):
+                results[key] = slim(result)
+            for key in reevaluate:
+                results[key] = slim(
+                    resolve_anchor_checks(
+                        evaluate_links(repo_root / key, results[key].links, excluded_files, resolver),
+                        resolver,
+                    )
+                )
+
+            after = [error for key in rechecked for error in results[key].errors]
+            appeared = Counter((error["file"], error["message"]) for error in after) - before
+            fixed = before - Counter((error["file"], error["message"]) for error in after)
+            if not appeared and not fixed:
+                continue
+
+            for error in after:
+                error_key = (error["file"], error["message"])
+                if appeared[error_key] > 0:
+                    appeared[error_key] -= 1
+                    print(f"❌ New: {error['file']}:{error['line']}: {error['message']}")
+            for (file, message), count in sorted(fixed.items()):
+                for _ in range(count):
+                    print(f"✅ Fixed: {file}: {message}")
+
+            total = sum(len(result.errors) for result in results.values())
+            if total:
+                print(f"🔗 {total} link issue(s) remaining")
+            else:
+                print("✅ All internal links resolved successfully!")
+
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(description="Check for broken internal links in markdown files.")
     parser.add_argument(
@@ -164,6 +1303,16 @@ def main():
         default=Path("sync-public.toml"),
         help="Path to sync-public.toml manifest file (default: sync-public.toml)",
     )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=Path("zensical.toml"),
+        help=(
+            "Path to zensical.toml, whose snippet settings are used to follow includes "
+            "and whose extra_css, extra_javascript and auto_append paths are checked "
+            "when checking a directory (default: zensical.toml)"
+        ),
+    )
     parser.add_argument(
         "--repo-root",
         type=Path,
@@ -176,23 +1325,167 @@ def main():
         default="summary",
         help="Output format (default: summary)",
     )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to scan files; 0 uses every CPU (default: 1)",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_CACHE_PATH,
+        help=(
+            "Reuse results for unchanged files from an on-disk cache "
+            f"(default location: {DEFAULT_CACHE_PATH}, relative to --repo-root)"
+        ),
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help=(
+            "Only check markdown files changed since the merge base with REF, "
+            "plus files linking to deleted, renamed or modified pages"
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and recheck links whenever files change, printing new and fixed issues",
+    )
+    parser.add_argument(
+        "--external",
+        action="store_true",
+        help=(
+            "Also check http(s) links, caching results in "
+            f"{DEFAULT_EXTERNAL_CACHE_PATH} (relative to --repo-root)"
+        ),
+    )
+    parser.add_argument(
+        "--external-ttl",
+        type=float,
+        metavar="HOURS",
+        default=DEFAULT_EXTERNAL_TTL / 3600,
+        help=(
+            "How long cached external link results stay valid; failures are retried "
+            f"after at most an hour and 0 disables the cache (default: {DEFAULT_EXTERNAL_TTL // 3600})"
+        ),
+    )
+    parser.add_argument(
+        "--external-per-host",
+        type=int,
+        metavar="N",
+        default=4,
+        help="Maximum concurrent requests to a single host (default: 4)",
+    )
+    add_instrumentation_arguments(parser)
     args = parser.parse_args()
+    start_instrumentation(args, "check-links")
 
     if not args.path.exists():
         print(f"❌ Error: Path '{args.path}' does not exist.", file=sys.stderr)
         return 1
 
+    if args.jobs < 0:
+        print("❌ Error: --jobs must be zero or a positive number.", file=sys.stderr)
+        return 1
+    jobs = args.jobs or os.cpu_count() or 1
+
+    if args.watch and (
+        args.changed_since or args.cache is not None or args.external or args.format != "summary"
+    ):
+        print(
+            "❌ Error: --watch cannot be combined with --changed-since, --cache, --external "
+            "or --format github.",
+            file=sys.stderr,
+        )
+        return 1
+
+    if args.external_per_host < 1 or args.external_ttl < 0:
+        print(
+            "❌ Error: --external-per-host must be positive and --external-ttl not negative.",
+            file=sys.stderr,
+        )
+        return 1
+
     repo_root = args.repo_root.resolve()
-    excluded_files = get_excluded_files(args.manifest, repo_root)
+    # A single `git ls-files` gives both the tracked files, which the manifest
+    # is expanded against, and the working tree files the resolver indexes.
+    repo_files = list_repo_files(repo_root)
+    if repo_files is None:
+        print("ERROR: Failed to list git-tracked files", file=sys.stderr)
+        return 1
+    tracked_files, working_tree_files = repo_files
+    excluded_files = get_excluded_files(args.manifest, repo_root, tracked_files)
     if excluded_files is None:
         return 1
 
+    snippets = load_snippet_config(args.config)
+    resolver = LinkResolver(repo_root, working_tree_files, snippets)
+
+    if args.watch:
+        try:
+            return watch_links(
+                args.path, args.manifest, excluded_files, repo_root, jobs, snippets, resolver
+            )
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+            return 0
+
+    only_files = None
+    if args.changed_since:
+        changes = get_changed_files(repo_root, args.changed_since)
+        if changes is None:
+            return 1
+        changed, removed = changes
+
+        # zensical.toml and the auto_append files affect every page.
+        every_page = {to_repo_relative(args.config, repo_root)} | {
+            resolver.resolve_include(path)[0] for path in snippets.auto_append
+        }
+        if to_repo_relative(args.manifest, repo_root) in changed | removed:
+            # Any link target may have been added to or excluded from the manifest.
+            print("ℹ️ Sync manifest changed, checking all files")
+        elif every_page & (changed | removed):
+            print("ℹ️ Site config or an auto_append file changed, checking all files")
+        else:
+            # Besides the changed pages themselves, recheck pages linking to
+            # deleted or renamed paths, and to modified pages whose headings
+            # (and so anchors) may have changed.
+            changed_pages = {path for path in changed if path.endswith(".md")}
+            linking_files = find_linking_files(repo_root, args.path, removed | changed_pages)
+            if linking_files is None:
+                return 1
+            only_files = changed_pages | linking_files
+
+    cache = None
+    if args.cache is not None:
+        cache_path = args.cache if args.cache.is_absolute() else repo_root / args.cache
+        fingerprint = cache_fingerprint(args.manifest, excluded_files, repo_root, snippets)
+        cache = LinkCache.load(cache_path, fingerprint)
+
+    external = None
+    if args.external:
+        external = ExternalLinkChecker(
+            ExternalLinkCache.load(
+                repo_root / DEFAULT_EXTERNAL_CACHE_PATH, args.external_ttl * 3600
+            ),
+            per_host=args.external_per_host,
+        )
+
     return check_links(
         args.path,
         excluded_files,
         repo_root,
         verbose=args.verbose,
         output_format=args.format,
+        jobs=jobs,
+        cache=cache,
+        resolver=resolver,
+        only_files=only_files,
+        external=external,
+        config_path=args.config if args.path.is_dir() else None,
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""Check links, assets and anchors in the HTML site built by zensical."""
+
+import argparse
+import codecs
+import html
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+# tomllib is standard library in Python 3.11+, fall back to tomli for older versions
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+
+from _utils import (
+    add_instrumentation_arguments,
+    emit_github_error,
+    start_instrumentation,
+    timings,
+    to_repo_relative,
+)
+
+READ_SIZE = 64 * 1024
+# Attributes holding one URL, mapped to the elements they are checked on.
+URL_ATTRIBUTES = {
+    "href": {"a", "area", "link"},
+    "src": {"audio", "embed", "iframe", "img", "input", "script", "source", "track", "video"},
+    "poster": {"video"},
+    "data": {"object"},
+}
+SRCSET_ELEMENTS = {"img", "source"}
+URL_ELEMENTS = frozenset().union(*URL_ATTRIBUTES.values(), SRCSET_ELEMENTS)
+# Links to other pages, as opposed to assets loaded by the page itself.
+PAGE_LINK_ELEMENTS = {"a", "area"}
+# Fragments that browsers handle without a matching id.
+IMPLICIT_FRAGMENTS = {"", "top"}
+URL_SCHEME = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*:")
+
+
+@dataclass
+class PageScan:
+    """The ids defined by a built page and the URLs it references."""
+
+    ids: set[str] = field(default_factory=set)
+    # (line, col, kind, url) where kind is "link" or "asset".
+    references: list[tuple[int, int, str, str]] = field(default_factory=list)
+    read_error: str | None = None
+
+
+# The tokens of interest, all starting with "<": comments and raw text
+# elements (skipped whole, keeping a script's own attributes), start tags
+# with attributes and, so that they can be held back until the next chunk
+# arrives, comments, raw text elements and tags cut off by the end of the
+# buffer. End tags, bare tags and text are skipped by the regex engine.
+_ATTRS = r"""[^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*"""
+TOKEN = re.compile(
+    rf"""<(?:
+      !--.*?-->
+    | (?P<raw>script|style)\b(?P<raw_attrs>{_ATTRS})>.*?</(?P=raw)\s*>
+    | (?!(?:script|style)\b)(?P<tag>[a-z][a-z0-9-]*)(?P<attrs>\s{_ATTRS})>
+    | (?P<partial>!--|(?:script|style)\b|[a-z!]{_ATTRS}(?:"[^"]*|'[^']*)?\Z|\Z)
+    )""",
+    re.DOTALL | re.IGNORECASE | re.VERBOSE,
+)
+ATTRIBUTE = re.compile(
+    r"""([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?"""
+)
+
+
+class PageTokenizer:
+    """
+    Collect ids and URL attributes from HTML fed to it in chunks.
+
+    A hand-rolled tokenizer rather than html.parser, which handles every
+    tag and text run in Python and manages only a few MB/s; here the regex
+    engine skips everything but the start tags. Unterminated tokens at the
+    end of a chunk are held back until more input arrives.
+    """
+
+    def __init__(self) -> None:
+        self.scan = PageScan()
+        self.buffer = ""
+        # Line number at the start of the buffer, and the buffer offset of
+        # the start of that line (negative when it began in an earlier chunk).
+        self.line = 1
+        self.line_start = 0
+
+    def feed(self, text: str) -> None:
+        self.buffer += text
+        self._tokenize(final=False)
+
+    def close(self) -> None:
+        self._tokenize(final=True)
+        self.buffer = ""
+
+    def _tokenize(self, final: bool) -> None:
+        buffer = self.buffer
+        counted = 0
+        for match in TOKEN.finditer(buffer):
+            start = match.start()
+            if match["partial"] is not None:
+                if not final:
+                    # Cut off by the end of the chunk: wait for the rest.
+                    pos = start
+                    break
+                continue
+            tag = match["tag"]
+            if tag is not None:
+                attrs = match["attrs"]
+            elif match["raw_attrs"]:
+                tag, attrs = match["raw"], match["raw_attrs"]
+            else:
+                continue
+            tag = tag.lower()
+            if tag not in URL_ELEMENTS and "id" not in attrs and "name" not in attrs:
+                continue
+
+            newlines = buffer.count("\n", counted, start)
+            if newlines:
+                self.line += newlines
+                self.line_start = buffer.rfind("\n", counted, start) + 1
+            counted = start
+            self._handle_starttag(tag, attrs, self.line, start - self.line_start + 1)
+        else:
+            pos = len(buffer)
+
+        newlines = buffer.count("\n", counted, pos)
+        if newlines:
+            self.line += newlines
+            self.line_start = buffer.rfind("\n", counted, pos) + 1
+        self.line_start -= pos
+        self.buffer = buffer[pos:]
+
+    def _handle_starttag(self, tag: str, attrs: str, line: int, col: int) -> None:
+        for name, double, single, bare in ATTRIBUTE.findall(attrs):
+            value = double or single or bare
+            if not value:
+                continue
+            if "&" in value:
+                value = html.unescape(value)
+            name = name.lower()
+            if name == "id" or (name == "name" and tag == "a"):
+                self.scan.ids.add(value)
+            elif tag in URL_ATTRIBUTES.get(name, ()):
+                self._add(tag, value.strip(), line, col)
+            elif name == "srcset" and tag in SRCSET_ELEMENTS:
+                for candidate in value.split(","):
+                    url = candidate.split(None, 1)[0] if candidate.strip() else ""
+                    self._add(tag, url, line, col)
+
+    def _add(self, tag: str, url: str, line: int, col: int) -> None:
+        if url:
+            kind = "link" if tag in PAGE_LINK_ELEMENTS else "asset"
+            self.scan.references.append((line, col, kind, url))
+
+
+def scan_page(path: Path) -> PageScan:
+    """Stream one HTML file through the tokenizer without reading it whole."""
+    tokenizer = PageTokenizer()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(READ_SIZE):
+                tokenizer.feed(decoder.decode(chunk))
+        tokenizer.feed(decoder.decode(b"", final=True))
+        tokenizer.close()
+    except OSError as e:
+        return PageScan(read_error=f"❌ Error reading {path}: {e}")
+    return tokenizer.scan
+
+
+@timings.timed("walk")
+def index_site(site_dir: Path) -> tuple[set[str], set[str], list[str]]:
+    """Return every file and directory in the site, and its HTML pages in walk order."""
+    files: set[str] = set()
+    directories: set[str] = {""}
+    pages: list[str] = []
+    for root, dirs, names in os.walk(site_dir):
+        dirs.sort()
+        relative_root = Path(root).relative_to(site_dir).as_posix()
+        prefix = "" if relative_root == "." else f"{relative_root}/"
+        for name in dirs:
+            directories.add(prefix + name)
+        for name in sorted(names):
+            files.add(prefix + name)
+            if name.endswith(".html"):
+                pages.append(prefix + name)
+    return files, directories, pages
+
+
+@timings.timed("parse")
+def scan_pages(site_dir: Path, pages: list[str], jobs: int = 1) -> list[PageScan]:
+    """Scan pages, spread over worker processes when jobs > 1."""
+    paths = [site_dir / page for page in pages]
+    if jobs <= 1 or len(paths) <= 1:
+        return [scan_page(path) for path in paths]
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(scan_page, paths, chunksize=chunksize))
+
+
+class SiteChecker:
+    """
+    Resolve URLs found in built pages against an index of the site.
+
+    Relative URLs resolve against the page's directory, absolute paths
+    against the path of site_url (the site is served below it on GitHub
+    Pages), and full URLs to site_url are treated as internal. Directory
+    URLs resolve to their index.html. Other schemes, hosts and
+    protocol-relative URLs are ignored. Results for absolute URLs, which
+    the navigation repeats on every page, are memoized.
+    """
+
+    def __init__(
+        self,
+        files: set[str],
+        directories: set[str],
+        ids: dict[str, set[str]],
+        site_url: str = "",
+    ) -> None:
+        # Every path a URL can name, mapped to the file served for it.
+        self.targets = {path: path for path in files}
+        for directory in directories:
+            self.targets[directory] = f"{directory}/index.html" if directory else "index.html"
+        self.ids = ids
+        self.site_url = site_url.rstrip("/") + "/" if site_url else ""
+        self.base_path = urlsplit(self.site_url).path or "/"
+        self._memo: dict[tuple[str, str], str | None] = {}
+
+    def check_page(
+        self, page: str, references: list[tuple[int, int, str, str]]
+    ) -> list[tuple[int, int, str]]:
+        """Return (line, col, message) for every reference on page that does not resolve."""
+        directory = page.rpartition("/")[0]
+        directory_parts = directory.split("/") if directory else []
+        errors = []
+        for line, col, kind, url in references:
+            if url.startswith("/") and not url.startswith("//"):
+                key = (kind, url)
+                try:
+                    message = self._memo[key]
+                except KeyError:
+                    message = self._memo[key] = self.check(page, directory_parts, kind, url)
+            else:
+                message = self.check(page, directory_parts, kind, url)
+            if message is not None:
+                errors.append((line, col, message))
+        return errors
+
+    def check(self, page: str, directory_parts: list[str], kind: str, url: str) -> str | None:
+        """Return an error message for url found on page, or None if it is fine."""
+        original = url
+        if self.site_url and url.startswith(self.site_url):
+            url = self.base_path + url[len(self.site_url):]
+        elif url.startswith("//") or URL_SCHEME.match(url):
+            return None
+
+        path, _, fragment = url.partition("#")
+        path = path.partition("?")[0]
+        if path:
+            target, reason = self.resolve_path(directory_parts, path)
+            if target is None:
+                noun = "link" if kind == "link" else "asset"
+                detail = f" ({reason})" if reason else ""
+                return f"Broken {noun} '{original}'{detail}"
+        else:
+            target = page
+
+        if fragment not in IMPLICIT_FRAGMENTS:
+            ids = self.ids.get(target)
+            if ids is not None and fragment not in ids and unquote(fragment) not in ids:
+                return f"Broken anchor '{original}'"
+        return None
+
+    def resolve_path(
+        self, directory_parts: list[str], path: str
+    ) -> tuple[str | None, str | None]:
+        """Return (served file, None) or (None, reason if any) for a URL path."""
+        if "%" in path:
+            path = unquote(path)
+        if path.startswith("/"):
+            if not (path + "/").startswith(self.base_path):
+                return None, f"outside {self.base_path}"
+            parts: list[str] = []
+            path = path[len(self.base_path):]
+        else:
+            parts = directory_parts.copy()
+
+        for segment in path.split("/"):
+            if segment == "..":
+                if not parts:
+                    return None, "outside the site"
+                parts.pop()
+            elif segment and segment != ".":
+                parts.append(segment)
+        return self.targets.get("/".join(parts)), None
+
+
+def source_page(page: str, docs_dir: Path, repo_root: Path) -> str | None:
+    """Return the markdown source of a built page, if it can be found."""
+    stem = page[: -len(".html")]
+    if stem == "index" or stem.endswith("/index"):
+        directory = stem[: -len("index")]
+        candidates = [f"{directory}index.md", f"{directory}README.md"]
+        if directory:
+            candidates.insert(0, f"{directory.rstrip('/')}.md")
+    else:
+        candidates = [f"{stem}.md"]
+    for candidate in candidates:
+        source = docs_dir / candidate
+        if source.is_file():
+            return to_repo_relative(source, repo_root)
+    return None
+
+
+def check_site(
+    site_dir: Path,
+    repo_root: Path,
+    docs_dir: Path,
+    site_url: str = "",
+    output_format: str = "summary",
+    jobs: int = 1,
+) -> int:
+    """
+    Check every link, asset and anchor in the built site.
+
+    Failures are reported against the markdown page the HTML was built
+    from where it can be found, with the position in the HTML for context.
+
+    Returns:
+        int: 0 if everything resolves, 1 otherwise.
+    """
+    files, directories, pages = index_site(site_dir)
+    if not pages:
+        print(f"❌ Error: No HTML pages found in {site_dir}. Run 'just build' first.", file=sys.stderr)
+        return 1
+
+    print(f"🔍 Checking links in {len(pages)} built page(s) under {site_dir}...")
+    scans = scan_pages(site_dir, pages, jobs)
+    checker = SiteChecker(
+        files, directories, {page: scan.ids for page, scan in zip(pages, scans)}, site_url
+    )
+
+    site_prefix = to_repo_relative(site_dir, repo_root)
+    with timings.phase("resolve"):
+        errors, read_failed = find_errors(checker, pages, scans, repo_root, docs_dir, site_prefix)
+    return report_errors(errors, output_format) or int(read_failed)
+
+
+def find_errors(
+    checker: SiteChecker,
+    pages: list[str],
+    scans: list[PageScan],
+    repo_root: Path,
+    docs_dir: Path,
+    site_prefix: str,
+) -> tuple[list[dict[str, object]], bool]:
+    """Check every reference on every page, returning errors and whether a read failed."""
+    errors: list[dict[str, object]] = []
+    read_failed = False
+    for page, scan in zip(pages, scans):
+        if scan.read_error:
+            print(scan.read_error, file=sys.stderr)
+            read_failed = True
+            continue
+        page_errors = checker.check_page(page, scan.references)
+        if not page_errors:
+            continue
+        source = source_page(page, docs_dir, repo_root) or f"{site_prefix}/{page}"
+        for line, col, message in page_errors:
+            errors.append(
+                {
+                    "file": source,
+                    "location": f"{site_prefix}/{page}:{line}:{col}",
+                    "message": message,
+                }
+            )
+    return errors, read_failed
+
+
+@timings.timed("output")
+def report_errors(errors: list[dict[str, object]], output_format: str = "summary") -> int:
+    """Print site errors and return the exit code."""
+    if not errors:
+        print("✅ All links, assets and anchors in the built site resolved successfully!")
+        return 0
+
+    if output_format == "github":
+        for error in errors:
+            emit_github_error(error["file"], f"{error['message']} in {error['location']}")
+
+    print(f"❌ Found {len(errors)} issue(s) in the built site:")
+    for error in errors:
+        print(f"  - {error['file']}: {error['message']} ({error['location']})")
+    return 1
+
+
+def load_site_config(config_path: Path) -> tuple[str, str] | None:
+    """Return the docs_dir and site_url set in zensical.toml."""
+    try:
+        with open(config_path, "rb") as f:
+            config = tomllib.load(f)
+    except FileNotFoundError:
+        print(f"⚠️  Config file not found: {config_path}, assuming defaults", file=sys.stderr)
+        return "doc", ""
+    except Exception as exc:
+        print(f"❌ Error reading config file {config_path}: {exc}", file=sys.stderr)
+        return None
+
+    project_config = config.get("project", {})
+    return project_config.get("docs_dir", "doc"), project_config.get("site_url", "")
+
+
+def main() -> int:
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Check links, assets and anchors in the HTML site built by "
+            "'zensical build', reporting failures against their source pages."
+        )
+    )
+    parser.add_argument(
+        "site",
+        nargs="?",
+        type=Path,
+        default=Path("site"),
+        help="Directory containing the built site (default: site)",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=Path("zensical.toml"),
+        help="Path to zensical.toml config file (default: zensical.toml)",
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path("."),
+        help="Root directory of the repository (default: current directory)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["summary", "github"],
+        default="summary",
+        help="Output format (default: summary)",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=0,
+        help="Number of worker processes used to parse pages; 0 uses every CPU (default: 0)",
+    )
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    start_instrumentation(args, "check-site")
+
+    if not args.site.is_dir():
+        print(
+            f"❌ Error: Site directory '{args.site}' does not exist. Run 'just build' first.",
+            file=sys.stderr,
+        )
+        return 1
+
+    if args.jobs < 0:
+        print("❌ Error: --jobs must be zero or a positive number.", file=sys.stderr)
+        return 1
+    jobs = args.jobs or os.cpu_count() or 1
+
+    site_config = load_site_config(args.config)
+    if site_config is None:
+        return 1
+    docs_dir, site_url = site_config
+
+    repo_root = args.repo_root.resolve()
+    return check_site(
+        args.site.resolve(),
+        repo_root,
+        repo_root / docs_dir,
+        site_url,
+        output_format=args.format,
+        jobs=jobs,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
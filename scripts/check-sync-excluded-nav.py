@@ -11,7 +11,15 @@ try:
 except ImportError:
     import tomli as tomllib
 
-from _utils import get_excluded_files, to_repo_relative
+from _utils import (
+    add_instrumentation_arguments,
+    get_excluded_files,
+    index_toml_strings,
+    start_instrumentation,
+    timings,
+    to_repo_relative,
+)
+from _watch import FileWatcher
 
 
 def iter_nav_entries(value):
@@ -42,6 +50,7 @@ def normalize_nav_path(path: str, docs_dir: str) -> str | None:
     return Path(docs_dir, clean).as_posix()
 
 
+@timings.timed("nav")
 def load_nav_files(config_path: Path) -> tuple[set[str], str] | None:
     """Load file paths from the zensical navigation config."""
     if not config_path.exists():
@@ -81,30 +90,28 @@ def nav_path_value(nav_path: str, docs_dir: str) -> str:
     return nav_path
 
 
+@timings.timed("nav lines")
 def find_nav_line_numbers(
     config_path: Path,
     nav_paths: list[str],
     docs_dir: str,
 ) -> dict[str, int]:
     """Find line numbers for nav entries in zensical.toml."""
-    line_map: dict[str, int] = {}
-    try:
-        lines = config_path.read_text(encoding="utf-8").splitlines()
-    except Exception:
-        return line_map
-
-    nav_values = {path: nav_path_value(path, docs_dir) for path in nav_paths}
+    value_lines: dict[str, int] = {}
+    for string in index_toml_strings(config_path) or []:
+        if string.path[0] == "nav" or string.path[:2] == ("project", "nav"):
+            value_lines.setdefault(string.value, string.line)
 
-    for line_no, line in enumerate(lines, start=1):
-        for nav_path, nav_value in nav_values.items():
-            if nav_path in line_map:
-                continue
-            if f'"{nav_value}"' in line or f"'{nav_value}'" in line:
-                line_map[nav_path] = line_no
+    line_map: dict[str, int] = {}
+    for nav_path in nav_paths:
+        line_no = value_lines.get(nav_path_value(nav_path, docs_dir))
+        if line_no:
+            line_map[nav_path] = line_no
 
     return line_map
 
 
+@timings.timed("report")
 def report_mismatches(
     nav_files: set[str],
     excluded_files: set[str],
@@ -147,6 +154,59 @@ def report_mismatches(
     return 0
 
 
+def watch_mismatches(
+    config_path: Path,
+    manifest_path: Path,
+    repo_root: Path,
+    nav_files: set[str],
+    excluded_files: set[str],
+    docs_dir: str,
+) -> int:
+    """
+    Report mismatches, then recheck them whenever the inputs change.
+
+    Only the file that changed is reloaded: zensical.toml for the nav, or
+    the manifest and git index for the excluded files. Only navigation
+    entries that became excluded or were fixed are printed.
+    """
+    report_mismatches(nav_files, excluded_files, config_path, repo_root, docs_dir, "summary")
+    mismatches = nav_files & excluded_files
+
+    config_path = config_path.resolve()
+    manifest_path = manifest_path.resolve()
+    git_index = repo_root / ".git" / "index"
+    with FileWatcher([], [config_path, manifest_path, git_index]) as watcher:
+        print(f"\nWatching {config_path.name} and {manifest_path.name} for changes "
+              f"({watcher.backend}), press Ctrl+C to stop")
+        for batch in watcher.changes():
+            if config_path in batch:
+                nav_result = load_nav_files(config_path)
+                if nav_result is not None:
+                    nav_files, docs_dir = nav_result
+            if manifest_path in batch or git_index in batch:
+                excluded_result = get_excluded_files(manifest_path, repo_root)
+                if excluded_result is not None:
+                    excluded_files = excluded_result
+
+            current = nav_files & excluded_files
+            appeared = sorted(current - mismatches)
+            fixed = sorted(mismatches - current)
+            mismatches = current
+            if not appeared and not fixed:
+                continue
+
+            for path in appeared:
+                print(f"New navigation entry excluded from sync-public.toml: {path}")
+            for path in fixed:
+                print(f"Fixed: {path}")
+            if mismatches:
+                print(f"Excluded navigation files: {len(mismatches)}")
+            else:
+                print("No navigation entries are excluded from sync-public.toml.")
+
+    return 0
+
+
 def main() -> int:
     """Main entry point for the script."""
     parser = argparse.ArgumentParser(
@@ -176,8 +236,19 @@ def main() -> int:
         default="summary",
         help="Output format (default: summary)",
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and recheck whenever the nav, manifest or git index change",
+    )
 
+    add_instrumentation_arguments(parser)
     args = parser.parse_args()
+    start_instrumentation(args, "check-sync-excluded-nav")
+
+    if args.watch and args.format != "summary":
+        print("ERROR: --watch only supports the summary format", file=sys.stderr)
+        return 1
 
     nav_result = load_nav_files(args.config)
     if nav_result is None:
@@ -189,6 +260,15 @@ def main() -> int:
     if excluded_files is None:
         return 1
 
+    if args.watch:
+        try:
+            return watch_mismatches(
+                args.config, args.manifest, repo_root, nav_files, excluded_files, docs_dir
+            )
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+            return 0
+
     return report_mismatches(
         nav_files,
         excluded_files,
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""Deploy the built site to a gh-pages branch, committing only changed files."""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from _utils import (
+    add_instrumentation_arguments,
+    start_instrumentation,
+    timings,
+)
+
+# Bump whenever the manifest layout changes.
+MANIFEST_VERSION = 2
+# Stored at the root of the deployed branch, next to the site.
+MANIFEST_NAME = ".deploy-manifest.json"
+DEFAULT_CLONE_PATH = Path(".cache/deploy-pages.git")
+FILE_MODE = "100644"
+ZERO_ID = "0" * 40
+
+
+def blob_id(path: str) -> str:
+    """Return the git blob id of a file: the SHA-1 of its content with a blob header."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+@timings.timed("hash")
+def hash_site(site_dir: Path, jobs: int) -> dict[str, str]:
+    """Map every file under site_dir, by its POSIX path relative to it, to its blob id."""
+    paths = []
+    for root, dirs, names in os.walk(site_dir):
+        dirs.sort()
+        relative_root = Path(root).relative_to(site_dir)
+        for name in sorted(names):
+            paths.append((relative_root / name).as_posix())
+    full_paths = [str(site_dir / path) for path in paths]
+
+    if jobs <= 1 or len(paths) <= 1:
+        return dict(zip(paths, map(blob_id, full_paths)))
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return dict(zip(paths, executor.map(blob_id, full_paths, chunksize=chunksize)))
+
+
+def render_manifest(files: dict[str, str], tree: str) -> bytes:
+    """Render the manifest of files, whose tree (without the manifest itself) is tree."""
+    data = {"version": MANIFEST_VERSION, "tree": tree, "files": dict(sorted(files.items()))}
+    return (json.dumps(data, indent=1) + "\n").encode("utf-8")
+
+
+class PagesClone:
+    """
+    A bare local clone holding the deployed branch, driven with git plumbing.
+
+    Only the tip of the branch is fetched. New blobs are written straight
+    into its object database and the new tree is built in a temporary index
+    seeded from the previous tree, so the cost of a deploy grows with the
+    number of changed files rather than with the size of the site.
+    """
+
+    def __init__(self, path: Path, remote: str, branch: str, identity: dict[str, str] | None = None) -> None:
+        self.path = path
+        self.remote = remote
+        self.branch = branch
+        self.ref = f"refs/heads/{branch}"
+        # GIT_AUTHOR_* and GIT_COMMITTER_* variables for the deploy commit.
+        self.identity = identity or {}
+
+    def git(self, *args: str, input: bytes | None = None, env: dict | None = None) -> str:
+        result = subprocess.run(
+            ["git", f"--git-dir={self.path}", *args],
+            input=input,
+            capture_output=True,
+            check=True,
+            env=env,
+        )
+        return result.stdout.decode("utf-8")
+
+    @timings.timed("fetch")
+    def fetch(self) -> str | None:
+        """Fetch the tip of the branch, returning its commit id or None if it does not exist."""
+        if not self.path.exists():
+            subprocess.run(
+                ["git", "init", "--quiet", "--bare", str(self.path)],
+                capture_output=True,
+                check=True,
+            )
+        heads = self.git("ls-remote", "--heads", self.remote, self.ref)
+        if not heads.strip():
+            return None
+        self.git("fetch", "--quiet", "--no-tags", "--depth=1", self.remote, f"+{self.ref}:{self.ref}")
+        return self.git("rev-parse", "--verify", f"{self.ref}^{{commit}}").strip()
+
+    def site_tree(self, commit: str) -> str:
+        """
+        Return the id of commit's tree without the manifest.
+
+        Only the top level of the tree is listed: the subtrees are reused as
+        they are, so this costs the same whatever the size of the site.
+        """
+        records = [
+            f"{record}\0"
+            for record in self.git("ls-tree", "-z", commit).split("\0")
+            if record and record.partition("\t")[2] != MANIFEST_NAME
+        ]
+        return self.git("mktree", "-z", input="".join(records).encode("utf-8")).strip()
+
+    def deployed_files(self, commit: str) -> dict[str, str]:
+        """
+        Return the blob id of every file deployed at commit.
+
+        The manifest is used when the tree id recorded in it is the commit's
+        actual tree. Otherwise, when there is no manifest (the branch was last
+        written by another tool), it has an older layout, or the branch was
+        changed since without updating it, the whole tree is listed instead.
+        """
+        try:
+            manifest = json.loads(self.git("cat-file", "blob", f"{commit}:{MANIFEST_NAME}"))
+        except (subprocess.CalledProcessError, ValueError):
+            manifest = None
+        if (
+            isinstance(manifest, dict)
+            and manifest.get("version") == MANIFEST_VERSION
+            and manifest.get("tree") == self.site_tree(commit)
+        ):
+            return manifest["files"]
+
+        files = {}
+        for record in self.git("ls-tree", "-r", "-z", commit).split("\0"):
+            if not record:
+                continue
+            info, _, path = record.partition("\t")
+            _mode, kind, object_id = info.split()
+            if kind == "blob" and path != MANIFEST_NAME:
+                files[path] = object_id
+        return files
+
+    @timings.timed("write")
+    def write_blobs(self, site_dir: Path, paths: list[str], expected: dict[str, str]) -> None:
+        """Write the given site files into the object database."""
+        if not paths:
+            return
+        stdin = "".join(f"{site_dir / path}\n" for path in paths).encode("utf-8")
+        written = self.git("hash-object", "-w", "--no-filters", "--stdin-paths", input=stdin).split()
+        for path, object_id in zip(paths, written):
+            if object_id != expected[path]:
+                raise RuntimeError(f"{path} changed while it was being deployed")
+
+    @timings.timed("commit")
+    def commit(
+        self,
+        parent: str | None,
+        updates: dict[str, str],
+        removals: list[str],
+        site_files: dict[str, str],
+        message: str,
+    ) -> str:
+        """
+        Create a commit on top of parent with the given files updated and removed.
+
+        The tree is first written without a manifest, and the manifest of
+        site_files, recording that tree's id, is then added to it.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            env = dict(os.environ, GIT_INDEX_FILE=os.path.join(tmp_dir, "index"))
+            if parent is not None:
+                self.git("read-tree", parent, env=env)
+            index_info = "".join(
+                [f"{FILE_MODE} {object_id}\t{path}\0" for path, object_id in updates.items()]
+                + [f"0 {ZERO_ID}\t{path}\0" for path in [*removals, MANIFEST_NAME]]
+            )
+            self.git("update-index", "-z", "--index-info", input=index_info.encode("utf-8"), env=env)
+            site_tree = self.git("write-tree", env=env).strip()
+
+            manifest = render_manifest(site_files, site_tree)
+            manifest_id = self.git("hash-object", "-w", "--stdin", input=manifest).strip()
+            manifest_info = f"{FILE_MODE} {manifest_id}\t{MANIFEST_NAME}\0"
+            self.git("update-index", "-z", "--index-info", input=manifest_info.encode("utf-8"), env=env)
+            tree = self.git("write-tree", env=env).strip()
+
+        command = ["commit-tree", tree, "-m", message]
+        if parent is not None:
+            command += ["-p", parent]
+        return self.git(*command, env=dict(os.environ, **self.identity)).strip()
+
+    @timings.timed("push")
+    def push(self, commit: str) -> None:
+        """Fast-forward the remote branch to commit."""
+        self.git("push", "--quiet", self.remote, f"{commit}:{self.ref}")
+        self.git("update-ref", self.ref, commit)
+
+
+def resolve_remote(remote: str, repo_root: Path) -> str:
+    """Return the URL of a remote of the repository, or remote itself as a URL or path."""
+    result = subprocess.run(
+        ["git", "-C", str(repo_root), "remote", "get-url", remote],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode == 0:
+        return result.stdout.strip()
+    if Path(remote).exists():
+        return str(Path(remote).resolve())
+    return remote
+
+
+def repo_identity(repo_root: Path) -> dict[str, str]:
+    """
+    Return the repository's user.name and user.email as git environment variables.
+
+    The bare clone has no configuration of its own, so without these a
+    name or email set only in the repository would be ignored.
+    """
+    identity = {}
+    for key, role in (("user.name", "NAME"), ("user.email", "EMAIL")):
+        result = subprocess.run(
+            ["git", "-C", str(repo_root), "config", key],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            identity[f"GIT_AUTHOR_{role}"] = identity[f"GIT_COMMITTER_{role}"] = result.stdout.strip()
+    return identity
+
+
+def deploy(
+    site_dir: Path,
+    clone: PagesClone,
+    message: str,
+    jobs: int = 1,
+    dry_run: bool = False,
+    push: bool = True,
+) -> int:
+    """Deploy site_dir to the clone's branch, committing only what changed."""
+    site_files = hash_site(site_dir, jobs)
+    # Served as-is by GitHub Pages, rather than built with Jekyll.
+    site_files.setdefault(".nojekyll", hashlib.sha1(b"blob 0\0").hexdigest())
+    print(f"📦 Hashed {len(site_files)} file(s) in {site_dir}")
+
+    parent = clone.fetch()
+    deployed = clone.deployed_files(parent) if parent is not None else {}
+    changed = sorted(path for path, object_id in site_files.items() if deployed.get(path) != object_id)
+    removed = sorted(path for path in deployed if path not in site_files)
+    added = sum(1 for path in changed if path not in deployed)
+    print(
+        f"🔍 {len(changed) - added} changed, {added} added and {len(removed)} removed "
+        f"compared with {clone.branch}" + ("" if parent is not None else " (new branch)")
+    )
+
+    if not changed and not removed:
+        print(f"✅ {clone.branch} is already up to date")
+        return 0
+    if dry_run:
+        for path in changed:
+            print(f"  {'M' if path in deployed else 'A'} {path}")
+        for path in removed:
+            print(f"  D {path}")
+        print("Dry run complete: nothing was committed.")
+        return 0
+
+    on_disk = [path for path in changed if (site_dir / path).is_file()]
+    clone.write_blobs(site_dir, on_disk, site_files)
+    if ".nojekyll" in changed and ".nojekyll" not in on_disk:
+        clone.git("hash-object", "-w", "--stdin", input=b"")
+
+    updates = {path: site_files[path] for path in changed}
+    commit = clone.commit(parent, updates, removed, site_files, message)
+
+    if not push:
+        print(f"✅ Committed {commit[:12]} to {clone.branch} in {clone.path} (not pushed)")
+        return 0
+    clone.push(commit)
+    print(f"📤 Pushed {commit[:12]} to {clone.branch} on {clone.remote}")
+    return 0
+
+
+def main() -> int:
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Deploy the built site to a gh-pages branch. Only files whose content "
+            f"differs from the {MANIFEST_NAME} manifest stored on the branch are "
+            "committed, on top of the branch's previous commit."
+        )
+    )
+    parser.add_argument(
+        "site_dir",
+        nargs="?",
+        type=Path,
+        default=Path("site"),
+        help="Built site to deploy (default: site)",
+    )
+    parser.add_argument(
+        "--remote",
+        default="origin",
+        help="Remote name, URL or path to deploy to (default: origin)",
+    )
+    parser.add_argument(
+        "--branch",
+        default="gh-pages",
+        help="Branch to deploy to (default: gh-pages)",
+    )
+    parser.add_argument(
+        "-m", "--message",
+        default="Update documentation",
+        help="Commit message (default: Update documentation)",
+    )
+    parser.add_argument(
+        "--clone",
+        type=Path,
+        default=DEFAULT_CLONE_PATH,
+        help=(
+            "Bare clone used to build the commit, created when missing "
+            f"(default: {DEFAULT_CLONE_PATH}, relative to --repo-root)"
+        ),
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path("."),
+        help="Root directory of the repository (default: current directory)",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=0,
+        help="Number of worker processes used to hash the site; 0 uses every CPU (default: 0)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List the files that would be committed without committing anything",
+    )
+    parser.add_argument(
+        "--no-push",
+        action="store_true",
+        help="Commit to the branch in the local clone but do not push it",
+    )
+
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    start_instrumentation(args, "deploy-pages")
+
+    if not args.site_dir.is_dir():
+        print(f"❌ Error: Site directory '{args.site_dir}' does not exist. Run 'just build' first.", file=sys.stderr)
+        return 1
+    if args.jobs < 0:
+        print("❌ Error: --jobs must be zero or a positive number.", file=sys.stderr)
+        return 1
+    jobs = args.jobs or os.cpu_count() or 1
+
+    repo_root = args.repo_root.resolve()
+    clone_path = args.clone if args.clone.is_absolute() else repo_root / args.clone
+    clone = PagesClone(
+        clone_path,
+        resolve_remote(args.remote, repo_root),
+        args.branch,
+        identity=repo_identity(repo_root),
+    )
+    try:
+        return deploy(
+            args.site_dir.resolve(),
+            clone,
+            args.message,
+            jobs=jobs,
+            dry_run=args.dry_run,
+            push=not args.no_push,
+        )
+    except subprocess.CalledProcessError as e:
+        subcommand = next(arg for arg in e.cmd[1:] if not arg.startswith("-"))
+        print(f"❌ Error: git {subcommand} failed", file=sys.stderr)
+        if e.stderr:
+            print(e.stderr.decode("utf-8", errors="replace").strip(), file=sys.stderr)
+        return 1
+    except (OSError, RuntimeError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
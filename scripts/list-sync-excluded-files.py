@@ -5,9 +5,16 @@ import argparse
 import sys
 from pathlib import Path
 
-from _utils import get_tracked_files, load_manifest_sources
+from _utils import (
+    add_instrumentation_arguments,
+    get_tracked_files,
+    load_manifest_sources,
+    start_instrumentation,
+    timings,
+)
 
 
+@timings.timed("list")
 def list_excluded_files(
     manifest_sources: set[str],
     tracked_files: list[str],
@@ -59,17 +66,19 @@ def main() -> int:
         help="Output format (default: summary)",
     )
 
+    add_instrumentation_arguments(parser)
     args = parser.parse_args()
+    start_instrumentation(args, "list-sync-excluded-files")
     repo_root = args.repo_root.resolve()
 
-    manifest_sources = load_manifest_sources(args.manifest)
-    if manifest_sources is None:
-        return 1
-
     tracked_files = get_tracked_files(repo_root)
     if tracked_files is None:
         return 1
 
+    manifest_sources = load_manifest_sources(args.manifest, tracked_files)
+    if manifest_sources is None:
+        return 1
+
     return list_excluded_files(manifest_sources, tracked_files, args.format)
 
 
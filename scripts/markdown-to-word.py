@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""Convert markdown documents to Word with pandoc, skipping unchanged ones."""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from _utils import (
+    add_instrumentation_arguments,
+    start_instrumentation,
+    timings,
+    to_repo_relative,
+)
+
+# Bump whenever the manifest layout or the pandoc command line changes.
+MANIFEST_VERSION = 1
+DEFAULT_SOURCES = [
+    "doc/design-authority/dhcw/architecture-decision-record-template.md",
+    "doc/design-authority/dhcw/architecture-design-overview-template.md",
+]
+DEFAULT_OUTPUT_DIR = Path("word")
+DEFAULT_REFERENCE_DOC = Path(".github/workflows/markdown-to-word-styles.docx")
+MANIFEST_NAME = "manifest.json"
+GLOB_CHARACTERS = set("*?[")
+
+
+@dataclass
+class Conversion:
+    """One markdown source and the Word document generated from it."""
+
+    source: str
+    output: str
+    source_sha256: str
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def expand_sources(patterns: list[str]) -> tuple[list[Path], list[str]]:
+    """
+    Expand paths and glob patterns (``**`` matches directories recursively)
+    into markdown files, returning them in order and the patterns that
+    matched nothing.
+    """
+    sources: dict[Path, None] = {}
+    unmatched = []
+    for pattern in patterns:
+        if GLOB_CHARACTERS.intersection(pattern):
+            matches = sorted(Path(path) for path in glob.glob(pattern, recursive=True))
+        else:
+            matches = [Path(pattern)] if Path(pattern).is_file() else []
+        matches = [path for path in matches if path.suffix == ".md" and path.is_file()]
+        if not matches:
+            unmatched.append(pattern)
+        sources.update(dict.fromkeys(matches))
+    return list(sources), unmatched
+
+
+def pandoc_version(pandoc: str) -> str | None:
+    """Return the first line of ``pandoc --version``, or None if pandoc cannot run."""
+    try:
+        result = subprocess.run(
+            [pandoc, "--version"], capture_output=True, text=True, check=False
+        )
+    except OSError:
+        return None
+    if result.returncode != 0 or not result.stdout:
+        return None
+    return result.stdout.splitlines()[0]
+
+
+def load_manifest(path: Path) -> dict[str, dict]:
+    """Return the documents recorded by the last run, or nothing if unusable."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("documents", {})
+
+
+def write_manifest(path: Path, documents: dict[str, dict]) -> None:
+    data = {
+        "version": MANIFEST_VERSION,
+        "documents": dict(sorted(documents.items())),
+    }
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def is_up_to_date(entry: dict | None, conversion: Conversion, build: dict, output_dir: Path) -> bool:
+    """Return whether the recorded output was built from the same inputs and still exists."""
+    if entry is None:
+        return False
+    if entry.get("source") != conversion.source:
+        return False
+    if entry.get("source_sha256") != conversion.source_sha256:
+        return False
+    if any(entry.get(key) != value for key, value in build.items()):
+        return False
+    try:
+        return (output_dir / conversion.output).stat().st_size == entry.get("size")
+    except OSError:
+        return False
+
+
+def convert(pandoc: str, source: str, output: str, reference_doc: str) -> str | None:
+    """
+    Run pandoc for one document, returning its error output on failure.
+
+    The document is written to a temporary file first so that an interrupted
+    or failed conversion never leaves a truncated .docx behind.
+    """
+    tmp_output = f"{output}.tmp"
+    command = [
+        pandoc,
+        source,
+        "--to=docx",
+        f"--reference-doc={reference_doc}",
+        # Images are linked relative to the page, not to the working directory.
+        f"--resource-path={os.path.dirname(source) or '.'}",
+        f"--output={tmp_output}",
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, check=False)
+    except OSError as e:
+        return str(e)
+    if result.returncode != 0:
+        try:
+            os.remove(tmp_output)
+        except OSError:
+            pass
+        return result.stderr.strip() or f"pandoc exited with status {result.returncode}"
+    os.replace(tmp_output, output)
+    return None
+
+
+def remove_stale_outputs(output_dir: Path, current: set[str]) -> list[str]:
+    """
+    Delete the .docx files in output_dir that are not among the current outputs.
+
+    These were generated from documents that have since been renamed, deleted
+    or dropped from the source list, and would otherwise be published again
+    with every later release. Returns the names of the files deleted.
+    """
+    removed = []
+    for path in sorted(output_dir.glob("*.docx")):
+        if path.name not in current and path.is_file():
+            path.unlink()
+            removed.append(path.name)
+    return removed
+
+
+@timings.timed("convert")
+def run_conversions(
+    conversions: list[Conversion],
+    pandoc: str,
+    output_dir: Path,
+    reference_doc: Path,
+    jobs: int,
+) -> dict[str, str | None]:
+    """Convert documents in parallel, printing each as it finishes; return errors by output."""
+    errors: dict[str, str | None] = {}
+    with ProcessPoolExecutor(max_workers=max(1, min(jobs, len(conversions)))) as executor:
+        futures = {
+            executor.submit(
+                convert,
+                pandoc,
+                conversion.source,
+                str(output_dir / conversion.output),
+                str(reference_doc),
+            ): conversion
+            for conversion in conversions
+        }
+        for future in as_completed(futures):
+            conversion = futures[future]
+            error = errors[conversion.output] = future.result()
+            if error is None:
+                print(f"   Converted: {conversion.source} -> {output_dir / conversion.output}")
+            else:
+                print(f"   ❌ Failed: {conversion.source}", file=sys.stderr)
+    return errors
+
+
+def main() -> int:
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Convert markdown documents to Word with pandoc in parallel. Documents "
+            "whose source and reference document are unchanged since they were "
+            "last converted are skipped."
+        )
+    )
+    parser.add_argument(
+        "sources",
+        nargs="*",
+        default=DEFAULT_SOURCES,
+        help=(
+            "Markdown files or glob patterns to convert, e.g. 'doc/decisions/*/*.md' "
+            "(default: the ADR and design overview templates)"
+        ),
+    )
+    parser.add_argument(
+        "-o", "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help=(
+            f"Directory for the .docx files and their {MANIFEST_NAME}; any other "
+            f".docx in it is deleted (default: {DEFAULT_OUTPUT_DIR})"
+        ),
+    )
+    parser.add_argument(
+        "--reference-doc",
+        type=Path,
+        default=DEFAULT_REFERENCE_DOC,
+        help=f"Word document whose styles are used (default: {DEFAULT_REFERENCE_DOC})",
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path("."),
+        help="Root directory of the repository (default: current directory)",
+    )
+    parser.add_argument(
+        "--pandoc",
+        default="pandoc",
+        help="pandoc executable to run (default: pandoc)",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=0,
+        help="Number of pandoc processes to run at once; 0 uses every CPU (default: 0)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Convert every document, even those that are up to date",
+    )
+
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    start_instrumentation(args, "markdown-to-word")
+
+    if args.jobs < 0:
+        print("❌ Error: --jobs must be zero or a positive number.", file=sys.stderr)
+        return 1
+    jobs = args.jobs or os.cpu_count() or 1
+
+    sources, unmatched = expand_sources(args.sources)
+    for pattern in unmatched:
+        print(f"❌ Error: No markdown files match '{pattern}'", file=sys.stderr)
+    if unmatched:
+        return 1
+
+    if not args.reference_doc.is_file():
+        print(f"❌ Error: Reference document '{args.reference_doc}' not found.", file=sys.stderr)
+        return 1
+
+    version = pandoc_version(args.pandoc)
+    if version is None:
+        print(
+            f"❌ Error: Could not run '{args.pandoc}'. Install pandoc from "
+            "https://pandoc.org/installing.html",
+            file=sys.stderr,
+        )
+        return 1
+
+    repo_root = args.repo_root.resolve()
+    outputs: dict[str, list[str]] = {}
+    with timings.phase("hash"):
+        build = {
+            "reference_doc": to_repo_relative(args.reference_doc, repo_root),
+            "reference_doc_sha256": file_sha256(args.reference_doc),
+            "pandoc": version,
+        }
+        conversions = []
+        for source in sources:
+            conversion = Conversion(
+                source=to_repo_relative(source, repo_root),
+                output=f"{source.stem}.docx",
+                source_sha256=file_sha256(source),
+            )
+            outputs.setdefault(conversion.output, []).append(conversion.source)
+            conversions.append(conversion)
+
+    # Documents are published side by side, so their names must be unique.
+    clashes = {output: names for output, names in outputs.items() if len(names) > 1}
+    if clashes:
+        for output, names in sorted(clashes.items()):
+            print(f"❌ Error: {', '.join(names)} would all be written to {output}", file=sys.stderr)
+        return 1
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = args.output_dir / MANIFEST_NAME
+    documents = load_manifest(manifest_path)
+    pending = [
+        conversion
+        for conversion in conversions
+        if args.force
+        or not is_up_to_date(documents.get(conversion.output), conversion, build, args.output_dir)
+    ]
+
+    print(
+        f"📄 Converting {len(pending)} of {len(conversions)} markdown document(s) "
+        f"to Word with {version}..."
+    )
+    errors = {}
+    if pending:
+        errors = run_conversions(pending, args.pandoc, args.output_dir, args.reference_doc, jobs)
+
+    for conversion in pending:
+        if errors[conversion.output] is not None:
+            documents.pop(conversion.output, None)
+            continue
+        documents[conversion.output] = {
+            "source": conversion.source,
+            "source_sha256": conversion.source_sha256,
+            **build,
+            "size": (args.output_dir / conversion.output).stat().st_size,
+        }
+    # Only the outputs of the current sources are kept, so that documents
+    # renamed or deleted since an earlier run are not published again.
+    current = {conversion.output for conversion in conversions}
+    for output in remove_stale_outputs(args.output_dir, current):
+        print(f"   Removed: {args.output_dir / output} (no longer converted)")
+    documents = {
+        output: entry
+        for output, entry in documents.items()
+        if output in current and (args.output_dir / output).is_file()
+    }
+    with timings.phase("manifest"):
+        write_manifest(manifest_path, documents)
+
+    failed = [conversion for conversion in pending if errors[conversion.output] is not None]
+    if failed:
+        print(f"\n❌ {len(failed)} document(s) failed to convert:")
+        for conversion in failed:
+            print(f"  - {conversion.source}:")
+            for line in errors[conversion.output].splitlines():
+                print(f"      {line}")
+        return 1
+
+    skipped = len(conversions) - len(pending)
+    if skipped:
+        print(f"⏭️  Skipped {skipped} unchanged document(s)")
+    print(f"✅ Word documents are up to date in {args.output_dir} (manifest: {manifest_path})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""Run the repository QA checks in one process against a shared snapshot."""
+
+import argparse
+import io
+import os
+import sys
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from _utils import (
+    add_instrumentation_arguments,
+    import_script,
+    list_repo_files,
+    load_manifest,
+    manifest_sources,
+    start_instrumentation,
+    timings,
+)
+
+check_links_script = import_script("check-links")
+verify_sync_manifest_script = import_script("verify-sync-manifest")
+list_sync_excluded_script = import_script("list-sync-excluded-files")
+check_sync_excluded_nav_script = import_script("check-sync-excluded-nav")
+
+
+@dataclass
+class RepoSnapshot:
+    """Repository state shared by every check, gathered once up front."""
+
+    repo_root: Path
+    manifest_path: Path
+    config_path: Path
+    manifest: dict
+    sources: set[str]
+    tracked_files: list[str]
+    working_tree_files: set[str]
+    excluded_files: set[str]
+    nav_files: set[str]
+    docs_dir: str
+
+    @classmethod
+    @timings.timed("snapshot")
+    def load(
+        cls, repo_root: Path, manifest_path: Path, config_path: Path
+    ) -> "RepoSnapshot | None":
+        """Read the manifest, nav config and git file list once."""
+        repo_files = list_repo_files(repo_root)
+        if repo_files is None:
+            print("ERROR: Failed to list git-tracked files", file=sys.stderr)
+            return None
+        tracked_files, working_tree_files = repo_files
+
+        manifest = load_manifest(manifest_path)
+        if manifest is None:
+            return None
+        sources = manifest_sources(manifest, tracked_files)
+        if sources is None:
+            return None
+
+        nav_result = check_sync_excluded_nav_script.load_nav_files(config_path)
+        if nav_result is None:
+            return None
+        nav_files, docs_dir = nav_result
+
+        return cls(
+            repo_root=repo_root,
+            manifest_path=manifest_path,
+            config_path=config_path,
+            manifest=manifest,
+            sources=sources,
+            tracked_files=tracked_files,
+            working_tree_files=working_tree_files,
+            excluded_files=set(tracked_files) - sources,
+            nav_files=nav_files,
+            docs_dir=docs_dir,
+        )
+
+
+@dataclass
+class Check:
+    """A named QA check run against the snapshot."""
+
+    name: str
+    title: str
+    run: Callable[[], int]
+
+
+@dataclass
+class CheckOutcome:
+    """The exit code and captured output of a check."""
+
+    check: Check
+    status: int
+    output: list[tuple[str, str]]
+
+
+class ThreadRouter(io.TextIOBase):
+    """
+    Route writes to a per-thread buffer while checks run concurrently.
+
+    Writes from threads that are not capturing go to the original stream.
+    Captured chunks are tagged with their stream ("stdout" or "stderr") so
+    that each check's output can be replayed in order once it finishes.
+    """
+
+    def __init__(self, stream_name: str, fallback, buffers: threading.local) -> None:
+        self.stream_name = stream_name
+        self.fallback = fallback
+        self.buffers = buffers
+
+    def write(self, text: str) -> int:
+        chunks = getattr(self.buffers, "chunks", None)
+        if chunks is None:
+            return self.fallback.write(text)
+        if chunks and chunks[-1][0] == self.stream_name:
+            # Coalesce so that print()'s separate newline write stays on its line.
+            chunks[-1] = (self.stream_name, chunks[-1][1] + text)
+        else:
+            chunks.append((self.stream_name, text))
+        return len(text)
+
+    def flush(self) -> None:
+        if getattr(self.buffers, "chunks", None) is None:
+            self.fallback.flush()
+
+
+def build_checks(
+    snapshot: RepoSnapshot, search_path: Path, output_format: str, jobs: int
+) -> list[Check]:
+    """Return the checks run by ``just qa``, in reporting order."""
+    repo_root = snapshot.repo_root
+    return [
+        Check(
+            "check-links",
+            "🔗 Checking internal links",
+            lambda: check_links_script.check_links(
+                search_path,
+                snapshot.excluded_files,
+                repo_root,
+                output_format=output_format,
+                jobs=jobs,
+                resolver=check_links_script.LinkResolver(
+                    repo_root,
+                    snapshot.working_tree_files,
+                    check_links_script.load_snippet_config(snapshot.config_path),
+                ),
+                config_path=snapshot.config_path if search_path.is_dir() else None,
+            ),
+        ),
+        Check(
+            "verify-sync-manifest",
+            "🔍 Verifying sync manifest files exist",
+            lambda: verify_sync_manifest_script.verify_manifest(
+                snapshot.manifest_path,
+                repo_root,
+                output_format=output_format,
+                config=snapshot.manifest,
+                tracked_files=set(snapshot.tracked_files),
+            ),
+        ),
+        Check(
+            "list-sync-excluded",
+            "📋 Listing files excluded from sync manifest",
+            lambda: list_sync_excluded_script.list_excluded_files(
+                snapshot.sources, snapshot.tracked_files, "summary"
+            ),
+        ),
+        Check(
+            "check-sync-excluded-nav",
+            "🧭 Checking navigation entries against sync manifest",
+            lambda: check_sync_excluded_nav_script.report_mismatches(
+                snapshot.nav_files,
+                snapshot.excluded_files,
+                snapshot.config_path,
+                repo_root,
+                snapshot.docs_dir,
+                output_format,
+            ),
+        ),
+    ]
+
+
+@timings.timed("checks")
+def run_checks(checks: list[Check]) -> list[CheckOutcome]:
+    """Run checks concurrently, capturing the output of each one separately."""
+    buffers = threading.local()
+
+    def run(check: Check) -> CheckOutcome:
+        buffers.chunks = []
+        try:
+            status = check.run()
+        except Exception as exc:
+            print(f"❌ {check.name} failed: {exc!r}", file=sys.stderr)
+            status = 1
+        finally:
+            output = buffers.chunks
+            buffers.chunks = None
+        return CheckOutcome(check, status, output)
+
+    original_stdout, original_stderr = sys.stdout, sys.stderr
+    sys.stdout = ThreadRouter("stdout", original_stdout, buffers)
+    sys.stderr = ThreadRouter("stderr", original_stderr, buffers)
+    try:
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            return list(executor.map(run, checks))
+    finally:
+        sys.stdout, sys.stderr = original_stdout, original_stderr
+
+
+@timings.timed("output")
+def report_outcomes(outcomes: list[CheckOutcome], output_format: str) -> int:
+    """Print each check's output as a group and merge GitHub annotations."""
+    annotations: list[str] = []
+    for outcome in outcomes:
+        if output_format == "github":
+            print(f"::group::{outcome.check.name}")
+        else:
+            print(f"{outcome.check.title}...")
+        sys.stdout.flush()
+
+        for stream_name, text in outcome.output:
+            if output_format == "github":
+                # Annotations are collected and emitted once all groups are
+                # closed so that they are not hidden inside a group.
+                lines = text.splitlines(keepends=True)
+                kept = []
+                for line in lines:
+                    if line.startswith("::error "):
+                        annotations.append(line.rstrip("\n"))
+                    else:
+                        kept.append(line)
+                text = "".join(kept)
+            stream = sys.stdout if stream_name == "stdout" else sys.stderr
+            stream.write(text)
+            stream.flush()
+
+        if output_format == "github":
+            print("::endgroup::")
+        if outcome.status == 0:
+            print(f"✅ {outcome.check.name} passed\n")
+        else:
+            print(f"❌ {outcome.check.name} failed\n")
+
+    for annotation in dict.fromkeys(annotations):
+        print(annotation)
+
+    failed = [outcome.check.name for outcome in outcomes if outcome.status != 0]
+    if failed:
+        print(f"❌ {len(failed)} of {len(outcomes)} check(s) failed: {', '.join(failed)}")
+        return 1
+
+    print(f"✅ All {len(outcomes)} checks passed")
+    return 0
+
+
+def main() -> int:
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run the link, sync manifest and navigation checks in one process, "
+            "sharing a single snapshot of the repository."
+        )
+    )
+    parser.add_argument(
+        "path",
+        nargs="?",
+        type=Path,
+        default=Path("doc"),
+        help="Path to search for markdown files to link check (default: doc)",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=Path("sync-public.toml"),
+        help="Path to sync-public.toml manifest file (default: sync-public.toml)",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=Path("zensical.toml"),
+        help="Path to zensical.toml config file (default: zensical.toml)",
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path("."),
+        help="Root directory of the repository (default: current directory)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["summary", "github"],
+        default="summary",
+        help="Output format (default: summary)",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for the link check; 0 uses all CPUs (default: 1)",
+    )
+
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    start_instrumentation(args, "qa")
+
+    if not args.path.exists():
+        print(f"❌ Error: Path '{args.path}' does not exist.", file=sys.stderr)
+        return 1
+
+    if args.jobs < 0:
+        print("❌ Error: --jobs must be zero or a positive number.", file=sys.stderr)
+        return 1
+    jobs = args.jobs or os.cpu_count() or 1
+
+    repo_root = args.repo_root.resolve()
+    snapshot = RepoSnapshot.load(repo_root, args.manifest, args.config)
+    if snapshot is None:
+        return 1
+
+    checks = build_checks(snapshot, args.path, args.format, jobs)
+    return report_outcomes(run_checks(checks), args.format)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,8 +4,17 @@
 from __future__ import annotations
 
 import argparse
+import errno
+import hashlib
+import json
+import os
 import shutil
+import subprocess
 import sys
+import tempfile
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -14,6 +23,40 @@ try:
 except ModuleNotFoundError:  # pragma: no cover
     import tomli as tomllib  # type: ignore[import-not-found]
 
+from _utils import (
+    add_instrumentation_arguments,
+    expand_manifest_rules,
+    list_repo_files,
+    parse_manifest_rules,
+    start_instrumentation,
+    timings,
+)
+
+try:
+    import fcntl
+except ModuleNotFoundError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+STATE_FILE_NAME = "sync-public-state.json"
+
+# ioctl request to share extents between files (Linux btrfs, XFS, ...).
+FICLONE = 0x40049409
+# Errors meaning "not supported here", after which a slower method is tried.
+UNSUPPORTED_ERRNOS = {
+    errno.EBADF,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+    errno.EXDEV,
+}
+_copy_methods = {
+    "reflink": fcntl is not None,
+    "copy_file_range": hasattr(os, "copy_file_range"),
+}
+
 
 @dataclass(frozen=True)
 class PublishEntry:
@@ -21,10 +64,241 @@ class PublishEntry:
     destination: Path
 
 
-def parse_manifest(manifest_path: Path) -> list[PublishEntry]:
-    """Parse the TOML manifest file."""
+@dataclass
+class SyncStats:
+    copied: int = 0
+    skipped: int = 0
+    deleted: int = 0
+
+
+@timings.timed("hash")
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class SyncState:
+    """
+    Record of what the last delta sync wrote to the target.
+
+    For each destination the state keeps the size and mtime of both the
+    source and the destination plus the content hash. When none of the four
+    stats have changed since, the file is skipped without being read. The
+    state lives in the target's .git directory so it is never published; for
+    a target that is not a git clone it sits in the target root instead.
+    """
+
+    def __init__(self, path: Path, files: dict[str, dict[str, object]]) -> None:
+        self.path = path
+        self.files = files
+
+    @staticmethod
+    def state_path(target_root: Path) -> Path:
+        git_dir = target_root / ".git"
+        if git_dir.is_dir():
+            return git_dir / STATE_FILE_NAME
+        return target_root / f".{STATE_FILE_NAME}"
+
+    @classmethod
+    def load(cls, target_root: Path) -> SyncState:
+        path = cls.state_path(target_root)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            files = data["files"]
+        except (OSError, ValueError, KeyError, TypeError):
+            files = {}
+        return cls(path, files)
+
+    def is_unchanged(self, key: str, source_path: Path, target_path: Path) -> bool:
+        """Return whether target_path already holds the content of source_path."""
+        try:
+            source_stat = source_path.stat()
+            target_stat = target_path.stat()
+        except FileNotFoundError:
+            return False
+
+        if source_stat.st_size != target_stat.st_size:
+            return False
+
+        record = self.files.get(key)
+        if record and (
+            record["source_size"] == source_stat.st_size
+            and record["source_mtime_ns"] == source_stat.st_mtime_ns
+            and record["size"] == target_stat.st_size
+            and record["mtime_ns"] == target_stat.st_mtime_ns
+        ):
+            return True
+
+        digest = file_digest(source_path)
+        if digest != file_digest(target_path):
+            return False
+
+        self.record(key, source_path, target_path, digest)
+        return True
+
+    def record(self, key: str, source_path: Path, target_path: Path, digest: str | None = None) -> None:
+        """Remember the stats of a destination that matches its source."""
+        source_stat = source_path.stat()
+        target_stat = target_path.stat()
+        self.files[key] = {
+            "source_size": source_stat.st_size,
+            "source_mtime_ns": source_stat.st_mtime_ns,
+            "size": target_stat.st_size,
+            "mtime_ns": target_stat.st_mtime_ns,
+            "sha256": digest or file_digest(target_path),
+        }
+
+    def save(self, keep: set[str]) -> None:
+        """Write the state, forgetting destinations that are no longer synced."""
+        files = {key: record for key, record in sorted(self.files.items()) if key in keep}
+        self.path.write_text(json.dumps({"files": files}, indent=1), encoding="utf-8")
+
+
+@timings.timed("copy")
+def copy_file_data(source_path: Path, target_path: Path) -> None:
+    """
+    Copy file content using the cheapest method the filesystem supports.
+
+    Tries a reflink (no data copied at all), then os.copy_file_range (copied
+    in the kernel), then a regular buffered copy. A method found unsupported
+    is not tried again for the rest of the run.
+    """
+    with open(source_path, "rb") as src, open(target_path, "wb") as dst:
+        if _copy_methods["reflink"]:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return
+            except OSError as exc:
+                if exc.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+                _copy_methods["reflink"] = False
+
+        if _copy_methods["copy_file_range"]:
+            try:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                return
+            except OSError as exc:
+                if exc.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+                _copy_methods["copy_file_range"] = False
+                # Start again from scratch after a partial copy.
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+
+        shutil.copyfileobj(src, dst)
+
+
+def stage_copy(source_path: Path, target_path: Path) -> Path:
+    """
+    Copy source_path (content and metadata, like shutil.copy2) to a temporary
+    sibling of target_path and return the temporary path.
+    """
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=target_path.parent, prefix=f".{target_path.name}.", suffix=".tmp"
+    )
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        copy_file_data(source_path, tmp_path)
+        shutil.copystat(source_path, tmp_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path
+
+
+class StagedCopies:
+    """
+    Copies written to temporary siblings and renamed into place together.
+
+    Nothing in the target changes until commit(), and each rename is atomic,
+    so an interrupted sync never leaves a partially written file behind. The
+    directories created to hold the temporary files are removed again by
+    discard(). Any temporary files left by a killed run are unlisted and so
+    are removed by the next sync.
+    """
+
+    def __init__(self) -> None:
+        self._staged: list[tuple[Path, Path]] = []
+        self._created_dirs: set[Path] = set()
+        self._lock = threading.Lock()
+
+    def _make_parent(self, target_path: Path) -> None:
+        """Create the missing parent directories of target_path, remembering them."""
+        missing = []
+        parent = target_path.parent
+        while not parent.is_dir():
+            missing.append(parent)
+            parent = parent.parent
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._created_dirs.update(missing)
+
+    def stage(self, source_path: Path, target_path: Path) -> Path:
+        self._make_parent(target_path)
+        tmp_path = stage_copy(source_path, target_path)
+        with self._lock:
+            self._staged.append((tmp_path, target_path))
+        return tmp_path
+
+    def stage_data(self, data: bytes, target_path: Path, executable: bool = False) -> Path:
+        self._make_parent(target_path)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=target_path.parent, prefix=f".{target_path.name}.", suffix=".tmp"
+        )
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp_path, 0o755 if executable else 0o644)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        with self._lock:
+            self._staged.append((tmp_path, target_path))
+        return tmp_path
+
+    @timings.timed("commit")
+    def commit(self) -> None:
+        for tmp_path, target_path in self._staged:
+            os.replace(tmp_path, target_path)
+        self._staged.clear()
+        self._created_dirs.clear()
+
+    def discard(self) -> None:
+        for tmp_path, _ in self._staged:
+            tmp_path.unlink(missing_ok=True)
+        self._staged.clear()
+        # Deepest first, so that each directory is empty when it is removed.
+        for directory in sorted(self._created_dirs, key=lambda path: len(path.parts), reverse=True):
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+        self._created_dirs.clear()
+
+
+def parse_manifest(
+    manifest_path: Path, tracked_files: Iterable[str] | None = None
+) -> list[PublishEntry]:
+    """
+    Parse the TOML manifest file.
+
+    Files matched by the manifest's include patterns follow the explicitly
+    listed ones, in tracked file order; an explicit entry takes precedence
+    over a pattern for the same source. tracked_files is only needed when
+    the manifest has include patterns.
+    """
     data = tomllib.loads(manifest_path.read_text(encoding="utf-8"))
-    entries = data.get("files")
+    entries = data.get("files", [] if "include" in data else None)
     if not isinstance(entries, list):
         raise ValueError(f"{manifest_path} must define a 'files' list")
 
@@ -55,6 +329,15 @@ def parse_manifest(manifest_path: Path) -> list[PublishEntry]:
 
         parsed.append(PublishEntry(source=source, destination=destination))
 
+    rules, excludes = parse_manifest_rules(data)
+    if rules:
+        if tracked_files is None:
+            raise ValueError(f"{manifest_path} include patterns need the git-tracked files")
+        listed = {Path(os.path.normpath(entry.source)).as_posix() for entry in parsed}
+        for source_str, dest_str in expand_manifest_rules(rules, excludes, tracked_files).items():
+            if source_str not in listed:
+                parsed.append(PublishEntry(source=Path(source_str), destination=Path(dest_str)))
+
     return parsed
 
 
@@ -78,16 +361,33 @@ def normalize_destination(target_root: Path, destination: Path) -> Path:
         ) from exc
 
 
+@timings.timed("manifest")
 def load_entries(repo_root: Path, manifest_path: Path) -> list[PublishEntry]:
     """Load and validate manifest entries."""
-    entries = parse_manifest(manifest_path)
+    repo_files = list_repo_files(repo_root)
+    entries = parse_manifest(manifest_path, None if repo_files is None else repo_files[0])
     for entry in entries:
         ensure_inside_repo(repo_root, repo_root / entry.source)
     return entries
 
 
-def copy_entry(repo_root: Path, target_root: Path, entry: PublishEntry, dry_run: bool) -> Path:
-    """Copy a single entry from source to destination."""
+def copy_entry(
+    repo_root: Path,
+    target_root: Path,
+    entry: PublishEntry,
+    dry_run: bool,
+    state: SyncState | None = None,
+    log: Callable[[str], None] = print,
+    staging: StagedCopies | None = None,
+) -> tuple[Path, bool]:
+    """
+    Copy a single entry from source to destination.
+
+    With a sync state, destinations already identical to their source are
+    skipped. With staging, the copy is only renamed into place when the
+    staged copies are committed; otherwise it is renamed straight away.
+    Returns the normalized destination and whether it was copied.
+    """
     source_path = (repo_root / entry.source).resolve()
     
     if not source_path.exists():
@@ -96,65 +396,395 @@ def copy_entry(repo_root: Path, target_root: Path, entry: PublishEntry, dry_run:
     if source_path.is_dir():
         raise ValueError(
             f"Directory copying is prohibited: {entry.source}. "
-            "List every file explicitly in the manifest."
+            "List every file explicitly in the manifest or use an include pattern."
         )
 
     dest_relative = normalize_destination(target_root, entry.destination)
     target_path = target_root / dest_relative
-    
-    print(f"Copying {entry.source} -> {dest_relative}")
+    key = dest_relative.as_posix()
+
+    if state is not None and state.is_unchanged(key, source_path, target_path):
+        return dest_relative, False
+
+    log(f"Copying {entry.source} -> {dest_relative}")
     if not dry_run:
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(source_path, target_path)
+        if staging is not None:
+            written_path = staging.stage(source_path, target_path)
+        else:
+            written_path = stage_copy(source_path, target_path)
+            os.replace(written_path, target_path)
+            written_path = target_path
+        if state is not None:
+            # The staged file keeps its inode and stats when renamed.
+            state.record(key, source_path, written_path)
+
+    return dest_relative, True
+
+
+def copy_entries(
+    repo_root: Path,
+    target_root: Path,
+    entries: list[PublishEntry],
+    dry_run: bool,
+    state: SyncState | None = None,
+    workers: int = 1,
+    staging: StagedCopies | None = None,
+) -> Iterator[tuple[Path, bool]]:
+    """
+    Copy entries, optionally on a bounded pool of worker threads.
+
+    Results and log lines are produced in manifest order whatever the number
+    of workers. The first failure in manifest order is raised after
+    cancelling every copy that has not started yet.
+    """
+    if workers <= 1 or len(entries) <= 1:
+        for entry in entries:
+            yield copy_entry(repo_root, target_root, entry, dry_run, state, staging=staging)
+        return
+
+    def copy_with_log(entry: PublishEntry) -> tuple[list[str], tuple[Path, bool]]:
+        messages: list[str] = []
+        result = copy_entry(
+            repo_root, target_root, entry, dry_run, state, messages.append, staging
+        )
+        return messages, result
 
-    return dest_relative
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(copy_with_log, entry) for entry in entries]
+        for future in futures:
+            messages, result = future.result()
+            for message in messages:
+                print(message)
+            yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
 
 
+@timings.timed("delete")
 def delete_unlisted(target_root: Path, keep_paths: set[Path], dry_run: bool) -> list[Path]:
-    """Delete files in target that are not in the keep list."""
+    """
+    Delete files in target that are not in the keep list.
+
+    A single depth-first walk, in sorted name order, that never enters .git,
+    deletes unlisted files on the way down and removes directories left empty
+    on the way back up.
+    """
+    keep = {path.as_posix() for path in keep_paths}
     removed: list[Path] = []
-    
-    # First pass: delete files
-    for path in sorted(target_root.rglob("*")):
-        if ".git" in path.parts or path.is_dir():
-            continue
-            
-        relative = path.relative_to(target_root)
-        if relative not in keep_paths:
-            removed.append(relative)
-            print(f"Deleting {relative}")
-            if not dry_run:
-                path.unlink()
-
-    # Second pass: remove empty directories (bottom-up)
-    if not dry_run:
-        for path in sorted(target_root.rglob("*"), reverse=True):
-            if ".git" in path.parts or not path.is_dir():
+
+    def walk(directory: str, prefix: str) -> bool:
+        """Process directory, returning whether it is now empty."""
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+
+        remaining = len(entries)
+        for entry in entries:
+            if entry.name == ".git":
+                continue
+
+            relative = prefix + entry.name
+            if entry.is_dir():
+                # Symlinked directories are left alone, as rglob does not follow them.
+                if not entry.is_symlink() and walk(entry.path, f"{relative}/"):
+                    if not dry_run:
+                        os.rmdir(entry.path)
+                        remaining -= 1
                 continue
-                
-            if not any(path.iterdir()):
-                path.rmdir()
 
+            if relative not in keep:
+                removed.append(Path(relative))
+                print(f"Deleting {relative}")
+                if not dry_run:
+                    os.unlink(entry.path)
+                    remaining -= 1
+
+        return remaining == 0
+
+    walk(os.fspath(target_root), "")
     return removed
 
 
-def sync_files(repo_root: Path, target_root: Path, manifest_path: Path, dry_run: bool) -> None:
+def sync_files(
+    repo_root: Path,
+    target_root: Path,
+    manifest_path: Path,
+    dry_run: bool,
+    delta: bool = False,
+    workers: int = 1,
+) -> SyncStats:
     """Load manifest and synchronize files."""
     entries = load_entries(repo_root, manifest_path)
     print(f"Loaded {len(entries)} entries from manifest.")
     keep_paths: set[Path] = set()
+    stats = SyncStats()
+    state = SyncState.load(target_root) if delta else None
+    staging = None if dry_run else StagedCopies()
+
+    try:
+        for dest_path, copied in copy_entries(
+            repo_root, target_root, entries, dry_run, state, workers, staging
+        ):
+            keep_paths.add(dest_path)
+            if copied:
+                stats.copied += 1
+            else:
+                stats.skipped += 1
+    except BaseException:
+        if staging is not None:
+            staging.discard()
+        raise
+
+    if staging is not None:
+        staging.commit()
+
+    protected = set(keep_paths)
+    if state is not None and target_root in state.path.parents:
+        protected.add(state.path.relative_to(target_root))
+    removed = delete_unlisted(target_root, protected, dry_run)
+    stats.deleted = len(removed)
+
+    if removed:
+        print("Removed unlisted files:")
+        for path in sorted(removed):
+            print(f"  - {path}")
+
+    if state is not None and not dry_run:
+        state.save({path.as_posix() for path in keep_paths})
+
+    print(
+        f"Copied {stats.copied} file(s), skipped {stats.skipped} unchanged file(s), "
+        f"deleted {stats.deleted} file(s)."
+    )
+    return stats
+
+
+def is_git_top_level(path: Path) -> bool:
+    """Return whether path is the top level of a git working tree."""
+    result = subprocess.run(
+        ["git", "-C", str(path), "rev-parse", "--show-toplevel"],
+        capture_output=True,
+        text=True,
+    )
+    return result.returncode == 0 and Path(result.stdout.strip()).resolve() == path.resolve()
 
+
+@timings.timed("git")
+def list_index_blobs(repo: Path) -> dict[str, tuple[str, str]]:
+    """Map each path in a repository's git index to its (mode, blob id)."""
+    result = subprocess.run(
+        ["git", "-C", str(repo), "ls-files", "-s", "-z"],
+        capture_output=True,
+        check=True,
+    )
+    blobs: dict[str, tuple[str, str]] = {}
+    for record in result.stdout.decode("utf-8").split("\0"):
+        if not record:
+            continue
+        info, _, path = record.partition("\t")
+        mode, blob_id, _stage = info.split()
+        blobs[path] = (mode, blob_id)
+    return blobs
+
+
+@timings.timed("git")
+def list_working_tree_changes(repo: Path) -> tuple[set[str], list[str]]:
+    """
+    Return the tracked paths whose working tree copy differs from the index
+    (modified or deleted) and the untracked files, ignored ones included.
+    """
+    result = subprocess.run(
+        ["git", "-C", str(repo), "ls-files", "-z", "-t", "--modified", "--others"],
+        capture_output=True,
+        check=True,
+    )
+    modified: set[str] = set()
+    untracked: list[str] = []
+    for record in result.stdout.decode("utf-8").split("\0"):
+        if not record:
+            continue
+        tag, _, path = record.partition(" ")
+        if tag == "?":
+            untracked.append(path)
+        else:
+            modified.add(path)
+    return modified, untracked
+
+
+@timings.timed("git")
+def stage_index_changes(
+    repo: Path, written: list[tuple[str, str, str]], removed: list[str]
+) -> None:
+    """
+    Record written (path, mode, blob id) files and removed paths in the index.
+
+    The written files are hashed into the object database unfiltered, so
+    their blob ids match the source's, and every entry is then changed with
+    a single ``git update-index --index-info``. A final ``--refresh`` stores
+    the stat data of the new entries, so the next run does not see them as
+    modified.
+    """
+    if written:
+        result = subprocess.run(
+            ["git", "-C", str(repo), "hash-object", "-w", "--no-filters", "--stdin-paths"],
+            input="".join(f"{path}\n" for path, _, _ in written),
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        for (path, _, blob_id), stored_id in zip(written, result.stdout.split()):
+            if stored_id != blob_id:
+                raise ValueError(f"Blob id changed while writing {path}: {blob_id} -> {stored_id}")
+
+    info = [f"{mode} {blob_id}\t{path}\0" for path, mode, blob_id in written]
+    info += [f"0 {'0' * 40}\t{path}\0" for path in removed]
+    if not info:
+        return
+    subprocess.run(
+        ["git", "-C", str(repo), "update-index", "-z", "--index-info"],
+        input="".join(info).encode("utf-8"),
+        check=True,
+    )
+    subprocess.run(["git", "-C", str(repo), "update-index", "-q", "--refresh"], check=False)
+
+
+def remove_file(target_root: Path, path: str) -> None:
+    """Delete path and then any directories left empty, up to the target root."""
+    target_path = target_root / path
+    target_path.unlink(missing_ok=True)
+    for parent in target_path.parents:
+        if parent == target_root or any(parent.iterdir()):
+            break
+        parent.rmdir()
+
+
+class BlobReader:
+    """Read blob contents through a single long-running ``git cat-file --batch``."""
+
+    def __init__(self, repo: Path) -> None:
+        self._process = subprocess.Popen(
+            ["git", "-C", str(repo), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    @timings.timed("git blobs")
+    def read(self, blob_id: str) -> bytes:
+        self._process.stdin.write(f"{blob_id}\n".encode("ascii"))
+        self._process.stdin.flush()
+        header = self._process.stdout.readline().decode("ascii").split()
+        if len(header) != 3 or header[1] != "blob":
+            raise ValueError(f"Could not read blob {blob_id}")
+        data = self._process.stdout.read(int(header[2]))
+        self._process.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self) -> None:
+        self._process.stdin.close()
+        self._process.wait()
+
+
+def sync_files_git(
+    repo_root: Path,
+    target_root: Path,
+    manifest_path: Path,
+    dry_run: bool,
+) -> SyncStats:
+    """
+    Synchronize by comparing git blob ids instead of file contents.
+
+    Both repositories' indexes are listed with ``git ls-files -s`` and the
+    manifest's source -> dest mapping is applied to work out the exact add,
+    modify and delete set without opening any file. Only blobs that differ
+    are read (from the source object database) and written, staged and
+    renamed into place like a regular sync. The source side is the index, so
+    uncommitted working tree changes are not published.
+
+    The target's index is updated with every write and delete, so the next
+    run compares against what this one left behind and stays proportional to
+    the number of changed files. Target files edited or deleted outside git
+    are rewritten, and untracked files (ignored ones too) are deleted unless
+    the manifest lists them, as in a regular sync.
+    """
+    entries = load_entries(repo_root, manifest_path)
+    print(f"Loaded {len(entries)} entries from manifest.")
+    source_blobs = list_index_blobs(repo_root)
+    target_blobs = list_index_blobs(target_root)
+    modified, untracked = list_working_tree_changes(target_root)
+    stats = SyncStats()
+
+    writes: list[tuple[PublishEntry, Path, str, str]] = []
+    keep: set[str] = set()
     for entry in entries:
-        dest_path = copy_entry(repo_root, target_root, entry, dry_run)
-        keep_paths.add(dest_path)
+        source_key = Path(os.path.normpath(entry.source)).as_posix()
+        blob = source_blobs.get(source_key)
+        if blob is None:
+            if (repo_root / entry.source).is_dir():
+                raise ValueError(
+                    f"Directory copying is prohibited: {entry.source}. "
+                    "List every file explicitly in the manifest or use an include pattern."
+                )
+            raise FileNotFoundError(f"Source not tracked by git: {entry.source}")
+        if blob[0] not in ("100644", "100755"):
+            raise ValueError(f"Unsupported git file mode {blob[0]}: {entry.source}")
+
+        dest_relative = normalize_destination(target_root, entry.destination)
+        dest_key = dest_relative.as_posix()
+        keep.add(dest_key)
+        if target_blobs.get(dest_key) == blob and dest_key not in modified:
+            stats.skipped += 1
+        else:
+            writes.append((entry, dest_relative, blob[0], blob[1]))
 
-    removed = delete_unlisted(target_root, keep_paths, dry_run)
+    untracked_removed = [path for path in untracked if path not in keep]
+    index_removed = [path for path in target_blobs if path not in keep]
+    removed = sorted(untracked_removed + index_removed)
+
+    staging = None if dry_run else StagedCopies()
+    reader = None if dry_run or not writes else BlobReader(repo_root)
+    try:
+        for entry, dest_relative, mode, blob_id in writes:
+            print(f"Copying {entry.source} -> {dest_relative}")
+            stats.copied += 1
+            if reader is not None:
+                staging.stage_data(
+                    reader.read(blob_id), target_root / dest_relative, mode == "100755"
+                )
+    except BaseException:
+        if staging is not None:
+            staging.discard()
+        raise
+    finally:
+        if reader is not None:
+            reader.close()
+
+    if staging is not None:
+        staging.commit()
+
+    for path in removed:
+        print(f"Deleting {path}")
+        if not dry_run:
+            remove_file(target_root, path)
+    stats.deleted = len(removed)
+
+    if not dry_run:
+        written = [
+            (dest_relative.as_posix(), mode, blob_id)
+            for _, dest_relative, mode, blob_id in writes
+        ]
+        stage_index_changes(target_root, written, index_removed)
 
     if removed:
         print("Removed unlisted files:")
-        for path in sorted(removed):
+        for path in removed:
             print(f"  - {path}")
 
+    print(
+        f"Copied {stats.copied} file(s), skipped {stats.skipped} unchanged file(s), "
+        f"deleted {stats.deleted} file(s)."
+    )
+    return stats
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Synchronize files to the public architecture repo")
@@ -180,12 +810,38 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Apply changes to the target repository (default: dry run)",
     )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--git",
+        action="store_true",
+        help=(
+            "Compare git blob ids of both repositories' indexes, write only the "
+            "blobs that differ and stage them in the target's index (publishes "
+            "committed or staged content; cannot be combined with --workers)"
+        ),
+    )
+    mode.add_argument(
+        "--delta",
+        action="store_true",
+        help=(
+            "Skip files whose destination is already identical (by size, mtime "
+            "and content hash), keeping a sync state in the target repository"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of threads used to copy and hash files (default: 1)",
+    )
+    add_instrumentation_arguments(parser)
     return parser.parse_args()
 
 
 def main() -> int:
     """Main execution function."""
     args = parse_args()
+    start_instrumentation(args, "sync-public")
     repo_root = args.repo_root.resolve()
     
     # Resolve manifest path relative to repo_root if it's not absolute
@@ -207,8 +863,30 @@ def main() -> int:
         print(f"Target repo not found: {target_root}", file=sys.stderr)
         return 1
 
+    if args.workers < 1:
+        print("--workers must be a positive number", file=sys.stderr)
+        return 1
+    if args.git and args.workers != 1:
+        print("--workers cannot be used with --git", file=sys.stderr)
+        return 1
+    if args.git:
+        for name, path in (("Repository root", repo_root), ("Target repo", target_root)):
+            if not is_git_top_level(path):
+                print(f"{name} is not the top level of a git repository: {path}", file=sys.stderr)
+                return 1
+
     dry_run = not args.apply
-    sync_files(repo_root, target_root, manifest_path, dry_run)
+    if args.git:
+        sync_files_git(repo_root, target_root, manifest_path, dry_run)
+    else:
+        sync_files(
+            repo_root,
+            target_root,
+            manifest_path,
+            dry_run,
+            delta=args.delta,
+            workers=args.workers,
+        )
 
     if dry_run:
         print("Dry run complete: no files were changed.")
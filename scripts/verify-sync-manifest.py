@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
-"""Verify that all files listed in sync-public.toml exist in the repository."""
+"""
+Verify that all files listed in sync-public.toml exist and are tracked by git,
+and that every include pattern matches at least one tracked file.
+"""
 
 import argparse
-import re
+import os
 import sys
 from pathlib import Path
 
@@ -12,101 +15,138 @@ try:
 except ImportError:
     import tomli as tomllib
 
-from _utils import emit_github_error, to_repo_relative
+from _utils import (
+    GlobMatcher,
+    ManifestRule,
+    add_instrumentation_arguments,
+    emit_github_error,
+    expand_manifest_rules,
+    index_toml_strings,
+    list_repo_files,
+    parse_manifest_rules,
+    start_instrumentation,
+    timings,
+    to_repo_relative,
+)
 
 
 def load_manifest_line_map(manifest_path: Path) -> dict[str, int]:
     """Map manifest entries to line numbers for annotations."""
     line_map: dict[str, int] = {}
-    try:
-        lines = manifest_path.read_text(encoding="utf-8").splitlines()
-    except Exception:
-        return line_map
-
-    for line_no, line in enumerate(lines, start=1):
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            continue
+    for string in index_toml_strings(manifest_path) or []:
+        # Entries are either `"path"` or `{ source = "path", ... }`, in `files`
+        # or `include`.
+        path = string.path
+        if path[0] in ("files", "include") and (len(path) == 2 or path[2:] == ("source",)):
+            line_map.setdefault(string.value, string.line)
+    return line_map
 
-        # Match TOML dict entries with source field:
-        #   { source = "path", ... } or { source = 'path', ... }
-        # Uses named group 'source_double' for double-quoted and 'source_single' for single-quoted values.
-        source_match = re.search(
-            r'source\s*=\s*'           # Match 'source =' with optional whitespace
-            r'(?:'                      # Non-capturing group for alternatives
-            r'"(?P<source_double>[^"]+)"'  # Double-quoted string in named group
-            r"|"                        # OR
-            r"'(?P<source_single>[^']+)'"  # Single-quoted string in named group
-            r')',
-            stripped,
-        )
-        if source_match:
-            value = source_match.group('source_double') or source_match.group('source_single')
-            line_map.setdefault(value, line_no)
-            continue
 
-        # Match bare string entries in TOML array:
-        #   "path", or 'path',  # with optional trailing comma and comment
-        # Uses named group 'bare_double' for double-quoted and 'bare_single' for single-quoted values.
-        string_match = re.match(
-            r'(?:'                      # Non-capturing group for alternatives
-            r'"(?P<bare_double>[^"]+)"'    # Double-quoted string in named group
-            r"|"                        # OR
-            r"'(?P<bare_single>[^']+)'"    # Single-quoted string in named group
-            r')'
-            r'\s*,?\s*'                 # Optional whitespace, comma, and whitespace
-            r'(?:#.*)?$',               # Optional trailing comment until end of line
-            stripped,
-        )
-        if string_match:
-            value = string_match.group('bare_double') or string_match.group('bare_single')
-            line_map.setdefault(value, line_no)
+def find_unmatched_rules(
+    rules: list[ManifestRule], excludes: list[str], tracked_files: set[str]
+) -> list[ManifestRule]:
+    """
+    Return the include rules that match no tracked file, ignoring excluded files.
 
-    return line_map
+    Unlike expand_manifest_rules, which credits each file to the first rule
+    matching it, every matching rule is credited, so a rule overlapping an
+    earlier one is not reported.
+    """
+    include_matcher = GlobMatcher(rule.pattern for rule in rules)
+    exclude_matcher = GlobMatcher(excludes) if excludes else None
+    unmatched = set(range(len(rules)))
+    for path in tracked_files:
+        if not unmatched:
+            break
+        matched = include_matcher.matches(path)
+        if not matched:
+            continue
+        if exclude_matcher is not None and exclude_matcher.match(path) is not None:
+            continue
+        unmatched.difference_update(matched)
+    return [rules[index] for index in sorted(unmatched)]
 
 
+@timings.timed("verify")
 def verify_manifest(
     manifest_path: Path,
     repo_root: Path,
     verbose: bool = False,
     output_format: str = "summary",
+    config: dict | None = None,
+    tracked_files: set[str] | None = None,
 ) -> int:
     """
-    Verify that all source files in the sync manifest exist.
+    Verify that all source files in the sync manifest exist and are tracked.
+
+    Sources are checked against one set of git-tracked files, which the
+    include patterns are also expanded against; a pattern matching no
+    tracked file is reported. Outside a git repository, only the existence
+    of the listed files on the filesystem is checked.
     
     Args:
         manifest_path: Path to the sync-public.toml manifest file.
         repo_root: Root directory of the repository.
         verbose: Whether to output details about every file checked.
+        config: The already parsed manifest, to avoid reading it again.
+        tracked_files: Git-tracked files, listed with git when not given.
         
     Returns:
-        int: 0 if all files exist, 1 if any files are missing.
+        int: 0 if all files are tracked and every include pattern matches a
+        file, 1 if any file is missing or untracked or a pattern matches none.
     """
-    if not manifest_path.exists():
-        message = f"Manifest file not found: {manifest_path}"
-        print(f"❌ {message}", file=sys.stderr)
-        if output_format == "github":
-            emit_github_error(to_repo_relative(manifest_path, repo_root), message)
-        return 1
+    if config is None:
+        if not manifest_path.exists():
+            message = f"Manifest file not found: {manifest_path}"
+            print(f"❌ {message}", file=sys.stderr)
+            if output_format == "github":
+                emit_github_error(to_repo_relative(manifest_path, repo_root), message)
+            return 1
+
+        try:
+            with open(manifest_path, 'rb') as f:
+                config = tomllib.load(f)
+        except Exception as e:
+            message = f"Error reading manifest file: {e}"
+            print(f"❌ {message}", file=sys.stderr)
+            if output_format == "github":
+                emit_github_error(to_repo_relative(manifest_path, repo_root), message)
+            return 1
     
     try:
-        with open(manifest_path, 'rb') as f:
-            config = tomllib.load(f)
-    except Exception as e:
-        message = f"Error reading manifest file: {e}"
+        rules, excludes = parse_manifest_rules(config)
+    except ValueError as e:
+        message = f"Invalid manifest patterns: {e}"
         print(f"❌ {message}", file=sys.stderr)
         if output_format == "github":
             emit_github_error(to_repo_relative(manifest_path, repo_root), message)
         return 1
-    
+
     files = config.get('files', [])
-    if not files:
+    if not files and not rules:
         print("⚠️  No files found in manifest", file=sys.stderr)
         return 0
     
-    print(f"🔍 Verifying {len(files)} file(s) in sync manifest...")
-    
+    if rules:
+        print(f"🔍 Verifying {len(files)} file(s) and {len(rules)} include pattern(s) in sync manifest...")
+    else:
+        print(f"🔍 Verifying {len(files)} file(s) in sync manifest...")
+
+    if tracked_files is None:
+        repo_files = list_repo_files(repo_root)
+        if repo_files is not None:
+            tracked_files = set(repo_files[0])
+        else:
+            print("⚠️  Not a git repository, checking the filesystem only", file=sys.stderr)
+
+    unmatched_rules: list[ManifestRule] = []
+    included_count = 0
+    if rules and tracked_files is not None:
+        unmatched_rules = find_unmatched_rules(rules, excludes, tracked_files)
+        included_count = len(expand_manifest_rules(rules, excludes, tracked_files))
+
     missing_files = []
+    untracked_files = []
     line_map = load_manifest_line_map(manifest_path) if output_format == "github" else {}
     checked_files = 0
     
@@ -120,18 +160,29 @@ def verify_manifest(
         else:
             source_path = entry
         
-        full_path = repo_root / source_path
         checked_files += 1
-        
-        if full_path.exists():
+        source_key = Path(os.path.normpath(source_path)).as_posix()
+
+        # Only sources that git does not track need a filesystem check.
+        if tracked_files is not None and source_key in tracked_files:
             if verbose:
                 print(f"✅ {source_path}")
-        else:
+        elif not (repo_root / source_path).exists():
             if output_format == "summary":
                 print(f"❌ Missing: {source_path}", file=sys.stderr)
             missing_files.append(source_path)
+        elif tracked_files is not None:
+            if output_format == "summary":
+                print(f"❌ Untracked: {source_path}", file=sys.stderr)
+            untracked_files.append(source_path)
+        elif verbose:
+            print(f"✅ {source_path}")
     
-    if missing_files:
+    if unmatched_rules and output_format == "summary":
+        for rule in unmatched_rules:
+            print(f"❌ No match: {rule.pattern}", file=sys.stderr)
+
+    if missing_files or untracked_files or unmatched_rules:
         if output_format == "github":
             manifest_file = to_repo_relative(manifest_path, repo_root)
             for missing in missing_files:
@@ -140,20 +191,52 @@ def verify_manifest(
                     f"Missing file in sync-public.toml: {missing}",
                     line_map.get(missing),
                 )
+            for untracked in untracked_files:
+                emit_github_error(
+                    manifest_file,
+                    f"Untracked file in sync-public.toml: {untracked} (not committed to git)",
+                    line_map.get(untracked),
+                )
+            for rule in unmatched_rules:
+                emit_github_error(
+                    manifest_file,
+                    f"Include pattern in sync-public.toml matches no tracked file: {rule.pattern}",
+                    line_map.get(rule.pattern),
+                )
 
-        print(f"\n❌ {len(missing_files)} file(s) missing from repository:", file=sys.stderr)
-        for missing in missing_files:
-            print(f"   - {missing}", file=sys.stderr)
+        if missing_files:
+            print(f"\n❌ {len(missing_files)} file(s) missing from repository:", file=sys.stderr)
+            for missing in missing_files:
+                print(f"   - {missing}", file=sys.stderr)
+        if untracked_files:
+            print(f"\n❌ {len(untracked_files)} file(s) exist but are not tracked by git:", file=sys.stderr)
+            for untracked in untracked_files:
+                print(f"   - {untracked}", file=sys.stderr)
+        if unmatched_rules:
+            print(
+                f"\n❌ {len(unmatched_rules)} include pattern(s) match no tracked file:",
+                file=sys.stderr,
+            )
+            for rule in unmatched_rules:
+                print(f"   - {rule.pattern}", file=sys.stderr)
         return 1
     
-    print(f"✅ All {checked_files} file(s) in manifest exist in repository")
+    if tracked_files is not None:
+        print(f"✅ All {checked_files} file(s) in manifest are tracked in repository")
+        if rules:
+            print(f"✅ {len(rules)} include pattern(s) match {included_count} tracked file(s)")
+    else:
+        print(f"✅ All {checked_files} file(s) in manifest exist in repository")
     return 0
 
 
 def main():
     """Main entry point for the script."""
     parser = argparse.ArgumentParser(
-        description="Verify that all files in sync-public.toml exist in the repository."
+        description=(
+            "Verify that all files in sync-public.toml exist and are tracked by git, "
+            "and that every include pattern matches at least one tracked file."
+        )
     )
     parser.add_argument(
         '--manifest',
@@ -179,7 +262,9 @@ def main():
         help='Output format (default: summary)'
     )
     
+    add_instrumentation_arguments(parser)
     args = parser.parse_args()
+    start_instrumentation(args, "verify-sync-manifest")
     repo_root = args.repo_root.resolve()
 
     return verify_manifest(args.manifest, repo_root, args.verbose, args.format)
@@ -0,0 +1,157 @@
+"""Tests for deploy-pages, deploying to a bare repository standing in for the remote."""
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from _utils import import_script  # noqa: E402
+
+deploy_pages = import_script("deploy-pages")
+
+IDENTITY = {
+    "GIT_AUTHOR_NAME": "Deploy Test",
+    "GIT_AUTHOR_EMAIL": "deploy@example.org",
+    "GIT_COMMITTER_NAME": "Deploy Test",
+    "GIT_COMMITTER_EMAIL": "deploy@example.org",
+}
+BRANCH = "gh-pages"
+
+
+def git(*args: str, cwd: Path | None = None) -> str:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        capture_output=True,
+        check=True,
+        text=True,
+        env=dict(os.environ, **IDENTITY),
+    )
+    return result.stdout
+
+
+class DeployPagesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.remote = self.root / "remote.git"
+        git("init", "--quiet", "--bare", str(self.remote))
+        self.site = self.root / "site"
+        self.write_page("index.html", "home")
+        self.write_page("about/index.html", "about")
+        self.write_page("assets/style.css", "body {}")
+
+    def write_page(self, path: str, content: str) -> None:
+        page = self.site / path
+        page.parent.mkdir(parents=True, exist_ok=True)
+        page.write_text(content, encoding="utf-8")
+
+    def deploy(self, **options) -> str:
+        clone = deploy_pages.PagesClone(
+            self.root / "clone.git", str(self.remote), BRANCH, identity=IDENTITY
+        )
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(deploy_pages.deploy(self.site, clone, "Deploy", **options), 0)
+        return output.getvalue()
+
+    def remote_git(self, *args: str) -> str:
+        return git(f"--git-dir={self.remote}", *args)
+
+    def remote_head(self) -> str | None:
+        heads = self.remote_git("for-each-ref", "--format=%(objectname)", f"refs/heads/{BRANCH}")
+        return heads.strip() or None
+
+    def remote_files(self) -> list[str]:
+        return self.remote_git("ls-tree", "-r", "--name-only", BRANCH).split()
+
+    def last_commit_changes(self) -> list[str]:
+        """Return the "<status> <path>" changes made by the tip commit of the branch."""
+        output = self.remote_git("diff-tree", "-r", "--root", "--no-commit-id", "--name-status", BRANCH)
+        return [" ".join(line.split("\t")) for line in output.splitlines()]
+
+    def test_first_deploy_commits_the_whole_site(self) -> None:
+        self.deploy()
+        self.assertEqual(
+            self.remote_files(),
+            [".deploy-manifest.json", ".nojekyll", "about/index.html", "assets/style.css", "index.html"],
+        )
+
+    def test_one_changed_page_is_a_one_file_commit(self) -> None:
+        self.deploy()
+        first = self.remote_head()
+        self.write_page("about/index.html", "about us")
+        self.deploy()
+        self.assertEqual(self.remote_git("rev-parse", f"{BRANCH}^"), f"{first}\n")
+        self.assertEqual(self.last_commit_changes(), ["M .deploy-manifest.json", "M about/index.html"])
+        self.assertEqual(self.remote_git("show", f"{BRANCH}:about/index.html"), "about us")
+
+    def test_removed_page_is_deleted(self) -> None:
+        self.deploy()
+        (self.site / "about/index.html").unlink()
+        self.deploy()
+        self.assertEqual(self.last_commit_changes(), ["M .deploy-manifest.json", "D about/index.html"])
+        self.assertNotIn("about/index.html", self.remote_files())
+
+    def test_unchanged_site_is_not_committed(self) -> None:
+        self.deploy()
+        first = self.remote_head()
+        self.assertIn("already up to date", self.deploy())
+        self.assertEqual(self.remote_head(), first)
+
+    def test_dry_run_does_not_push(self) -> None:
+        self.deploy(dry_run=True)
+        self.assertIsNone(self.remote_head())
+
+        self.deploy()
+        first = self.remote_head()
+        self.write_page("index.html", "new home")
+        output = self.deploy(dry_run=True)
+        self.assertIn("  M index.html", output)
+        self.assertEqual(self.remote_head(), first)
+
+    def test_branch_changed_by_another_tool_is_listed(self) -> None:
+        self.deploy()
+        # Someone edits a page on the branch directly, leaving the manifest as it was.
+        work = self.root / "work"
+        git("clone", "--quiet", "--branch", BRANCH, str(self.remote), str(work))
+        (work / "index.html").write_text("hand edited", encoding="utf-8")
+        git("commit", "--quiet", "--all", "-m", "Hand edit", cwd=work)
+        git("push", "--quiet", "origin", BRANCH, cwd=work)
+
+        # The manifest still matches the site, so only the page is restored.
+        self.deploy()
+        self.assertEqual(self.last_commit_changes(), ["M index.html"])
+        self.assertEqual(self.remote_git("show", f"{BRANCH}:index.html"), "home")
+
+    def test_branch_without_manifest_is_listed(self) -> None:
+        work = self.root / "work"
+        git("init", "--quiet", "--initial-branch", BRANCH, str(work))
+        (work / "index.html").write_text("home", encoding="utf-8")
+        (work / "old.html").write_text("old", encoding="utf-8")
+        git("add", ".", cwd=work)
+        git("commit", "--quiet", "-m", "Published by another tool", cwd=work)
+        git("push", "--quiet", str(self.remote), BRANCH, cwd=work)
+
+        self.deploy()
+        self.assertEqual(
+            self.last_commit_changes(),
+            [
+                "A .deploy-manifest.json",
+                "A .nojekyll",
+                "A about/index.html",
+                "A assets/style.css",
+                "D old.html",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+"""Tests for the external link checker, against a local stand-in HTTP server."""
+
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from _external import (  # noqa: E402
+    FAILURE_TTL,
+    MAX_REDIRECTS,
+    ExternalLinkCache,
+    ExternalLinkChecker,
+    UrlResult,
+)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Serve a handful of fixed paths over keep-alive HTTP/1.1.
+
+    /ok answers 200, /missing 404 and /no-head 405 to HEAD but 200 to GET.
+    /redirect/N redirects N times before landing on /ok. /slow holds each
+    request for a moment so that concurrent requests overlap, and /chunked
+    answers 405 to HEAD and a chunked body to GET.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self.respond(send_body=False)
+
+    def do_GET(self) -> None:
+        self.respond(send_body=True)
+
+    def respond(self, send_body: bool) -> None:
+        server = self.server
+        path = self.path.partition("?")[0]
+        with server.lock:
+            server.requests.append((self.command, self.path))
+
+        if path == "/slow":
+            with server.lock:
+                server.in_flight += 1
+                server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            time.sleep(0.2)
+            with server.lock:
+                server.in_flight -= 1
+            self.send_body(200, send_body)
+        elif path == "/ok":
+            self.send_body(200, send_body)
+        elif path == "/missing":
+            self.send_body(404, send_body)
+        elif path == "/no-head":
+            self.send_body(405 if self.command == "HEAD" else 200, send_body)
+        elif path.startswith("/redirect/"):
+            remaining = int(path.rsplit("/", 1)[1])
+            location = "/ok" if remaining == 0 else f"/redirect/{remaining - 1}"
+            self.send_response(301)
+            self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif path == "/chunked" and self.command == "HEAD":
+            self.send_body(405, send_body)
+        elif path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"2\r\nok\r\n0\r\n\r\n")
+        else:
+            self.send_body(500, send_body)
+
+    def send_body(self, status: int, send_body: bool) -> None:
+        body = b"stand-in body"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests: list[tuple[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+def start_server(test: unittest.TestCase) -> StandInServer:
+    """Start a stand-in server for the duration of a test."""
+    server = StandInServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    test.addCleanup(thread.join)
+    test.addCleanup(server.server_close)
+    test.addCleanup(server.shutdown)
+    return server
+
+
+class ExternalLinkCheckerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = start_server(self)
+
+    def url(self, path: str) -> str:
+        return self.server.base_url + path
+
+    def check(self, *paths: str, **options) -> dict[str, UrlResult]:
+        options.setdefault("timeout", 5.0)
+        checker = ExternalLinkChecker(**options)
+        results = checker.check(self.url(path) for path in paths)
+        return {path: results[self.url(path)] for path in paths}
+
+    def test_ok(self) -> None:
+        result = self.check("/ok")["/ok"]
+        self.assertTrue(result.ok)
+        self.assertEqual(result.status, 200)
+        self.assertEqual(self.server.requests, [("HEAD", "/ok")])
+
+    def test_not_found(self) -> None:
+        result = self.check("/missing")["/missing"]
+        self.assertFalse(result.ok)
+        self.assertEqual(result.describe(), "HTTP 404")
+        # A failed HEAD is always retried with GET before giving up.
+        self.assertEqual(self.server.requests, [("HEAD", "/missing"), ("GET", "/missing")])
+
+    def test_head_not_allowed_falls_back_to_get(self) -> None:
+        result = self.check("/no-head")["/no-head"]
+        self.assertTrue(result.ok)
+        self.assertEqual(result.status, 200)
+        self.assertEqual(self.server.requests, [("HEAD", "/no-head"), ("GET", "/no-head")])
+
+    def test_redirect_chain_is_followed(self) -> None:
+        result = self.check(f"/redirect/{MAX_REDIRECTS - 1}")[f"/redirect/{MAX_REDIRECTS - 1}"]
+        self.assertTrue(result.ok)
+        self.assertEqual(result.status, 200)
+        self.assertEqual(self.server.requests[-1], ("HEAD", "/ok"))
+
+    def test_too_many_redirects(self) -> None:
+        path = f"/redirect/{MAX_REDIRECTS + 1}"
+        result = self.check(path)[path]
+        self.assertFalse(result.ok)
+        self.assertIn("redirects", result.describe())
+
+    def test_connection_refused(self) -> None:
+        with socket.socket() as unused:
+            unused.bind(("127.0.0.1", 0))
+            port = unused.getsockname()[1]
+        url = f"http://127.0.0.1:{port}/"
+        result = ExternalLinkChecker(timeout=5.0).check([url])[url]
+        self.assertFalse(result.ok)
+        self.assertIsNone(result.status)
+        self.assertIsNotNone(result.error)
+
+    def test_fragments_are_checked_once(self) -> None:
+        checker = ExternalLinkChecker(timeout=5.0)
+        results = checker.check([self.url("/ok#one"), self.url("/ok#two")])
+        self.assertEqual(list(results), [self.url("/ok")])
+        self.assertEqual(self.server.requests, [("HEAD", "/ok")])
+
+    def test_connections_are_reused_within_a_host_pool(self) -> None:
+        paths = [f"/ok?page={index}" for index in range(10)] + ["/missing", "/no-head"]
+        results = self.check(*paths, per_host=1)
+        self.assertTrue(all(results[path].ok for path in paths if path != "/missing"))
+        self.assertEqual(len(self.server.requests), 14)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_chunked_body_closes_the_connection(self) -> None:
+        results = self.check("/chunked", "/missing", per_host=1)
+        self.assertTrue(results["/chunked"].ok)
+        self.assertEqual(results["/missing"].status, 404)
+        # HEAD /chunked, HEAD /missing and GET /chunked share a connection.
+        # The chunked body is not read, so GET /missing needs a new one.
+        self.assertEqual(
+            self.server.requests,
+            [("HEAD", "/chunked"), ("HEAD", "/missing"), ("GET", "/chunked"), ("GET", "/missing")],
+        )
+        self.assertEqual(self.server.connections, 2)
+
+    def test_per_host_concurrency_is_capped(self) -> None:
+        paths = [f"/slow?page={index}" for index in range(6)]
+        results = self.check(*paths, per_host=2)
+        self.assertTrue(all(result.ok for result in results.values()))
+        self.assertEqual(self.server.max_in_flight, 2)
+        self.assertLessEqual(self.server.connections, 2)
+
+
+class ExternalLinkCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = start_server(self)
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_path = Path(temp_dir.name) / "external-links.json"
+
+    def test_hit_within_ttl_and_miss_after_expiry(self) -> None:
+        url = self.server.base_url + "/ok"
+        checker = ExternalLinkChecker(ExternalLinkCache.load(self.cache_path, ttl=3600), timeout=5.0)
+        self.assertTrue(checker.check([url])[url].ok)
+        self.assertEqual(len(self.server.requests), 1)
+
+        # A fresh run reads the saved cache and makes no request.
+        cache = ExternalLinkCache.load(self.cache_path, ttl=3600)
+        checker = ExternalLinkChecker(cache, timeout=5.0)
+        self.assertTrue(checker.check([url])[url].ok)
+        self.assertEqual(checker.cached_count, 1)
+        self.assertEqual(len(self.server.requests), 1)
+
+        # Once the entry is older than the TTL the URL is requested again.
+        cache.entries[url].checked_at -= 3600
+        checker = ExternalLinkChecker(cache, timeout=5.0)
+        self.assertTrue(checker.check([url])[url].ok)
+        self.assertEqual(checker.cached_count, 0)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_failures_expire_sooner(self) -> None:
+        cache = ExternalLinkCache(self.cache_path, ttl=24 * 3600)
+        now = time.time()
+        cache.store("https://example.org/ok", UrlResult(200, None, now - FAILURE_TTL))
+        cache.store("https://example.org/missing", UrlResult(404, None, now - FAILURE_TTL))
+        self.assertIsNotNone(cache.lookup("https://example.org/ok", now))
+        self.assertIsNone(cache.lookup("https://example.org/missing", now))
+
+    def test_rate_limited_results_are_not_cached(self) -> None:
+        cache = ExternalLinkCache(self.cache_path)
+        cache.store("https://example.org/busy", UrlResult(429, None, time.time()))
+        self.assertEqual(cache.entries, {})
+
+
+if __name__ == "__main__":
+    unittest.main()